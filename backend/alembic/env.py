@@ -33,6 +33,9 @@ from src.models.employee_models import Employee
 from src.models.user_models import User
 from src.models.briefing_models import Briefing
 from src.models.conversation_history_models import ConversationHistory
+from src.models.conversation_archive_models import ConversationHistoryArchive
+from src.models.job_models import Job
+from src.db.search_index import SEARCH_TABLE
 
 
 
@@ -40,6 +43,17 @@ from src.models.conversation_history_models import ConversationHistory
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names):
+    """
+    A tabela de busca (e, no SQLite, as tabelas-sombra do FTS5: search_documents_config, _data...)
+    fica fora de Base.metadata e tem migração própria; sem este filtro o --autogenerate geraria
+    drop_table para ela.
+    """
+    if type_ == "table":
+        return not (name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_"))
+    return True
+
+
 def run_migrations_offline() -> None:
     """Executa as migrações no modo offline."""
     url = config.get_main_option("sqlalchemy.url")
@@ -48,6 +62,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -65,6 +80,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,  # Verifica tipos de colunas
+            include_name=include_name,
         )
         with context.begin_transaction():
             context.run_migrations()
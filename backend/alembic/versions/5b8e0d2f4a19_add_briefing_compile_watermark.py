@@ -0,0 +1,30 @@
+"""add_briefing_compile_watermark
+
+Revision ID: 5b8e0d2f4a19
+Revises: 3f2a9c1d7b45
+Create Date: 2026-10-19 10:03:57.204115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e0d2f4a19'
+down_revision: Union[str, None] = '3f2a9c1d7b45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('briefings', sa.Column('compiled_until_message_id', sa.Integer(), nullable=True))
+    op.add_column('briefings', sa.Column('compiled_script_version', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('briefings', 'compiled_script_version')
+    op.drop_column('briefings', 'compiled_until_message_id')
@@ -0,0 +1,34 @@
+"""add_hot_path_indexes
+
+Revision ID: 7d4c1e9a2b63
+Revises: 5b8e0d2f4a19
+Create Date: 2026-10-19 11:20:41.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4c1e9a2b63'
+down_revision: Union[str, None] = '5b8e0d2f4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_conversation_histories_briefing_id_id', 'conversation_histories', ['briefing_id', 'id'], unique=False)
+    op.create_index('ix_briefings_user_id_update_date', 'briefings', ['user_id', 'update_date'], unique=False)
+    op.create_index('ix_users_status_creation_date', 'users', ['status', 'creation_date'], unique=False)
+    op.create_index('ix_users_nickname', 'users', ['nickname'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_nickname', table_name='users')
+    op.drop_index('ix_users_status_creation_date', table_name='users')
+    op.drop_index('ix_briefings_user_id_update_date', table_name='briefings')
+    op.drop_index('ix_conversation_histories_briefing_id_id', table_name='conversation_histories')
@@ -0,0 +1,134 @@
+"""convert_dates_to_datetime
+
+Revision ID: 9e6b2f7c3d18
+Revises: 7d4c1e9a2b63
+Create Date: 2026-10-19 13:42:09.731846
+
+Converte as datas gravadas como texto (String(19), 'DD/MM/YYYY HH:MM:SS' ou
+'YYYY-MM-DD HH:MM:SS' das rotas de login) em DATETIME, sempre em UTC.
+Para não travar tabelas grandes (conversation_histories), cada coluna é copiada
+para uma coluna nova em lotes curtos, cada um na sua própria transação, e só
+então a coluna antiga é removida e a nova renomeada.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.datetime_utils import format_datetime_str, get_current_datetime, parse_datetime_str
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e6b2f7c3d18'
+down_revision: Union[str, None] = '7d4c1e9a2b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+# tabela -> [(coluna, nullable)]
+DATE_COLUMNS: Dict[str, List[Tuple[str, bool]]] = {
+    'users': [('creation_date', False), ('last_login', True)],
+    'admin_users': [('creation_date', False), ('last_login', True)],
+    'employees': [('last_update', True)],
+    'briefings': [('creation_date', False), ('update_date', True)],
+    'conversation_histories': [('timestamp', False)],
+    'jobs': [('creation_date', False), ('update_date', True), ('finished_date', True)],
+}
+
+# Índices que contêm colunas de data: recriados depois da troca das colunas
+DATE_INDEXES: List[Tuple[str, str, List[str]]] = [
+    ('ix_users_status_creation_date', 'users', ['status', 'creation_date']),
+    ('ix_briefings_user_id_update_date', 'briefings', ['user_id', 'update_date']),
+]
+
+# Índices novos para consultas por janela de tempo (relatórios e retenção)
+TIME_WINDOW_INDEXES: List[Tuple[str, str, List[str]]] = [
+    ('ix_briefings_update_date', 'briefings', ['update_date']),
+    ('ix_conversation_histories_timestamp', 'conversation_histories', ['timestamp']),
+]
+
+
+def _to_utc_datetime(value):
+    parsed = parse_datetime_str(value) if isinstance(value, str) else None
+    if parsed is None:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _to_display_str(value):
+    if value is None:
+        return None
+    if isinstance(value, str): # SQLite devolve DATETIME como texto ISO
+        value = datetime.fromisoformat(value)
+    return format_datetime_str(value.replace(tzinfo=timezone.utc))
+
+
+def _copy_in_batches(table: str, source: str, target: str, convert, fallback) -> None:
+    """
+    Copia 'source' -> 'target' convertendo os valores, em lotes por id (keyset),
+    fora da transação da migração.
+    """
+    bind = op.get_bind()
+    last_id = 0
+    select_batch = sa.text(
+        f"SELECT id, {source} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :batch_size"
+    )
+    update_row = sa.text(f"UPDATE {table} SET {target} = :value WHERE id = :id")
+    with op.get_context().autocommit_block():
+        while True:
+            rows = bind.execute(select_batch, {"last_id": last_id, "batch_size": BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            params = []
+            for row_id, value in rows:
+                converted = convert(value)
+                if converted is None and value is not None:
+                    converted = fallback
+                params.append({"id": row_id, "value": converted})
+            # Em autocommit, cada UPDATE por id confirma sozinho: nenhuma trava dura mais que uma linha
+            bind.execute(update_row, params)
+            last_id = rows[-1][0]
+
+
+def _swap_columns(table: str, column: str, temp_column: str, new_type, nullable: bool) -> None:
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.drop_column(column)
+        batch_op.alter_column(temp_column, new_column_name=column, existing_type=new_type, nullable=nullable)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, _ in DATE_INDEXES:
+        op.drop_index(name, table_name=table)
+
+    # Datas ilegíveis em colunas obrigatórias recebem o instante da migração
+    migration_time = get_current_datetime().astimezone(timezone.utc).replace(tzinfo=None)
+    for table, columns in DATE_COLUMNS.items():
+        for column, nullable in columns:
+            temp_column = f"{column}_utc"
+            op.add_column(table, sa.Column(temp_column, sa.DateTime(), nullable=True))
+            _copy_in_batches(table, column, temp_column, _to_utc_datetime, migration_time)
+            if not nullable:
+                op.execute(sa.text(f"UPDATE {table} SET {temp_column} = :now WHERE {temp_column} IS NULL").bindparams(now=migration_time))
+            _swap_columns(table, column, temp_column, sa.DateTime(), nullable)
+
+    for name, table, columns in DATE_INDEXES + TIME_WINDOW_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in DATE_INDEXES + TIME_WINDOW_INDEXES:
+        op.drop_index(name, table_name=table)
+
+    for table, columns in DATE_COLUMNS.items():
+        for column, nullable in columns:
+            temp_column = f"{column}_str"
+            op.add_column(table, sa.Column(temp_column, sa.String(length=19), nullable=True))
+            _copy_in_batches(table, column, temp_column, _to_display_str, None)
+            _swap_columns(table, column, temp_column, sa.String(length=19), nullable)
+
+    for name, table, columns in DATE_INDEXES:
+        op.create_index(name, table, columns, unique=False)
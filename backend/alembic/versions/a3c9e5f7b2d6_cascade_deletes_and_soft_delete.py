@@ -0,0 +1,54 @@
+"""cascade_deletes_and_soft_delete
+
+Revision ID: a3c9e5f7b2d6
+Revises: f1b7d3e9a528
+Create Date: 2026-10-19 20:04:17.552310
+
+Recria as FKs de briefings, conversation_histories e conversation_history_archives com
+ON DELETE CASCADE (apenas MySQL: o SQLite não aplica FKs, e a tabela particionada de
+conversation_histories não tem FK) e cria briefings.deleted_at (exclusão lógica).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e5f7b2d6'
+down_revision: Union[str, None] = 'f1b7d3e9a528'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, coluna, tabela referenciada)
+CASCADE_FOREIGN_KEYS = (
+    ('briefings', 'user_id', 'users'),
+    ('conversation_histories', 'briefing_id', 'briefings'),
+    ('conversation_history_archives', 'briefing_id', 'briefings'),
+)
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    inspector = sa.inspect(bind)
+    for table, column, referred_table in CASCADE_FOREIGN_KEYS:
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key['constrained_columns'] != [column] or foreign_key['referred_table'] != referred_table:
+                continue
+            op.drop_constraint(foreign_key['name'], table, type_='foreignkey')
+            op.create_foreign_key(foreign_key['name'], table, referred_table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('briefings', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    _recreate_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(None)
+    with op.batch_alter_table('briefings') as batch_op:
+        batch_op.drop_column('deleted_at')
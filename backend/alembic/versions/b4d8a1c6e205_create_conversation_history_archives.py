@@ -0,0 +1,59 @@
+"""create_conversation_history_archives
+
+Revision ID: b4d8a1c6e205
+Revises: 9e6b2f7c3d18
+Create Date: 2026-10-19 15:42:07.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8a1c6e205'
+down_revision: Union[str, None] = '9e6b2f7c3d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversation_history_archives',
+    sa.Column('briefing_id', sa.Integer(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('first_message_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=False),
+    sa.Column('raw_bytes', sa.Integer(), nullable=False),
+    sa.Column('compressed_history', sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['briefing_id'], ['briefings.id'], ),
+    sa.PrimaryKeyConstraint('briefing_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Devolve as mensagens arquivadas à tabela quente antes de remover o arquivo.
+    """
+    from src.utils.history_archive_utils import unpack_history
+
+    connection = op.get_bind()
+    archives = sa.table('conversation_history_archives', sa.column('briefing_id'), sa.column('compressed_history'))
+    histories = sa.table(
+        'conversation_histories',
+        sa.column('id'), sa.column('briefing_id'), sa.column('sender_type'),
+        sa.column('message_content'), sa.column('timestamp'),
+    )
+    for briefing_id, blob in connection.execute(sa.select(archives.c.briefing_id, archives.c.compressed_history)).all():
+        messages = unpack_history(blob)
+        if messages:
+            connection.execute(histories.insert(), [
+                {"id": message_id, "briefing_id": briefing_id, "sender_type": sender_type,
+                 "message_content": content, "timestamp": timestamp.replace(tzinfo=None) if timestamp else None}
+                for message_id, sender_type, content, timestamp in messages
+            ])
+    op.drop_table('conversation_history_archives')
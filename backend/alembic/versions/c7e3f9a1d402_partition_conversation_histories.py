@@ -0,0 +1,59 @@
+"""partition_conversation_histories
+
+Revision ID: c7e3f9a1d402
+Revises: b4d8a1c6e205
+Create Date: 2026-10-19 16:55:31.118402
+
+Particiona conversation_histories (apenas MySQL, e só com HISTORY_PARTITIONING definido;
+nos demais casos a migração não faz nada). A conversão é online: cópia em lotes para uma
+tabela particionada, reconciliação e RENAME sob LOCK TABLES. A tabela original fica como
+conversation_histories_unpartitioned até ser removida pelo script de manutenção
+(python -m scripts.history_partitions drop-old-table).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.core.config import settings
+from src.db import partitioning
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e3f9a1d402'
+down_revision: Union[str, None] = 'b4d8a1c6e205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _enabled() -> bool:
+    if op.get_bind().dialect.name != 'mysql':
+        return False
+    return bool(settings.HISTORY_PARTITIONING)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _enabled():
+        print("Particionamento de conversation_histories desativado (HISTORY_PARTITIONING vazio ou banco não MySQL).")
+        return
+
+    def report(last_id: int, max_id: int) -> None:
+        print(f"conversation_histories: copiado até o id {last_id}/{max_id}")
+
+    with op.get_context().autocommit_block():
+        partitioning.convert_history_table(
+            op.get_bind(),
+            scheme=settings.HISTORY_PARTITIONING,
+            hash_partitions=settings.HISTORY_PARTITION_COUNT,
+            months_ahead=settings.HISTORY_PARTITION_MONTHS_AHEAD,
+            batch_size=settings.HISTORY_PARTITION_COPY_BATCH_SIZE,
+            on_progress=report,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    with op.get_context().autocommit_block():
+        partitioning.remove_partitioning(op.get_bind())
@@ -0,0 +1,32 @@
+"""create_search_documents
+
+Revision ID: d5f8a2c4e913
+Revises: a3c9e5f7b2d6
+Create Date: 2026-10-19 20:47:09.118026
+
+Cria o índice de busca textual 'search_documents' (ver src/db/search_index.py): tabela InnoDB
+com índice FULLTEXT no MySQL, tabela virtual FTS5 no SQLite. A migração não copia os dados
+existentes: rode 'python -m scripts.rebuild_search_index' em seguida.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.db import search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f8a2c4e913'
+down_revision: Union[str, None] = 'a3c9e5f7b2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    search_index.create_search_table(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    search_index.drop_search_table(op.get_bind())
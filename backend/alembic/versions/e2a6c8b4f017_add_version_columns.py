@@ -0,0 +1,34 @@
+"""add_version_columns
+
+Revision ID: e2a6c8b4f017
+Revises: c7e3f9a1d402
+Create Date: 2026-10-19 18:05:33.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c8b4f017'
+down_revision: Union[str, None] = 'c7e3f9a1d402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabelas com controle de concorrência otimista (ETag / If-Match)
+VERSIONED_TABLES = ('briefings', 'users', 'employees', 'admin_users')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,36 @@
+"""add_briefing_activity_counters
+
+Revision ID: f1b7d3e9a528
+Revises: e2a6c8b4f017
+Create Date: 2026-10-19 19:12:48.305617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d3e9a528'
+down_revision: Union[str, None] = 'e2a6c8b4f017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    As colunas começam zeradas: rode 'python -m scripts.backfill_briefing_activity' em seguida.
+    """
+    op.add_column('briefings', sa.Column('message_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('briefings', sa.Column('last_message_at', sa.DateTime(), nullable=True))
+    op.add_column('briefings', sa.Column('last_sender', sa.String(length=30), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('briefings') as batch_op:
+        batch_op.drop_column('last_sender')
+        batch_op.drop_column('last_message_at')
+        batch_op.drop_column('message_count')
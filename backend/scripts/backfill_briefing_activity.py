@@ -0,0 +1,46 @@
+# File: backend/scripts/backfill_briefing_activity.py
+#
+# Preenche (ou corrige) os contadores de atividade dos briefings: message_count, last_message_at
+# e last_sender, a partir de conversation_histories e dos históricos arquivados.
+#
+# Uso (a partir de backend/):
+#   python -m scripts.backfill_briefing_activity [--batch-size 500] [--after-id 0]
+#
+# Rode uma vez após a migração que cria as colunas e depois de remover mensagens fora do chat
+# (ex: 'history_partitions drop-months'). Cada lote é um commit; pode ser interrompido e retomado
+# com --after-id.
+
+import argparse
+import sys
+
+from src.cruds import briefing_cruds, conversation_history_cruds
+from src.db.database import SessionLocal
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recalcula os contadores de atividade dos briefings.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Briefings por lote (e por commit)")
+    parser.add_argument("--after-id", type=int, default=0, help="Retoma a partir deste briefing id")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db = SessionLocal()
+    last_id, total = args.after_id, 0
+    try:
+        while True:
+            briefing_ids = briefing_cruds.get_briefing_ids(db, after_id=last_id, limit=max(1, args.batch_size))
+            if not briefing_ids:
+                break
+            total += conversation_history_cruds.recompute_briefing_activity(db, briefing_ids)
+            last_id = briefing_ids[-1]
+            print(f"{total} briefing(s) atualizado(s) (até o id {last_id})")
+    finally:
+        db.close()
+    print("Backfill concluído.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
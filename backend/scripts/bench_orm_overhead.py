@@ -0,0 +1,153 @@
+# File: backend/scripts/bench_orm_overhead.py
+#
+# Microbenchmark do custo por chamada das consultas quentes do chat (get_briefing, get_user,
+# get_employee_by_name e as leituras do histórico): compara a forma antiga (db.query(...).filter(...),
+# remontada e com chave de cache recalculada a cada chamada) com as funções atuais dos cruds
+# (lambda_stmt, montadas uma vez). O banco é SQLite em memória, com poucos dados, para que o tempo
+# medido seja quase todo do lado Python (ORM), não do banco.
+#
+# Uso (a partir de backend/):
+#   python -m scripts.bench_orm_overhead
+#   python -m scripts.bench_orm_overhead --calls 20000
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Microbenchmark do custo por chamada do ORM nas consultas quentes.")
+    parser.add_argument("--calls", type=int, default=5000, help="Chamadas por rodada")
+    parser.add_argument("--rounds", type=int, default=5, help="Rodadas (o resultado é a mediana)")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+# As configurações da aplicação são lidas na importação de src.*
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine, func, insert # noqa: E402
+from sqlalchemy.orm import Session # noqa: E402
+from sqlalchemy.pool import StaticPool # noqa: E402
+
+from src.cruds import briefing_cruds, conversation_history_cruds, employee_cruds, user_cruds # noqa: E402
+from src.cruds.briefing_cruds import NOT_DELETED # noqa: E402
+from src.db.database import Base # noqa: E402
+from src.models import User, Briefing, ConversationHistory, Employee # noqa: E402
+
+# Um log por consulta distorce a medição
+for module in (briefing_cruds, conversation_history_cruds, employee_cruds, user_cruds):
+    logging.getLogger(module.__name__).setLevel(logging.WARNING)
+
+USERS, BRIEFINGS, MESSAGES = 50, 200, 4000
+EMPLOYEES = ["Assistente", "Designer", "Desenvolvedor", "Gerente"]
+
+
+# --- Forma antiga (antes da troca para lambda_stmt) ---
+
+def legacy_get_briefing(db, briefing_id):
+    return db.query(Briefing).filter(Briefing.id == briefing_id, NOT_DELETED).first()
+
+def legacy_get_user(db, user_id):
+    return db.query(User).filter(User.id == user_id).first()
+
+def legacy_get_employee_by_name(db, employee_name):
+    return db.query(Employee).filter(Employee.employee_name == employee_name).first()
+
+# As leituras do histórico mantêm a consulta ao arquivo comprimido, como nos cruds
+def legacy_get_history_marker(db, briefing_id):
+    count, last_id = (
+        db.query(func.count(ConversationHistory.id), func.max(ConversationHistory.id))
+        .filter(ConversationHistory.briefing_id == briefing_id)
+        .one()
+    )
+    archive = conversation_history_cruds.get_history_archive(db, briefing_id)
+    if archive is not None:
+        return (count or 0) + archive.message_count, max(last_id or 0, archive.last_message_id)
+    return count or 0, last_id or 0
+
+def legacy_get_recent_transcript_rows(db, briefing_id, limit=50):
+    rows = (
+        db.query(ConversationHistory.id, ConversationHistory.sender_type, ConversationHistory.message_content)
+        .filter(ConversationHistory.briefing_id == briefing_id)
+        .order_by(ConversationHistory.id.desc())
+        .limit(limit)
+        .all()
+    )
+    recent = [tuple(row) for row in reversed(rows)]
+    if len(recent) < limit:
+        archived = [message[:3] for message in conversation_history_cruds.get_archived_messages(db, briefing_id)]
+        recent = archived[max(0, len(archived) - (limit - len(recent))):] + recent
+    return recent
+
+
+# (nome, forma antiga, forma atual, argumento da i-ésima chamada)
+CASES = [
+    ("get_briefing", legacy_get_briefing, briefing_cruds.get_briefing, lambda i: i % BRIEFINGS + 1),
+    ("get_user", legacy_get_user, user_cruds.get_user, lambda i: i % USERS + 1),
+    ("get_employee_by_name", legacy_get_employee_by_name, employee_cruds.get_employee_by_name, lambda i: EMPLOYEES[i % len(EMPLOYEES)]),
+    ("marcador do histórico", legacy_get_history_marker, conversation_history_cruds.get_conversation_history_marker, lambda i: i % BRIEFINGS + 1),
+    ("últimas 50 mensagens", legacy_get_recent_transcript_rows, conversation_history_cruds.get_recent_transcript_rows, lambda i: i % BRIEFINGS + 1),
+]
+
+
+def seed(engine):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "nickname": f"user{u}", "email": f"user{u}@bench.local", "creation_date": "2025-01-01 10:00:00"}
+            for u in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Briefing.__table__), [
+            {"id": b, "user_id": b % USERS + 1, "title": f"Briefing {b}", "status": "Em Construção", "creation_date": "2025-01-01 10:00:00"}
+            for b in range(1, BRIEFINGS + 1)
+        ])
+        conn.execute(insert(Employee.__table__), [
+            {"employee_name": name, "employee_script": {"system_prompt": f"Você é {name}."}, "ia_name": "Bench",
+             "endpoint_url": "http://bench.local", "endpoint_key": "bench", "headers_template": {}, "body_template": {}}
+            for name in EMPLOYEES
+        ])
+        conn.execute(insert(ConversationHistory.__table__), [
+            {"briefing_id": m % BRIEFINGS + 1, "sender_type": "User", "message_content": f"Mensagem {m}", "timestamp": "2025-01-01 10:00:00"}
+            for m in range(MESSAGES)
+        ])
+
+
+def per_call_us(db, function, argument):
+    for i in range(500): # aquece o cache de compilação
+        function(db, argument(i))
+    samples = []
+    for _ in range(ARGS.rounds):
+        started = time.perf_counter()
+        for i in range(ARGS.calls):
+            function(db, argument(i))
+        samples.append((time.perf_counter() - started) / ARGS.calls * 1_000_000)
+        db.expunge_all() # como numa sessão nova por requisição
+    return statistics.median(samples)
+
+
+def main():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    seed(engine)
+    db = Session(engine)
+    print(f"===== Custo por chamada (µs, mediana de {ARGS.rounds} rodadas de {ARGS.calls} chamadas) =====")
+    print(f"{'consulta':24s} {'db.query':>10s} {'lambda_stmt':>12s} {'ganho':>8s}")
+    try:
+        for name, legacy, current, argument in CASES:
+            # As duas formas devem devolver o mesmo resultado
+            assert legacy(db, argument(7)) == current(db, argument(7)), name
+            before = per_call_us(db, legacy, argument)
+            after = per_call_us(db, current, argument)
+            print(f"{name:24s} {before:10.1f} {after:12.1f} {(1 - after / before) * 100:7.0f}%")
+    finally:
+        db.close()
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
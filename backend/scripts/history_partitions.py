@@ -0,0 +1,83 @@
+# File: backend/scripts/history_partitions.py
+#
+# Manutenção das partições de conversation_histories (MySQL; ver src/db/partitioning.py).
+#
+# Uso (a partir de backend/):
+#   python -m scripts.history_partitions list
+#   python -m scripts.history_partitions convert [--scheme month]      # conversão online em lotes
+#   python -m scripts.history_partitions add-months [--ahead 3]         # esquema "month"
+#   python -m scripts.history_partitions drop-months --before 2025-01-01 --yes   # retenção: APAGA mensagens
+#   python -m scripts.history_partitions resize --partitions 32         # esquema "briefing_hash"
+#   python -m scripts.history_partitions drop-old-table --yes           # remove a tabela original após a conversão
+#
+# Agende 'add-months' (ex: cron mensal) no esquema "month" para que nunca falte a partição do mês.
+
+import argparse
+import sys
+from datetime import date
+
+from src.core.config import settings
+from src.db import partitioning
+from src.db.database import engine
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Manutenção das partições de conversation_histories.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Lista as partições e as linhas estimadas")
+    convert = commands.add_parser("convert", help="Converte a tabela para o esquema particionado")
+    convert.add_argument("--scheme", choices=partitioning.SCHEMES, default=settings.HISTORY_PARTITIONING)
+    convert.add_argument("--partitions", type=int, default=settings.HISTORY_PARTITION_COUNT)
+    convert.add_argument("--batch-size", type=int, default=settings.HISTORY_PARTITION_COPY_BATCH_SIZE)
+    add_months = commands.add_parser("add-months", help="Cria as partições mensais futuras")
+    add_months.add_argument("--ahead", type=int, default=settings.HISTORY_PARTITION_MONTHS_AHEAD)
+    drop_months = commands.add_parser("drop-months", help="Remove as partições mensais anteriores a uma data")
+    drop_months.add_argument("--before", type=date.fromisoformat, required=True)
+    drop_months.add_argument("--yes", action="store_true", help="Confirma a remoção das mensagens")
+    resize = commands.add_parser("resize", help="Ajusta a quantidade de partições HASH")
+    resize.add_argument("--partitions", type=int, required=True)
+    drop_old = commands.add_parser("drop-old-table", help="Remove conversation_histories_unpartitioned")
+    drop_old.add_argument("--yes", action="store_true", help="Confirma a remoção da tabela")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if engine.dialect.name != "mysql":
+        print("O particionamento só está disponível no MySQL.")
+        return 1
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if args.command == "list":
+            for partition in partitioning.list_partitions(conn):
+                print(f"{partition['name']:10s} {partition['method']:8s} {str(partition['description']):>10s} {partition['rows']:>12d} linhas")
+        elif args.command == "convert":
+            if not args.scheme:
+                print("Informe --scheme ou defina HISTORY_PARTITIONING.")
+                return 1
+            converted = partitioning.convert_history_table(
+                conn, args.scheme, args.partitions, settings.HISTORY_PARTITION_MONTHS_AHEAD, args.batch_size,
+                on_progress=lambda last_id, max_id: print(f"copiado até o id {last_id}/{max_id}"),
+            )
+            print("Conversão concluída." if converted else "A tabela já está particionada.")
+        elif args.command == "add-months":
+            print(f"Partições criadas: {partitioning.add_month_partitions(conn, args.ahead) or 'nenhuma'}")
+        elif args.command == "drop-months":
+            if not args.yes:
+                print("Remover partições apaga as mensagens desses meses. Repita com --yes para confirmar.")
+                return 1
+            print(f"Partições removidas: {partitioning.drop_month_partitions_before(conn, args.before) or 'nenhuma'}")
+        elif args.command == "resize":
+            previous = partitioning.resize_hash_partitions(conn, args.partitions)
+            print(f"Partições: {previous} -> {args.partitions}")
+        elif args.command == "drop-old-table":
+            if not args.yes:
+                print(f"Repita com --yes para remover '{partitioning.OLD_TABLE}'.")
+                return 1
+            partitioning.drop_old_table(conn)
+            print(f"Tabela '{partitioning.OLD_TABLE}' removida.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# File: backend/scripts/rebuild_search_index.py
+#
+# (Re)constrói o índice de busca textual 'search_documents' a partir das mensagens (tabela e
+# históricos arquivados) e do conteúdo dos briefings. Cada lote é um upsert e um commit; o
+# índice continua consultável durante a reconstrução.
+#
+# Uso (a partir de backend/):
+#   python -m scripts.rebuild_search_index [--batch-size 5000] [--clear]
+#
+# Rode uma vez após a migração que cria a tabela, depois de importações em massa de briefings e
+# depois de 'history_partitions drop-months' com --clear (remove mensagens que não existem mais).
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import delete, select
+
+from src.cruds import conversation_history_cruds
+from src.db import search_index
+from src.db.database import SessionLocal
+from src.models.briefing_models import Briefing
+from src.models.conversation_archive_models import ConversationHistoryArchive
+from src.models.conversation_history_models import ConversationHistory
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Reconstrói o índice de busca textual.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documentos por lote (e por commit)")
+    parser.add_argument("--clear", action="store_true", help="Esvazia o índice antes de reconstruir")
+    return parser.parse_args()
+
+
+def _index_messages(db, batch_size):
+    total, last_id = 0, 0
+    while True:
+        rows = db.execute(
+            select(ConversationHistory.id, ConversationHistory.briefing_id, ConversationHistory.message_content)
+            .where(ConversationHistory.id > last_id)
+            .order_by(ConversationHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        search_index.upsert_documents(db, [
+            {"id": search_index.document_id(search_index.MESSAGE, message_id), "briefing_id": briefing_id, "body": content}
+            for message_id, briefing_id, content in rows
+        ])
+        db.commit()
+        total += len(rows)
+        last_id = rows[-1][0]
+        print(f"mensagens: {total} indexada(s) (até o id {last_id})")
+
+
+def _index_archives(db, batch_size):
+    total, last_id = 0, 0
+    while True:
+        briefing_ids = list(db.execute(
+            select(ConversationHistoryArchive.briefing_id)
+            .where(ConversationHistoryArchive.briefing_id > last_id)
+            .order_by(ConversationHistoryArchive.briefing_id)
+            .limit(100)
+        ).scalars())
+        if not briefing_ids:
+            return total
+        for briefing_id in briefing_ids:
+            messages = conversation_history_cruds.get_archived_messages(db, briefing_id)
+            for start in range(0, len(messages), batch_size):
+                search_index.upsert_documents(db, [
+                    {"id": search_index.document_id(search_index.MESSAGE, message_id), "briefing_id": briefing_id, "body": content}
+                    for message_id, _, content, _ in messages[start:start + batch_size]
+                ])
+                db.commit()
+            total += len(messages)
+        last_id = briefing_ids[-1]
+        print(f"mensagens arquivadas: {total} indexada(s) (até o briefing {last_id})")
+
+
+def _index_briefings(db, batch_size):
+    total, last_id = 0, 0
+    while True:
+        rows = db.execute(
+            select(Briefing.id, Briefing.content)
+            .where(Briefing.id > last_id, Briefing.deleted_at.is_(None))
+            .order_by(Briefing.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        search_index.upsert_documents(db, [
+            {
+                "id": search_index.document_id(search_index.BRIEFING, briefing_id),
+                "briefing_id": briefing_id,
+                "body": search_index.briefing_search_text(content),
+            }
+            for briefing_id, content in rows
+        ])
+        db.commit()
+        total += len(rows)
+        last_id = rows[-1][0]
+        print(f"briefings: {total} indexado(s) (até o id {last_id})")
+
+
+def main():
+    args = parse_args()
+    batch_size = max(1, args.batch_size)
+    db = SessionLocal()
+    try:
+        if not search_index.is_enabled(db.get_bind()):
+            print("Busca textual desativada (SEARCH_INDEX_ENABLED) ou banco sem suporte.")
+            return 1
+        started = time.perf_counter()
+        if args.clear:
+            db.execute(delete(search_index.search_table(db.get_bind())))
+            db.commit()
+            print("Índice esvaziado.")
+        messages = _index_messages(db, batch_size)
+        archived = _index_archives(db, batch_size)
+        briefings = _index_briefings(db, batch_size)
+    finally:
+        db.close()
+    print(f"Índice reconstruído em {time.perf_counter() - started:.1f}s: {messages} mensagem(ns), "
+          f"{archived} arquivada(s), {briefings} briefing(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,10 @@ import logging
 
 from src.models.admin_user_models import AdminUser
 from src.schemas.admin_user_schemas import AdminUserCreate, AdminUserUpdate
-from src.utils.datetime_utils import get_current_datetime_str
+from src.utils.datetime_utils import get_current_datetime
 from src.core.security import get_password_hash, verify_password
+from src.db.versioning import versioned_update
+from src.dependencies.concurrency import version_conflict
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,12 +32,15 @@ def get_admin_user_by_username(db: Session, username: str) -> Optional[AdminUser
     logger.info(f"Buscando usuário administrador com username: '{username}'")
     return db.query(AdminUser).filter(AdminUser.username == username).first()
 
-def get_admin_users(db: Session, skip: int = 0, limit: int = 100) -> List[AdminUser]:
+def get_admin_users(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[AdminUser]:
     """
     Retorna uma lista de usuários administradores com paginação.
+    Com 'after_id' a página é buscada por keyset (id > after_id); 'skip' é o modo antigo, por offset.
     """
-    logger.info(f"Buscando lista de usuários administradores (skip={skip}, limit={limit})")
-    return db.query(AdminUser).offset(skip).limit(limit).all()
+    logger.info(f"Buscando lista de usuários administradores (after_id={after_id}, skip={skip}, limit={limit})")
+    query = db.query(AdminUser).order_by(AdminUser.id.asc())
+    query = query.filter(AdminUser.id > after_id) if after_id is not None else query.offset(skip)
+    return query.limit(limit).all()
 
 def create_admin_user(db: Session, admin_user: AdminUserCreate) -> AdminUser:
     """
@@ -51,7 +56,7 @@ def create_admin_user(db: Session, admin_user: AdminUserCreate) -> AdminUser:
         username=admin_user.username,
         password_hash=hashed_password,
         # two_factor_secret e is_two_factor_enabled terão valores padrão ou serão definidos via outra rota
-        creation_date=get_current_datetime_str() # Preenche a data de criação
+        creation_date=get_current_datetime() # Preenche a data de criação
     )
     
     try:
@@ -75,16 +80,18 @@ def create_admin_user(db: Session, admin_user: AdminUserCreate) -> AdminUser:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro interno do servidor ao criar admin user: {e}")
 
 
-def update_admin_user(db: Session, admin_user_id: int, admin_user: AdminUserUpdate) -> Optional[AdminUser]:
+def update_admin_user(
+    db: Session,
+    admin_user_id: int,
+    admin_user: AdminUserUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[AdminUser]:
     """
-    Atualiza um registro de usuário administrador existente.
+    Atualiza um registro de usuário administrador existente com um único UPDATE condicional
+    (ver versioned_update). Com 'expected_version' (If-Match), a alteração só é gravada se a
+    versão não mudou; caso contrário, 409.
     """
     logger.info(f"Tentando atualizar admin user ID: {admin_user_id}")
-    db_admin_user = db.query(AdminUser).filter(AdminUser.id == admin_user_id).first()
-    
-    if db_admin_user is None:
-        logger.warning(f"Admin User ID {admin_user_id} não encontrado para atualização.")
-        return None
 
     # Preparar os dados de atualização. admin_user.model_dump(exclude_unset=True) é para Pydantic V2
     # e garante que apenas campos fornecidos sejam considerados.
@@ -93,17 +100,10 @@ def update_admin_user(db: Session, admin_user_id: int, admin_user: AdminUserUpda
     # Processar a senha separadamente, se fornecida
     if "password" in update_data and update_data["password"] is not None:
         update_data["password_hash"] = get_password_hash(update_data.pop("password")) # Substitui 'password' por 'password_hash'
-    
-    # Preencher os campos do modelo com os dados atualizados
-    for key, value in update_data.items():
-        setattr(db_admin_user, key, value)
-    
+    update_data.pop("password", None)
+
     try:
-        db.add(db_admin_user) # Adicionar novamente para garantir que o SQLAlchemy rastreie as mudanças
-        db.commit()
-        db.refresh(db_admin_user)
-        logger.info(f"Admin User ID {admin_user_id} atualizado com sucesso.")
-        return db_admin_user
+        db_admin_user = versioned_update(db, AdminUser, admin_user_id, update_data, expected_version=expected_version)
     except IntegrityError as e:
         db.rollback()
         error_message = str(e.orig)
@@ -117,6 +117,15 @@ def update_admin_user(db: Session, admin_user_id: int, admin_user: AdminUserUpda
         logger.error(f"Erro inesperado ao atualizar admin user ID {admin_user_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro interno do servidor ao atualizar admin user: {e}")
 
+    if db_admin_user is None:
+        if expected_version is not None:
+            logger.warning(f"Admin User ID {admin_user_id} não foi atualizado: versão diferente de {expected_version} (ou inexistente).")
+            raise version_conflict("O administrador")
+        logger.warning(f"Admin User ID {admin_user_id} não encontrado para atualização.")
+        return None
+    logger.info(f"Admin User ID {admin_user_id} atualizado com sucesso (versão {db_admin_user.version}).")
+    return db_admin_user
+
 def delete_admin_user(db: Session, admin_user_id: int) -> bool:
     """
     Deleta um registro de usuário administrador.
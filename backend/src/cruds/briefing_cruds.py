@@ -1,18 +1,35 @@
 # File: backend/src/cruds/briefing_cruds.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+from sqlalchemy import delete, func, insert, lambda_stmt, literal, or_, select, tuple_, update
+import json
 import logging
 from fastapi import HTTPException, status
 
 from src.models.briefing_models import Briefing
+from src.models.conversation_archive_models import ConversationHistoryArchive
+from src.models.conversation_history_models import ConversationHistory
+from src.cruds.conversation_history_cruds import archived_messages_as_entries
+from src.utils.history_archive_utils import unpack_history
+from src.utils.json_patch_utils import (
+    JsonPatchConflict, JsonPatchError, apply_patch, build_mysql_patch, describe_changes,
+    format_pointer, supports_server_side, to_mysql_path
+)
 from src.schemas.briefing_schemas import BriefingCreate, BriefingUpdate
-from src.utils.datetime_utils import get_current_datetime_str
+from src.utils.datetime_utils import get_current_datetime
+from src.db import search_index
+from src.db.versioning import versioned_update
+from src.dependencies.concurrency import version_conflict
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Briefings com exclusão lógica (aguardando a remoção em segundo plano) não aparecem nas consultas
+NOT_DELETED = Briefing.deleted_at.is_(None)
+
 # --- Funções CRUD para Briefing ---
 
 def get_briefing(db: Session, briefing_id: int) -> Optional[Briefing]:
@@ -20,14 +37,72 @@ def get_briefing(db: Session, briefing_id: int) -> Optional[Briefing]:
     Busca um briefing pelo seu ID.
     """
     logger.info(f"Buscando briefing com ID: {briefing_id}")
-    return db.query(Briefing).filter(Briefing.id == briefing_id).first()
+    # Consulta quente (várias vezes por turno do chat): lambda_stmt reaproveita o SELECT já compilado
+    return db.execute(
+        lambda_stmt(lambda: select(Briefing).where(Briefing.id == briefing_id, NOT_DELETED).limit(1))
+    ).scalars().first()
+
+def get_briefing_with_history(db: Session, briefing_id: int, message_limit: Optional[int] = None) -> Optional[Briefing]:
+    """
+    Busca um briefing com o histórico de conversas já carregado em 'conversation_histories',
+    sempre em duas consultas (briefing + mensagens), sem carregamento preguiçoso por linha.
+    Com 'message_limit', carrega apenas as últimas N mensagens (em ordem cronológica);
+    nesse caso a coleção é parcial e o objeto deve ser usado apenas para leitura.
+    Se parte do histórico estiver arquivada, a lista completa (arquivo + tabela) fica em
+    'conversation_history', lida pelo schema no lugar da relação.
+    """
+    logger.info(f"Buscando briefing com ID: {briefing_id} e histórico (limite de mensagens: {message_limit})")
+    if message_limit is None:
+        db_briefing = (
+            db.query(Briefing)
+            .options(selectinload(Briefing.conversation_histories), joinedload(Briefing.history_archive))
+            .filter(Briefing.id == briefing_id, NOT_DELETED)
+            .first()
+        )
+        if not db_briefing:
+            return None
+        hot_messages = list(db_briefing.conversation_histories)
+    else:
+        db_briefing = (
+            db.query(Briefing)
+            .options(joinedload(Briefing.history_archive))
+            .filter(Briefing.id == briefing_id, NOT_DELETED)
+            .first()
+        )
+        if not db_briefing:
+            return None
+        recent_messages = (
+            db.query(ConversationHistory)
+            .filter(ConversationHistory.briefing_id == briefing_id)
+            .order_by(ConversationHistory.id.desc())
+            .limit(message_limit)
+            .all()
+        )
+        hot_messages = list(reversed(recent_messages))
+        # Preenche a relação como já carregada, sem marcar alteração nem disparar novo SELECT
+        set_committed_value(db_briefing, "conversation_histories", hot_messages)
+
+    if db_briefing.history_archive is not None:
+        archived = archived_messages_as_entries(briefing_id, unpack_history(db_briefing.history_archive.compressed_history))
+        history = archived + hot_messages
+        db_briefing.conversation_history = history[-message_limit:] if message_limit is not None else history
+    return db_briefing
 
-def get_briefings_by_user_id(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Briefing]:
+def get_briefings_by_user_id(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[Briefing]:
     """
     Retorna uma lista de briefings de um usuário específico, com paginação.
+    Com 'after_id' a página é buscada por keyset (id > after_id); 'skip' é o modo antigo, por offset.
     """
-    logger.info(f"Buscando briefings para o usuário ID: {user_id}")
-    return db.query(Briefing).filter(Briefing.user_id == user_id).offset(skip).limit(limit).all()
+    logger.info(f"Buscando briefings para o usuário ID: {user_id} (after_id: {after_id}, skip: {skip})")
+    query = db.query(Briefing).filter(Briefing.user_id == user_id, NOT_DELETED).order_by(Briefing.id.asc())
+    query = query.filter(Briefing.id > after_id) if after_id is not None else query.offset(skip)
+    return query.limit(limit).all()
 
 def get_briefing_by_user_id_and_title(db: Session, user_id: int, title: str) -> Optional[Briefing]:
     """
@@ -45,11 +120,14 @@ def create_briefing(db: Session, briefing: BriefingCreate, user_id: int) -> Brie
     db_briefing = Briefing(
         **briefing.model_dump(),
         user_id=user_id,
-        creation_date=get_current_datetime_str(),
+        creation_date=get_current_datetime(),
         last_edited_by="user" # Assumimos que o usuário cria o briefing inicialmente
     )
     try:
         db.add(db_briefing)
+        if db_briefing.content is not None and search_index.is_enabled(db.get_bind()):
+            db.flush() # o id do briefing compõe o id do documento de busca
+            search_index.index_briefing(db, db_briefing.id, db_briefing.content)
         db.commit()
         db.refresh(db_briefing)
         logger.info(f"Briefing ID {db_briefing.id} criado com sucesso para user_id: {user_id}.")
@@ -75,31 +153,25 @@ def create_briefing(db: Session, briefing: BriefingCreate, user_id: int) -> Brie
             detail=f"Erro interno do servidor ao criar briefing: {e}"
         )
 
-def update_briefing(db: Session, briefing_id: int, briefing: BriefingUpdate, editor_type: str = "user") -> Optional[Briefing]:
+def update_briefing(
+    db: Session,
+    briefing_id: int,
+    briefing: BriefingUpdate,
+    editor_type: str = "user",
+    expected_version: Optional[int] = None
+) -> Optional[Briefing]:
     """
-    Atualiza um registro de briefing existente.
+    Atualiza um registro de briefing existente com um único UPDATE condicional (ver versioned_update).
     Permite que 'editor_type' seja 'user' ou 'admin' ou 'ai'.
+    Com 'expected_version' (If-Match), a alteração só é gravada se a versão não mudou; caso contrário, 409.
     """
     logger.info(f"Tentando atualizar briefing ID: {briefing_id} por {editor_type}")
-    db_briefing = db.query(Briefing).filter(Briefing.id == briefing_id).first()
-    if not db_briefing:
-        logger.warning(f"Briefing ID {briefing_id} não encontrado para atualização.")
-        return None
-
     update_data = briefing.model_dump(exclude_unset=True)
-
-    for key, value in update_data.items():
-        setattr(db_briefing, key, value)
-    
-    db_briefing.update_date = get_current_datetime_str()
-    db_briefing.last_edited_by = editor_type
+    update_data["update_date"] = get_current_datetime()
+    update_data["last_edited_by"] = editor_type
 
     try:
-        db.add(db_briefing)
-        db.commit()
-        db.refresh(db_briefing)
-        logger.info(f"Briefing ID {briefing_id} atualizado com sucesso por {editor_type}.")
-        return db_briefing
+        db_briefing = versioned_update(db, Briefing, briefing_id, update_data, expected_version=expected_version)
     except IntegrityError as e:
         db.rollback()
         error_message = str(e.orig)
@@ -121,24 +193,324 @@ def update_briefing(db: Session, briefing_id: int, briefing: BriefingUpdate, edi
             detail=f"Erro interno do servidor ao atualizar briefing: {e}"
         )
 
-def delete_briefing(db: Session, briefing_id: int) -> bool:
+    if db_briefing is None:
+        if expected_version is not None:
+            logger.warning(f"Briefing ID {briefing_id} não foi atualizado: versão diferente de {expected_version} (ou inexistente).")
+            raise version_conflict("O briefing")
+        logger.warning(f"Briefing ID {briefing_id} não encontrado para atualização.")
+        return None
+    if "content" in update_data and search_index.is_enabled(db.get_bind()):
+        search_index.index_briefing(db, briefing_id, db_briefing.content)
+        db.commit()
+    logger.info(f"Briefing ID {briefing_id} atualizado com sucesso por {editor_type} (versão {db_briefing.version}).")
+    return db_briefing
+
+def save_compiled_content(
+    db: Session,
+    briefing_id: int,
+    content: Dict[str, Any],
+    compiled_until_message_id: int,
+    compiled_script_version: str,
+    expected_version: Optional[int] = None
+) -> Optional[Briefing]:
     """
-    Deleta um registro de briefing.
+    Salva o resultado de uma compilação junto com a marca d'água (último id de mensagem
+    incluído e versão do roteiro). A versão é incrementada, invalidando o ETag de quem leu o
+    briefing antes da compilação.
+    Com 'expected_version' (a versão lida no início da compilação) a gravação é condicional:
+    se o usuário editou o briefing enquanto a IA compilava, nada é gravado e levanta 409,
+    em vez de sobrescrever a edição.
     """
-    logger.info(f"Tentando deletar briefing ID: {briefing_id}")
-    db_briefing = db.query(Briefing).filter(Briefing.id == briefing_id).first()
-    if db_briefing:
-        try:
-            db.delete(db_briefing)
+    logger.info(f"Salvando compilação do briefing ID: {briefing_id} (até a mensagem {compiled_until_message_id})")
+    values = {
+        "content": content,
+        "status": "Compilado",
+        "compiled_until_message_id": compiled_until_message_id,
+        "compiled_script_version": compiled_script_version,
+        "update_date": get_current_datetime(),
+        "last_edited_by": "ai",
+    }
+    try:
+        db_briefing = versioned_update(db, Briefing, briefing_id, values, expected_version=expected_version)
+        if db_briefing is not None:
+            search_index.index_briefing(db, briefing_id, content)
             db.commit()
-            logger.info(f"Briefing ID {briefing_id} deletado com sucesso.")
-            return True
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Erro inesperado ao deletar briefing ID {briefing_id}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Erro interno do servidor ao deletar briefing: {e}"
+            # versioned_update desanexa a instância; a compilação devolve o briefing à sessão de quem chamou
+            db.add(db_briefing)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro inesperado ao salvar compilação do briefing ID {briefing_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao salvar compilação: {e}"
+        )
+    if db_briefing is None:
+        if expected_version is not None:
+            logger.warning(f"Compilação do briefing ID {briefing_id} descartada: briefing alterado durante a compilação (versão diferente de {expected_version}).")
+            raise version_conflict("O briefing")
+        logger.warning(f"Briefing ID {briefing_id} não encontrado para salvar a compilação.")
+        return None
+    return db_briefing
+
+def _stale_compiled_filter(script_version: str):
+    # Briefings já compilados (com marca d'água ou status 'Compilado') com outra versão do roteiro
+    return [
+        NOT_DELETED,
+        or_(Briefing.compiled_until_message_id.isnot(None), Briefing.status == "Compilado"),
+        or_(Briefing.compiled_script_version.is_(None), Briefing.compiled_script_version != script_version),
+    ]
+
+def count_stale_compiled_briefings(db: Session, script_version: str) -> int:
+    """
+    Conta os briefings compilados com uma versão de roteiro diferente de 'script_version'.
+    """
+    return db.query(func.count(Briefing.id)).filter(*_stale_compiled_filter(script_version)).scalar() or 0
+
+def get_stale_compiled_briefings(
+    db: Session,
+    script_version: str,
+    after_id: int = 0,
+    limit: int = 50
+) -> List[Tuple[int, int]]:
+    """
+    Página (keyset por id) de briefings compilados com roteiro desatualizado.
+    Retorna tuplas (id, user_id) com id > 'after_id', em ordem crescente.
+    """
+    rows = (
+        db.query(Briefing.id, Briefing.user_id)
+        .filter(Briefing.id > after_id, *_stale_compiled_filter(script_version))
+        .order_by(Briefing.id.asc())
+        .limit(limit)
+        .all()
+    )
+    return [(row.id, row.user_id) for row in rows]
+
+PATCHABLE_DOCUMENTS = ("content", "development_roteiro")
+
+def _decode_json_value(value: Any) -> Any:
+    # JSON_EXTRACT devolve o valor serializado (texto ou bytes, conforme o driver)
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    return json.loads(value) if isinstance(value, str) else value
+
+def get_briefing_owner_id(db: Session, briefing_id: int) -> Optional[int]:
+    """
+    Dono do briefing, sem carregar os documentos JSON (consulta leve para checar permissão).
+    """
+    return db.query(Briefing.user_id).filter(Briefing.id == briefing_id, NOT_DELETED).scalar()
+
+def patch_briefing_document(
+    db: Session,
+    briefing_id: int,
+    operations: List[Dict[str, Any]],
+    document: str = "content",
+    editor_type: str = "user",
+    expected_version: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Aplica um JSON Patch (RFC 6902) ao documento 'content' (ou 'development_roteiro') do briefing.
+    No MySQL o patch vira um único UPDATE com JSON_SET/JSON_REMOVE no servidor (o documento não
+    trafega), e depois só os caminhos alterados são lidos. Nos demais bancos (SQLite) o documento
+    é lido, alterado em Python e regravado. Com 'expected_version' (If-Match) o patch só é gravado
+    se a versão do briefing não mudou (409 caso contrário).
+    Retorna {"id", "update_date", "version", "changes"} ou None.
+    """
+    if document not in PATCHABLE_DOCUMENTS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Documento '{document}' não pode ser alterado por patch.")
+    logger.info(f"Aplicando JSON Patch ({len(operations)} operação(ões)) em '{document}' do briefing ID: {briefing_id} por {editor_type}")
+    column = getattr(Briefing, document)
+    now = get_current_datetime()
+    values = {document: None, "update_date": now, "last_edited_by": editor_type, "version": Briefing.version + 1}
+    version_matches = [Briefing.version == expected_version] if expected_version is not None else []
+
+    try:
+        if db.get_bind().dialect.name == "mysql" and supports_server_side(operations):
+            new_document, conditions, changed = build_mysql_patch(column, operations)
+            result = db.execute(
+                update(Briefing)
+                .where(Briefing.id == briefing_id, *version_matches, *conditions)
+                .values({**values, document: new_document})
+                .execution_options(synchronize_session=False)
             )
-    logger.warning(f"Briefing ID {briefing_id} não encontrado para deleção.")
-    return False
\ No newline at end of file
+            if result.rowcount == 0:
+                current = db.query(Briefing.version, column).filter(Briefing.id == briefing_id).first()
+                if current is None:
+                    return None
+                if expected_version is not None and current[0] != expected_version:
+                    raise version_conflict("O briefing")
+                # Caminho raro: reaplica em Python só para descrever qual operação falhou
+                apply_patch(current[1], operations)
+                raise JsonPatchConflict("O patch não se aplica ao documento atual.")
+            row = db.execute(
+                select(Briefing.version, *[func.JSON_EXTRACT(column, to_mysql_path(tokens)) for tokens in changed])
+                .where(Briefing.id == briefing_id)
+            ).first()
+            new_version = row[0]
+            changes = [
+                {"path": format_pointer(tokens), "op": "set", "value": _decode_json_value(value)}
+                if value is not None else {"path": format_pointer(tokens), "op": "remove", "value": None}
+                for tokens, value in zip(changed, row[1:])
+            ]
+        else:
+            current = db.query(Briefing.version, column).filter(Briefing.id == briefing_id).first()
+            if current is None:
+                return None
+            if expected_version is not None and current[0] != expected_version:
+                raise version_conflict("O briefing")
+            new_document, changed = apply_patch(current[1], operations)
+            # A versão lida volta na condição: uma escrita concorrente entre a leitura e o UPDATE é detectada
+            result = db.execute(
+                update(Briefing)
+                .where(Briefing.id == briefing_id, Briefing.version == current[0])
+                .values({**values, document: new_document})
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                raise version_conflict("O briefing")
+            new_version = current[0] + 1
+            changes = describe_changes(new_document, changed)
+        db.commit()
+    # Patch inválido ou em conflito é detectado antes de qualquer escrita: não há o que desfazer
+    except JsonPatchError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except JsonPatchConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if document == "content":
+        reindex_briefing(db, briefing_id)
+    logger.info(f"JSON Patch aplicado ao briefing ID {briefing_id}: {len(changes)} caminho(s) alterado(s).")
+    return {"id": briefing_id, "update_date": now, "version": new_version, "changes": changes}
+
+def reindex_briefing(db: Session, briefing_id: int) -> None:
+    """
+    Atualiza o documento do briefing (conteúdo compilado) no índice de busca, em um commit curto.
+    Usado depois das escritas que não leem o documento (JSON Patch aplicado no servidor).
+    """
+    if not search_index.is_enabled(db.get_bind()):
+        return
+    row = db.execute(select(Briefing.content).where(Briefing.id == briefing_id)).first()
+    if row is not None:
+        search_index.index_briefing(db, briefing_id, row.content)
+        db.commit()
+
+def get_briefing_ids(db: Session, after_id: int = 0, limit: int = 500) -> List[int]:
+    """
+    Ids dos briefings em ordem, por keyset (para varreduras em lote, como o backfill dos contadores).
+    """
+    return list(db.execute(select(Briefing.id).where(Briefing.id > after_id).order_by(Briefing.id).limit(limit)).scalars())
+
+# --- Importação em massa ---
+
+def get_taken_briefing_titles(db: Session, pairs: Iterable[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+    """
+    Quais pares (user_id, title) já existem, em uma única consulta para o lote inteiro.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return set()
+    rows = db.execute(select(Briefing.user_id, Briefing.title).where(tuple_(Briefing.user_id, Briefing.title).in_(pairs)))
+    return {(user_id, title) for user_id, title in rows}
+
+def insert_briefings(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Um único INSERT multi-linha. Sem commit: o chamador controla a transação.
+    """
+    db.execute(insert(Briefing).values(rows))
+
+# --- Exclusão ---
+#
+# Nada é carregado no ORM: o histórico sai com DELETEs em massa (no MySQL também há ON DELETE
+# CASCADE, mas a tabela particionada de conversation_histories não tem FK, e o SQLite não as aplica).
+# Briefings grandes passam por exclusão lógica e o histórico é removido em lotes por uma tarefa
+# (ver src/services/purge_service.py).
+
+def delete_briefing(db: Session, briefing_id: int) -> bool:
+    """
+    Deleta o briefing e todo o seu histórico (tabela e arquivo) em uma transação.
+    Para briefings pequenos, ou ao fim da remoção em lotes (quando o histórico já foi esvaziado).
+    """
+    logger.info(f"Tentando deletar briefing ID: {briefing_id}")
+    try:
+        search_index.remove_briefings(db, [briefing_id]) # antes do histórico: os documentos saem pelos ids das mensagens
+        db.execute(
+            delete(ConversationHistory).where(ConversationHistory.briefing_id == briefing_id),
+            execution_options={"synchronize_session": False}
+        )
+        db.execute(
+            delete(ConversationHistoryArchive).where(ConversationHistoryArchive.briefing_id == briefing_id),
+            execution_options={"synchronize_session": False}
+        )
+        deleted = db.execute(
+            delete(Briefing).where(Briefing.id == briefing_id), execution_options={"synchronize_session": False}
+        ).rowcount
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro inesperado ao deletar briefing ID {briefing_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao deletar briefing: {e}"
+        )
+    if not deleted:
+        logger.warning(f"Briefing ID {briefing_id} não encontrado para deleção.")
+        return False
+    logger.info(f"Briefing ID {briefing_id} deletado com sucesso.")
+    return True
+
+def soft_delete_briefing(db: Session, briefing_id: int) -> bool:
+    """
+    Exclusão lógica: marca 'deleted_at' (o briefing some das consultas) e libera o título,
+    para que o usuário possa criar outro briefing com o mesmo nome antes da remoção definitiva.
+    """
+    logger.info(f"Exclusão lógica do briefing ID: {briefing_id}")
+    result = db.execute(
+        update(Briefing)
+        .where(Briefing.id == briefing_id, NOT_DELETED)
+        .values(
+            deleted_at=get_current_datetime(),
+            title=func.substr(literal(f"[excluído #{briefing_id}] ") + Briefing.title, 1, 255),
+            version=Briefing.version + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount > 0
+
+def purge_briefing_history_batch(db: Session, briefing_id: int, limit: int) -> int:
+    """
+    Remove até 'limit' mensagens do briefing (as mais antigas) e faz o commit. Retorna quantas saíram.
+    Os ids são lidos antes do DELETE: o MySQL não aceita LIMIT em subconsulta da própria tabela.
+    """
+    message_ids = list(db.execute(
+        select(ConversationHistory.id)
+        .where(ConversationHistory.briefing_id == briefing_id)
+        .order_by(ConversationHistory.id)
+        .limit(limit)
+    ).scalars())
+    if message_ids:
+        # briefing_id no WHERE permite o pruning de partições (HISTORY_PARTITIONING)
+        db.execute(
+            delete(ConversationHistory)
+            .where(ConversationHistory.briefing_id == briefing_id, ConversationHistory.id.in_(message_ids)),
+            execution_options={"synchronize_session": False}
+        )
+        search_index.remove_messages(db, message_ids)
+    db.commit()
+    return len(message_ids)
+
+def get_user_briefing_totals(db: Session, user_id: int) -> Tuple[int, int]:
+    """
+    (quantidade de briefings, total de mensagens) do usuário, pelos contadores desnormalizados.
+    """
+    count, messages = db.execute(
+        select(func.count(Briefing.id), func.coalesce(func.sum(Briefing.message_count), 0)).where(Briefing.user_id == user_id)
+    ).one()
+    return count, messages
+
+def get_user_briefing_ids(db: Session, user_id: int, after_id: int = 0, limit: int = 500) -> List[int]:
+    """
+    Ids dos briefings do usuário (inclusive os excluídos logicamente), por keyset.
+    """
+    return list(db.execute(
+        select(Briefing.id).where(Briefing.user_id == user_id, Briefing.id > after_id).order_by(Briefing.id).limit(limit)
+    ).scalars())
@@ -1,28 +1,48 @@
 # File: backend/src/cruds/conversation_history_cruds.py
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, insert, lambda_stmt, or_, select, update
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
+from src.db import search_index
+from src.models.briefing_models import Briefing
+from src.models.conversation_archive_models import ConversationHistoryArchive
 from src.models.conversation_history_models import ConversationHistory
 from src.schemas.conversation_history_schemas import ConversationHistoryCreate
-from src.utils.datetime_utils import get_current_datetime_str # Para o timestamp
+from src.utils.datetime_utils import get_current_datetime # Para o timestamp
+from src.utils.history_archive_utils import ArchivedMessage, pack_history, unpack_history
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def create_conversation_entry(db: Session, entry: ConversationHistoryCreate) -> ConversationHistory:
     """
-    Cria um novo registro de histórico de conversa.
+    Cria um novo registro de histórico de conversa e, na mesma transação, atualiza os contadores
+    de atividade do briefing (message_count, last_message_at, last_sender) e o índice de busca.
     """
     logger.info(f"Criando entrada de conversa para briefing_id: {entry.briefing_id} - Remetente: {entry.sender_type}")
+    timestamp = get_current_datetime() # Preenche automaticamente o timestamp
     db_entry = ConversationHistory(
         briefing_id=entry.briefing_id,
         sender_type=entry.sender_type,
         message_content=entry.message_content,
-        timestamp=get_current_datetime_str() # Preenche automaticamente o timestamp
+        timestamp=timestamp
+    )
+    # Incremento no próprio UPDATE: turnos simultâneos no mesmo briefing não perdem contagem.
+    # O UPDATE vem antes do INSERT: ele pega o lock exclusivo da linha do briefing logo no início,
+    # e turnos simultâneos esperam a vez. Na ordem inversa, a verificação da FK do INSERT (InnoDB)
+    # toma um lock compartilhado do briefing, e dois turnos que tentam promovê-lo a exclusivo no UPDATE
+    # entram em deadlock
+    db.execute(
+        update(Briefing)
+        .where(Briefing.id == entry.briefing_id)
+        .values(message_count=Briefing.message_count + 1, last_message_at=timestamp, last_sender=entry.sender_type)
     )
     db.add(db_entry)
+    db.flush() # id da mensagem para o índice de busca
+    search_index.index_message(db, db_entry.id, entry.briefing_id, entry.message_content)
     db.commit()
     db.refresh(db_entry)
     logger.info(f"Entrada de conversa ID {db_entry.id} criada com sucesso.")
@@ -35,24 +55,232 @@ def get_conversation_entry(db: Session, entry_id: int) -> Optional[ConversationH
     logger.info(f"Buscando entrada de conversa com ID: {entry_id}")
     return db.query(ConversationHistory).filter(ConversationHistory.id == entry_id).first()
 
+# --- Arquivo comprimido do histórico (briefings ociosos) ---
+
+def get_history_archive(db: Session, briefing_id: int) -> Optional[ConversationHistoryArchive]:
+    """
+    Retorna o arquivo comprimido do histórico do briefing, se houver (busca pela chave primária).
+    """
+    return db.get(ConversationHistoryArchive, briefing_id)
+
+def get_archived_messages(db: Session, briefing_id: int) -> List[ArchivedMessage]:
+    """
+    Mensagens arquivadas do briefing, descomprimidas, como tuplas (id, sender_type, message_content, timestamp).
+    """
+    archive = get_history_archive(db, briefing_id)
+    return unpack_history(archive.compressed_history) if archive else []
+
+def archived_messages_as_entries(briefing_id: int, messages: List[ArchivedMessage]) -> List[ConversationHistory]:
+    """
+    Mensagens arquivadas como objetos ConversationHistory avulsos (fora da sessão, apenas para leitura).
+    """
+    return [
+        ConversationHistory(id=message_id, briefing_id=briefing_id, sender_type=sender_type, message_content=content, timestamp=timestamp)
+        for message_id, sender_type, content, timestamp in messages
+    ]
+
+def archive_briefing_history(db: Session, briefing_id: int) -> Dict[str, Any]:
+    """
+    Move o histórico do briefing para o arquivo comprimido (um blob por briefing) e remove as linhas
+    da tabela quente. Só as mensagens lidas são removidas: uma mensagem gravada durante o
+    arquivamento permanece na tabela. Retorna as contagens para o relatório da tarefa.
+    """
+    rows = [
+        tuple(row) for row in
+        db.query(ConversationHistory.id, ConversationHistory.sender_type, ConversationHistory.message_content, ConversationHistory.timestamp)
+        .filter(ConversationHistory.briefing_id == briefing_id)
+        .order_by(ConversationHistory.id.asc())
+        .all()
+    ]
+    if not rows:
+        return {"messages": 0, "raw_bytes": 0, "compressed_bytes": 0}
+
+    archive = get_history_archive(db, briefing_id)
+    messages = (unpack_history(archive.compressed_history) if archive else []) + rows
+    blob, raw_bytes = pack_history(messages)
+    if archive is None:
+        archive = ConversationHistoryArchive(briefing_id=briefing_id)
+        db.add(archive)
+    archive.message_count = len(messages)
+    archive.first_message_id = messages[0][0]
+    archive.last_message_id = messages[-1][0]
+    archive.raw_bytes = raw_bytes
+    archive.compressed_history = blob
+    archive.archived_at = get_current_datetime()
+
+    db.query(ConversationHistory).filter(
+        ConversationHistory.briefing_id == briefing_id,
+        ConversationHistory.id <= rows[-1][0]
+    ).delete(synchronize_session=False)
+    db.commit()
+    logger.info(f"Histórico do briefing {briefing_id} arquivado: {len(rows)} mensagem(ns), {raw_bytes} -> {len(blob)} bytes.")
+    return {"messages": len(rows), "raw_bytes": raw_bytes, "compressed_bytes": len(blob)}
+
+def restore_briefing_history(db: Session, briefing_id: int) -> int:
+    """
+    Devolve o histórico arquivado à tabela quente (com os ids originais) e remove o arquivo.
+    Sem arquivo, custa apenas a busca pela chave primária. Retorna a quantidade de mensagens restauradas.
+    """
+    archive = get_history_archive(db, briefing_id)
+    if archive is None:
+        return 0
+    messages = unpack_history(archive.compressed_history)
+    if messages:
+        db.execute(insert(ConversationHistory), [
+            {"id": message_id, "briefing_id": briefing_id, "sender_type": sender_type, "message_content": content, "timestamp": timestamp}
+            for message_id, sender_type, content, timestamp in messages
+        ])
+    db.delete(archive)
+    db.commit()
+    logger.info(f"Histórico arquivado do briefing {briefing_id} restaurado: {len(messages)} mensagem(ns).")
+    return len(messages)
+
+def get_idle_briefing_ids_with_history(db: Session, idle_before: datetime, after_id: int = 0, limit: int = 100) -> List[int]:
+    """
+    Ids (em ordem, por keyset) dos briefings com histórico na tabela quente e sem mensagens
+    nem alterações desde 'idle_before'.
+    """
+    rows = (
+        db.query(ConversationHistory.briefing_id)
+        .join(Briefing, Briefing.id == ConversationHistory.briefing_id)
+        .filter(
+            ConversationHistory.briefing_id > after_id,
+            Briefing.deleted_at.is_(None), # Excluídos logicamente: o histórico vai ser removido, não arquivado
+            or_(Briefing.update_date.is_(None), Briefing.update_date < idle_before)
+        )
+        .group_by(ConversationHistory.briefing_id)
+        .having(func.max(ConversationHistory.timestamp) < idle_before)
+        .order_by(ConversationHistory.briefing_id.asc())
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+# --- Contadores de atividade do briefing (backfill / correção) ---
+
+def recompute_briefing_activity(db: Session, briefing_ids: List[int]) -> int:
+    """
+    Recalcula message_count, last_message_at e last_sender dos briefings a partir da tabela quente
+    e do arquivo (a contagem do arquivo vem da coluna; o blob só é aberto quando não há mensagens
+    na tabela). Um UPDATE em lote pela chave primária e um commit. Retorna quantos foram atualizados.
+    """
+    if not briefing_ids:
+        return 0
+    hot = {
+        briefing_id: (count, last_id) for briefing_id, count, last_id in db.execute(
+            select(ConversationHistory.briefing_id, func.count(ConversationHistory.id), func.max(ConversationHistory.id))
+            .where(ConversationHistory.briefing_id.in_(briefing_ids))
+            .group_by(ConversationHistory.briefing_id)
+        )
+    }
+    last_rows = {
+        briefing_id: (timestamp, sender_type) for briefing_id, timestamp, sender_type in db.execute(
+            select(ConversationHistory.briefing_id, ConversationHistory.timestamp, ConversationHistory.sender_type)
+            .where(ConversationHistory.id.in_([last_id for _, last_id in hot.values()]))
+        )
+    } if hot else {}
+    archives = {
+        archive.briefing_id: archive for archive in
+        db.query(ConversationHistoryArchive).filter(ConversationHistoryArchive.briefing_id.in_(briefing_ids))
+    }
+
+    values = []
+    for briefing_id in briefing_ids:
+        archive = archives.get(briefing_id)
+        count = hot.get(briefing_id, (0, None))[0] + (archive.message_count if archive else 0)
+        last_message_at, last_sender = last_rows.get(briefing_id, (None, None))
+        if briefing_id not in last_rows and archive is not None:
+            _, last_sender, _, last_message_at = unpack_history(archive.compressed_history)[-1]
+        values.append({"id": briefing_id, "message_count": count, "last_message_at": last_message_at, "last_sender": last_sender})
+    db.execute(update(Briefing), values)
+    db.commit()
+    return len(values)
+
+# --- Leituras do histórico (arquivo + tabela quente, de forma transparente) ---
+
 def get_conversation_history_by_briefing_id(db: Session, briefing_id: int, limit: int = 20) -> List[ConversationHistory]:
     """
     Retorna o histórico de conversas para um briefing específico,
     ordenado por timestamp e limitado.
     O histórico é retornado em ordem cronológica ascendente (do mais antigo ao mais novo).
+    Mensagens arquivadas vêm primeiro, como objetos avulsos.
     """
     logger.info(f"Buscando histórico de conversa para briefing_id: {briefing_id}, limitado a {limit} mensagens.")
-    return (
-        db.query(ConversationHistory)
-        .filter(ConversationHistory.briefing_id == briefing_id)
+    archived = archived_messages_as_entries(briefing_id, get_archived_messages(db, briefing_id)[:limit])
+    if len(archived) >= limit:
+        return archived
+    remaining = limit - len(archived)
+    return archived + list(db.execute(lambda_stmt(
+        lambda: select(ConversationHistory)
+        .where(ConversationHistory.briefing_id == briefing_id)
         .order_by(ConversationHistory.id.asc()) # Ou .timestamp.asc() se timestamp for mais confiável para ordem
+        .limit(remaining)
+    )).scalars())
+
+def get_conversation_history_marker(db: Session, briefing_id: int) -> Tuple[int, int]:
+    """
+    Retorna (quantidade de mensagens, maior id) do histórico de um briefing.
+    Consulta barata usada para validar o cache de transcrições entre workers.
+    """
+    count, last_id = db.execute(lambda_stmt(
+        lambda: select(func.count(ConversationHistory.id), func.max(ConversationHistory.id))
+        .where(ConversationHistory.briefing_id == briefing_id)
+    )).one()
+    archive = get_history_archive(db, briefing_id)
+    if archive is not None:
+        return (count or 0) + archive.message_count, max(last_id or 0, archive.last_message_id)
+    return count or 0, last_id or 0
+
+def get_recent_transcript_rows(db: Session, briefing_id: int, limit: int = 50) -> List[Tuple[int, str, str]]:
+    """
+    Retorna as últimas 'limit' mensagens do briefing como tuplas leves
+    (id, sender_type, message_content), em ordem cronológica ascendente.
+    Não carrega objetos ORM.
+    """
+    logger.info(f"Carregando transcrição recente do briefing_id: {briefing_id}, limitada a {limit} mensagens.")
+    # Executada a cada turno do chat (quando o cache não serve): lambda_stmt reaproveita o SELECT compilado
+    rows = db.execute(lambda_stmt(
+        lambda: select(ConversationHistory.id, ConversationHistory.sender_type, ConversationHistory.message_content)
+        .where(ConversationHistory.briefing_id == briefing_id)
+        .order_by(ConversationHistory.id.desc())
         .limit(limit)
-        .all()
+    )).all()
+    recent = [tuple(row) for row in reversed(rows)]
+    if len(recent) < limit:
+        archived = [message[:3] for message in get_archived_messages(db, briefing_id)]
+        recent = archived[max(0, len(archived) - (limit - len(recent))):] + recent
+    return recent
+
+def get_transcript_rows(db: Session, briefing_id: int, after_id: Optional[int] = None) -> List[Tuple[int, str, str]]:
+    """
+    Retorna a transcrição do briefing como tuplas leves (id, sender_type, message_content),
+    em ordem cronológica ascendente. Com 'after_id', apenas as mensagens posteriores a esse id.
+    """
+    logger.info(f"Carregando transcrição do briefing_id: {briefing_id} (após id: {after_id}).")
+    query = (
+        db.query(ConversationHistory.id, ConversationHistory.sender_type, ConversationHistory.message_content)
+        .filter(ConversationHistory.briefing_id == briefing_id)
     )
+    if after_id is not None:
+        query = query.filter(ConversationHistory.id > after_id)
+    rows = query.order_by(ConversationHistory.id.asc()).all()
+    archived = [
+        message[:3] for message in get_archived_messages(db, briefing_id)
+        if after_id is None or message[0] > after_id
+    ]
+    return archived + [tuple(row) for row in rows]
 
-def get_all_conversation_history(db: Session, skip: int = 0, limit: int = 100) -> List[ConversationHistory]:
+def get_all_conversation_history(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[ConversationHistory]:
     """
     Retorna todo o histórico de conversas (para uso administrativo/debugging).
+    Com 'after_id' a página é buscada por keyset (id > after_id); 'skip' é o modo antigo, por offset.
     """
-    logger.info(f"Buscando todo o histórico de conversa (admin view), skip: {skip}, limit: {limit}.")
-    return db.query(ConversationHistory).offset(skip).limit(limit).all()
\ No newline at end of file
+    logger.info(f"Buscando todo o histórico de conversa (admin view), after_id: {after_id}, skip: {skip}, limit: {limit}.")
+    query = db.query(ConversationHistory).order_by(ConversationHistory.id.asc())
+    query = query.filter(ConversationHistory.id > after_id) if after_id is not None else query.offset(skip)
+    return query.limit(limit).all()
\ No newline at end of file
@@ -1,9 +1,11 @@
 # File: backend/src/crud/employee_cruds.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import exc
+from sqlalchemy import exc, lambda_stmt, select
 from typing import List, Optional
-from src.utils.datetime_utils import get_current_datetime_str
+from src.utils.datetime_utils import get_current_datetime
+from src.db.versioning import versioned_update
+from src.dependencies.concurrency import version_conflict
 from src.models.employee_models import Employee # Ajustada importação para employee_models.py
 from src.schemas.employee_schemas import EmployeeUpdate, EmployeeCreateInternal # Ajustada importação para employee_schemas.py
 from fastapi import HTTPException, status # Importar para levantar HTTPExceptions
@@ -17,21 +19,27 @@ def get_employee_by_id(db: Session, employee_id: int) -> Optional[Employee]:
     Busca um funcionário pelo seu ID.
     """
     logger.info(f"Buscando funcionário com ID: {employee_id}")
-    return db.query(Employee).filter(Employee.id == employee_id).first()
+    return db.execute(lambda_stmt(lambda: select(Employee).where(Employee.id == employee_id).limit(1))).scalars().first()
 
 def get_employee_by_name(db: Session, employee_name: str) -> Optional[Employee]:
     """
     Busca um funcionário pelo seu nome (employee_name).
     """
     logger.info(f"Buscando funcionário com nome: '{employee_name}'")
-    return db.query(Employee).filter(Employee.employee_name == employee_name).first()
+    # Consultada a cada turno do chat: lambda_stmt evita remontar e recompilar o SELECT a cada chamada
+    return db.execute(
+        lambda_stmt(lambda: select(Employee).where(Employee.employee_name == employee_name).limit(1))
+    ).scalars().first()
 
-def get_all_employees(db: Session, skip: int = 0, limit: int = 100) -> List[Employee]:
+def get_all_employees(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Employee]:
     """
     Retorna uma lista de todos os funcionários, com paginação opcional.
+    Com 'after_id' a página é buscada por keyset (id > after_id); 'skip' é o modo antigo, por offset.
     """
-    logger.info(f"Buscando todos os funcionários (skip: {skip}, limit: {limit})")
-    return db.query(Employee).offset(skip).limit(limit).all()
+    logger.info(f"Buscando todos os funcionários (after_id: {after_id}, skip: {skip}, limit: {limit})")
+    query = db.query(Employee).order_by(Employee.id.asc())
+    query = query.filter(Employee.id > after_id) if after_id is not None else query.offset(skip)
+    return query.limit(limit).all()
 
 def create_employee_initial(db: Session, employee_data: EmployeeCreateInternal) -> Employee:
     """
@@ -48,7 +56,7 @@ def create_employee_initial(db: Session, employee_data: EmployeeCreateInternal)
         endpoint_key=employee_data.endpoint_key,
         headers_template=employee_data.headers_template,
         body_template=employee_data.body_template,
-        last_update=get_current_datetime_str()
+        last_update=get_current_datetime()
     )
     try:
         db.add(db_employee)
@@ -65,39 +73,42 @@ def create_employee_initial(db: Session, employee_data: EmployeeCreateInternal)
         logger.error(f"Erro inesperado ao criar funcionário '{employee_data.employee_name}': {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro interno do servidor ao criar funcionário: {e}")
 
-def update_employee(db: Session, employee_id: int, employee_update_data: EmployeeUpdate) -> Optional[Employee]:
+def update_employee(
+    db: Session,
+    employee_id: int,
+    employee_update_data: EmployeeUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[Employee]:
     """
-    Atualiza um registro de funcionário existente.
+    Atualiza um registro de funcionário existente com um único UPDATE condicional (ver versioned_update).
     O campo 'employee_name' não pode ser atualizado via esta função.
+    Com 'expected_version' (If-Match), a alteração só é gravada se a versão não mudou; caso contrário, 409.
     """
     logger.info(f"Tentando atualizar funcionário ID: {employee_id}")
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if not db_employee:
-        logger.warning(f"Tentativa de atualizar funcionário ID {employee_id} não encontrado.")
-        return None
-
     update_data = employee_update_data.model_dump(exclude_unset=True)
 
     if "employee_name" in update_data:
         logger.warning(f"Tentativa de atualizar o nome do funcionário ID {employee_id}. Ignorando.")
         del update_data["employee_name"]
 
-    for key, value in update_data.items():
-        setattr(db_employee, key, value)
-
-    db_employee.last_update = get_current_datetime_str()
+    update_data["last_update"] = get_current_datetime()
 
     try:
-        db.add(db_employee)
-        db.commit()
-        db.refresh(db_employee)
-        logger.info(f"Funcionário ID {employee_id} atualizado com sucesso.")
-        return db_employee
+        db_employee = versioned_update(db, Employee, employee_id, update_data, expected_version=expected_version)
     except Exception as e:
         db.rollback()
         logger.error(f"Erro inesperado ao atualizar funcionário ID {employee_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro interno do servidor ao atualizar funcionário: {e}")
 
+    if db_employee is None:
+        if expected_version is not None:
+            logger.warning(f"Funcionário ID {employee_id} não foi atualizado: versão diferente de {expected_version} (ou inexistente).")
+            raise version_conflict("O funcionário")
+        logger.warning(f"Tentativa de atualizar funcionário ID {employee_id} não encontrado.")
+        return None
+    logger.info(f"Funcionário ID {employee_id} atualizado com sucesso (versão {db_employee.version}).")
+    return db_employee
+
 def delete_employee(db: Session, employee_id: int) -> bool:
     """
     Deleta um registro de funcionário.
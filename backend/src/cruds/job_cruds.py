@@ -0,0 +1,165 @@
+# File: backend/src/cruds/job_cruds.py
+
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_, select, update
+from datetime import timedelta
+from typing import List, Optional, Dict, Any
+import logging
+
+from src.models.job_models import Job
+from src.utils.datetime_utils import get_current_datetime
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    """
+    Busca uma tarefa pelo seu ID.
+    """
+    logger.info(f"Buscando tarefa com ID: {job_id}")
+    return db.query(Job).filter(Job.id == job_id).first()
+
+def get_active_job_by_dedup_key(db: Session, dedup_key: str) -> Optional[Job]:
+    """
+    Busca a tarefa ativa (pendente ou em execução) associada a uma chave de deduplicação.
+    """
+    return db.query(Job).filter(Job.dedup_key == dedup_key).first()
+
+def get_pending_job_ids(db: Session) -> List[int]:
+    """
+    Ids das tarefas pendentes, em ordem de criação (usado para retomar a fila após reinício).
+    """
+    return list(db.execute(select(Job.id).where(Job.status == "pending").order_by(Job.id.asc())).scalars())
+
+def create_job(
+    db: Session,
+    job_type: str,
+    payload: Dict[str, Any],
+    dedup_key: Optional[str] = None,
+    user_id: Optional[int] = None,
+    max_attempts: int = 3
+) -> Job:
+    """
+    Cria uma nova tarefa pendente. Se já existir uma tarefa ativa com a mesma
+    'dedup_key', retorna a tarefa existente em vez de criar outra.
+    """
+    if dedup_key:
+        existing_job = get_active_job_by_dedup_key(db, dedup_key)
+        if existing_job:
+            logger.info(f"Tarefa ativa {existing_job.id} reaproveitada para a chave '{dedup_key}'.")
+            return existing_job
+
+    db_job = Job(
+        job_type=job_type,
+        dedup_key=dedup_key,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        max_attempts=max_attempts,
+        user_id=user_id,
+        creation_date=get_current_datetime()
+    )
+    try:
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        logger.info(f"Tarefa ID {db_job.id} ({job_type}) criada.")
+        return db_job
+    except IntegrityError:
+        # Outra requisição criou a mesma tarefa entre a verificação e o INSERT
+        db.rollback()
+        existing_job = get_active_job_by_dedup_key(db, dedup_key)
+        if existing_job:
+            logger.info(f"Tarefa ativa {existing_job.id} reaproveitada após conflito para a chave '{dedup_key}'.")
+            return existing_job
+        raise
+
+def claim_job(db: Session, job_id: int) -> bool:
+    """
+    Passa a tarefa de 'pending' para 'running' num único UPDATE condicional
+    (WHERE status = 'pending'). Retorna False se outro worker (ou outro processo) já a pegou.
+    """
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "pending")
+        .values(status="running", attempts=Job.attempts + 1, update_date=get_current_datetime())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def touch_job(db: Session, job_id: int) -> bool:
+    """
+    Renova a concessão (update_date) de uma tarefa em execução. Retorna False se ela não está mais em execução.
+    """
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running")
+        .values(update_date=get_current_datetime())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def requeue_stale_jobs(db: Session, lease_seconds: float) -> List[int]:
+    """
+    Devolve para 'pending' as tarefas em execução cuja concessão expirou (update_date sem renovação
+    há mais de 'lease_seconds': o processo que as executava caiu). Tarefas de processos vivos,
+    que renovam a concessão, não são tocadas. Retorna os ids devolvidos à fila.
+    """
+    expired = or_(Job.update_date.is_(None), Job.update_date < get_current_datetime() - timedelta(seconds=lease_seconds))
+    job_ids = list(db.execute(select(Job.id).where(Job.status == "running", expired)).scalars())
+    if not job_ids:
+        return []
+    # A condição é repetida no UPDATE: uma renovação entre o SELECT e o UPDATE mantém a tarefa com o dono
+    db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == "running", expired)
+        .values(status="pending", error="Execução interrompida (concessão expirada).", update_date=get_current_datetime())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    logger.warning(f"Tarefas com concessão expirada devolvidas à fila: {job_ids}")
+    return job_ids
+
+def save_job_checkpoint(db: Session, job: Job, progress: Dict[str, Any]) -> Job:
+    """
+    Grava o progresso parcial de uma tarefa em 'result' (ponto de retomada após falha/reinício).
+    """
+    job.result = progress
+    job.update_date = get_current_datetime()
+    db.commit()
+    db.refresh(job)
+    return job
+
+def mark_job_succeeded(db: Session, job: Job, result: Optional[Dict[str, Any]]) -> Job:
+    now = get_current_datetime()
+    job.status = "succeeded"
+    job.result = result
+    job.error = None
+    job.dedup_key = None # Libera a chave para novas solicitações
+    job.update_date = now
+    job.finished_date = now
+    db.commit()
+    db.refresh(job)
+    return job
+
+def mark_job_failed(db: Session, job: Job, error: str, retry: bool) -> Job:
+    """
+    Registra uma falha. Com 'retry', a tarefa volta para 'pending' mantendo a chave
+    de deduplicação; caso contrário ela é encerrada como 'failed'.
+    """
+    now = get_current_datetime()
+    job.error = error
+    job.update_date = now
+    if retry:
+        job.status = "pending"
+    else:
+        job.status = "failed"
+        job.dedup_key = None
+        job.finished_date = now
+    db.commit()
+    db.refresh(job)
+    return job
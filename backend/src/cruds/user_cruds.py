@@ -1,15 +1,22 @@
 # File: backend/src/cruds/user_cruds.py
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import delete, insert, lambda_stmt, or_, select, update
+from typing import Any, Dict, Iterable, List, Optional, Set
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 import logging
 
+from src.models.briefing_models import Briefing
+from src.models.conversation_archive_models import ConversationHistoryArchive
+from src.models.conversation_history_models import ConversationHistory
 from src.models.user_models import User
 from src.schemas.user_schemas import UserCreate, UserUpdate
-from src.utils.datetime_utils import get_current_datetime_str
+from src.utils.datetime_utils import get_current_datetime
 from src.core.security import get_password_hash, verify_password
+from src.db import search_index
+from src.db.versioning import versioned_update
+from src.dependencies.concurrency import version_conflict
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,7 +25,8 @@ logger = logging.getLogger(__name__)
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
     logger.info(f"Buscando usuário com ID: {user_id}")
-    return db.query(User).filter(User.id == user_id).first()
+    # lambda_stmt: o SELECT é montado e compilado uma vez; as chamadas seguintes só trocam o parâmetro
+    return db.execute(lambda_stmt(lambda: select(User).where(User.id == user_id).limit(1))).scalars().first()
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     logger.info(f"Buscando usuário com email: '{email}'")
@@ -28,9 +36,12 @@ def get_user_by_phone_number(db: Session, phone_number: str) -> Optional[User]:
     logger.info(f"Buscando usuário com telefone: '{phone_number}'")
     return db.query(User).filter(User.phone_number == phone_number).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    logger.info(f"Buscando lista de usuários (skip={skip}, limit={limit})")
-    return db.query(User).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[User]:
+    # Keyset por id quando 'after_id' é informado; 'skip' (offset) só por compatibilidade
+    logger.info(f"Buscando lista de usuários (after_id={after_id}, skip={skip}, limit={limit})")
+    query = db.query(User).order_by(User.id.asc())
+    query = query.filter(User.id > after_id) if after_id is not None else query.offset(skip)
+    return query.limit(limit).all()
 
 def create_user(db: Session, user: UserCreate) -> User:
     logger.info("Iniciando criação de novo usuário")
@@ -50,7 +61,7 @@ def create_user(db: Session, user: UserCreate) -> User:
         password_hash=hashed_password,
         google_id=user.google_id,
         github_id=user.github_id,
-        creation_date=get_current_datetime_str()
+        creation_date=get_current_datetime()
     )
 
     try:
@@ -68,28 +79,20 @@ def create_user(db: Session, user: UserCreate) -> User:
         logger.error(f"Erro inesperado ao criar usuário: {e}")
         raise HTTPException(status_code=500, detail="Erro interno ao criar usuário.")
 
-def update_user(db: Session, user_id: int, user: UserUpdate) -> Optional[User]:
+def update_user(db: Session, user_id: int, user: UserUpdate, expected_version: Optional[int] = None) -> Optional[User]:
+    """
+    Atualiza o usuário com um único UPDATE condicional (ver versioned_update).
+    Com 'expected_version' (If-Match), a alteração só é gravada se a versão não mudou; caso contrário, 409.
+    """
     logger.info(f"Tentando atualizar usuário ID: {user_id}")
-    db_user = db.query(User).filter(User.id == user_id).first()
-    
-    if not db_user:
-        logger.warning(f"Usuário ID {user_id} não encontrado.")
-        return None
-
     update_data = user.model_dump(exclude_unset=True)
 
     if "password" in update_data and update_data["password"]:
         update_data["password_hash"] = get_password_hash(update_data.pop("password"))
-
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
+    update_data.pop("password", None)
 
     try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        logger.info(f"Usuário ID {user_id} atualizado com sucesso.")
-        return db_user
+        db_user = versioned_update(db, User, user_id, update_data, expected_version=expected_version)
     except IntegrityError as e:
         db.rollback()
         logger.error(f"Erro de integridade ao atualizar usuário ID {user_id}: {e}")
@@ -99,22 +102,103 @@ def update_user(db: Session, user_id: int, user: UserUpdate) -> Optional[User]:
         logger.error(f"Erro inesperado ao atualizar usuário: {e}")
         raise HTTPException(status_code=500, detail="Erro interno ao atualizar usuário.")
 
+    if db_user is None:
+        if expected_version is not None:
+            logger.warning(f"Usuário ID {user_id} não foi atualizado: versão diferente de {expected_version} (ou inexistente).")
+            raise version_conflict("O usuário")
+        logger.warning(f"Usuário ID {user_id} não encontrado.")
+        return None
+    logger.info(f"Usuário ID {user_id} atualizado com sucesso (versão {db_user.version}).")
+    return db_user
+
+DELETED_STATUS = "deleted" # Exclusão lógica: o usuário perde o acesso e é removido em segundo plano
+
 def delete_user(db: Session, user_id: int) -> bool:
+    """
+    Deleta o usuário, os briefings e os históricos com DELETEs em massa (nada é carregado no ORM),
+    em uma transação. Usuários com muito histórico passam por soft_delete_user + purge_service.
+    """
     logger.info(f"Tentando deletar usuário ID: {user_id}")
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if not db_user:
-        logger.warning(f"Usuário ID {user_id} não encontrado para deleção.")
-        return False
-
+    user_briefings = select(Briefing.id).where(Briefing.user_id == user_id)
     try:
-        db.delete(db_user)
+        search_index.remove_briefings(db, user_briefings) # antes do histórico: os documentos saem pelos ids das mensagens
+        for statement in (
+            delete(ConversationHistory).where(ConversationHistory.briefing_id.in_(user_briefings)),
+            delete(ConversationHistoryArchive).where(ConversationHistoryArchive.briefing_id.in_(user_briefings)),
+        ):
+            db.execute(statement, execution_options={"synchronize_session": False})
+        db.execute(delete(Briefing).where(Briefing.user_id == user_id), execution_options={"synchronize_session": False})
+        deleted = db.execute(
+            delete(User).where(User.id == user_id), execution_options={"synchronize_session": False}
+        ).rowcount
         db.commit()
-        logger.info(f"Usuário ID {user_id} deletado com sucesso.")
-        return True
     except Exception as e:
         db.rollback()
         logger.error(f"Erro ao deletar usuário: {e}")
         raise HTTPException(status_code=500, detail="Erro interno ao deletar usuário.")
+    if not deleted:
+        logger.warning(f"Usuário ID {user_id} não encontrado para deleção.")
+        return False
+    logger.info(f"Usuário ID {user_id} deletado com sucesso.")
+    return True
+
+def soft_delete_user(db: Session, user_id: int) -> bool:
+    """
+    Exclusão lógica: status 'deleted' (o token deixa de valer) e briefings marcados como excluídos.
+    """
+    logger.info(f"Exclusão lógica do usuário ID: {user_id}")
+    now = get_current_datetime()
+    result = db.execute(
+        update(User)
+        .where(User.id == user_id, or_(User.status.is_(None), User.status != DELETED_STATUS))
+        .values(status=DELETED_STATUS, version=User.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Briefing)
+        .where(Briefing.user_id == user_id, Briefing.deleted_at.is_(None))
+        .values(deleted_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount > 0
+
+# --- Importação em massa ---
+
+USER_UNIQUE_FIELDS = ("email", "phone_number", "google_id", "github_id")
+
+def get_taken_user_identifiers(db: Session, values: Dict[str, Iterable[str]]) -> Dict[str, Set[str]]:
+    """
+    Quais dos valores informados (por campo único: email, telefone, google_id, github_id)
+    já pertencem a algum usuário, em uma única consulta para o lote inteiro.
+    """
+    conditions = [getattr(User, field).in_(set(items)) for field, items in values.items() if items]
+    taken: Dict[str, Set[str]] = {field: set() for field in values}
+    if not conditions:
+        return taken
+    for row in db.execute(select(*[getattr(User, field) for field in values]).where(or_(*conditions))):
+        for field, value in zip(values, row):
+            if value is not None:
+                taken[field].add(value)
+    return taken
+
+def get_user_ids_by_emails(db: Session, emails: Iterable[str]) -> Dict[str, int]:
+    emails = set(emails)
+    if not emails:
+        return {}
+    return dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+
+def get_existing_user_ids(db: Session, user_ids: Iterable[int]) -> Set[int]:
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+    return set(db.execute(select(User.id).where(User.id.in_(user_ids))).scalars())
+
+def insert_users(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Um único INSERT multi-linha (VALUES (...), (...), ...). Sem commit: o chamador controla a transação.
+    """
+    db.execute(insert(User).values(rows))
 
 def get_user_by_identifier(db: Session, identifier: str) -> Optional[User]:
     user = get_user_by_email(db, identifier)
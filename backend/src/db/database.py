@@ -1,9 +1,18 @@
 # src/db/database.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-import time
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import threading
 from src.core.config import settings
+from src.db import sqlite_profile
+from src.db.pool_metrics import InstrumentedQueuePool, PoolMetrics, pool_metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.DATABASE_URL
 
@@ -12,34 +21,121 @@ if not DATABASE_URL:
         "A variável DATABASE_URL não foi definida nas configurações da aplicação."
     )
 
-MAX_RETRIES = 10
-RETRY_DELAY_SECONDS = 5
-engine = None
+def build_engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Opções do create_engine a partir de Settings (pool, pre-ping e nível de isolamento).
+    O SQLite mantém o pool padrão do dialeto, que não aceita tamanho/overflow; em arquivo, com
+    SQLITE_PROFILE_ENABLED, usa o perfil de src/db/sqlite_profile.py.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if settings.DB_ISOLATION_LEVEL:
+        options["isolation_level"] = settings.DB_ISOLATION_LEVEL
+    if settings.SQLITE_PROFILE_ENABLED and sqlite_profile.is_file_database(database_url):
+        options["connect_args"] = sqlite_profile.connect_args()
+    if make_url(database_url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
 
-for i in range(MAX_RETRIES):
-    try:
-        print(f"Tentando conectar ao banco de dados... Tentativa {i + 1}/{MAX_RETRIES}")
-        temp_engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-        with temp_engine.connect() as connection:
-            connection.close()
-        
-        engine = temp_engine 
-        print("Conexão bem-sucedida com o banco de dados!")
-        break
-    except Exception as e:
-        print(f"Erro ao conectar ao banco de dados: {e}")
-        if i < MAX_RETRIES - 1:
-            print(f"Aguardando {RETRY_DELAY_SECONDS} segundos para tentar novamente...")
-            time.sleep(RETRY_DELAY_SECONDS)
-        else:
-            raise ConnectionError(f"Falha ao conectar ao banco de dados após {MAX_RETRIES} tentativas: {e}")
-
-if engine is None:
-    raise ConnectionError("Falha crítica: O motor do banco de dados não foi inicializado após múltiplas tentativas.")
+def create_app_engine(database_url: str, metrics: Optional[PoolMetrics] = None) -> Engine:
+    """
+    Cria um engine com as opções de pool da aplicação e as métricas do pool registradas
+    (por padrão nas métricas do primário).
+    """
+    new_engine = create_engine(database_url, **build_engine_options(database_url))
+    (metrics or pool_metrics).attach(new_engine)
+    if settings.SQLITE_PROFILE_ENABLED and sqlite_profile.is_file_database(database_url):
+        sqlite_profile.configure_engine(new_engine)
+    return new_engine
+
+# O engine é criado no primeiro uso (get_engine), sem conectar: importar a aplicação (testes, geração
+# do OpenAPI, scripts) não depende do banco. A espera pelo banco no startup é assíncrona (ver wait_for_database)
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """
+    Engine do primário (único por processo), criado no primeiro acesso.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_app_engine(DATABASE_URL)
+    return _engine
+
+def __getattr__(name: str) -> Any:
+    # Compatibilidade com 'from src.db.database import engine' (scripts): resolve no primeiro acesso
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class LazySessionmaker(sessionmaker):
+    """
+    sessionmaker que se liga ao engine do primário na primeira sessão criada sem 'bind' explícito.
+    """
+
+    def __call__(self, **local_kw: Any) -> Session:
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+class DatabaseReadiness:
+    """
+    Estado da conexão inicial com o banco, exposto em /monitoring/ready.
+    Enquanto o banco não responde a aplicação sobe normalmente, mas se declara não pronta (503).
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+        }
+
+readiness = DatabaseReadiness()
+
+def _ping_database() -> None:
+    with get_engine().connect():
+        pass
+
+async def wait_for_database(state: Optional[DatabaseReadiness] = None, ping: Callable[[], None] = _ping_database) -> None:
+    """
+    Tenta conectar até conseguir, com espera exponencial (DB_CONNECT_RETRY_BASE_SECONDS, dobrando até
+    DB_CONNECT_RETRY_MAX_SECONDS). A conexão é feita em uma thread: o loop de eventos segue atendendo
+    requisições (ex: as sondas de liveness/readiness) enquanto o banco não sobe.
+    """
+    state = state or readiness
+    delay = settings.DB_CONNECT_RETRY_BASE_SECONDS
+    while True:
+        state.attempts += 1
+        try:
+            await asyncio.to_thread(ping)
+        except Exception as e:
+            # Só o tipo do erro: a mensagem pode conter o host e o usuário do banco
+            state.last_error = type(e).__name__
+            logger.warning(f"Banco de dados indisponível (tentativa {state.attempts}): {e}. Nova tentativa em {delay:.1f}s.")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.DB_CONNECT_RETRY_MAX_SECONDS)
+            continue
+        state.ready = True
+        state.last_error = None
+        logger.info(f"Conexão com o banco de dados estabelecida (tentativa {state.attempts}).")
+        return
 
 Base = declarative_base() 
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
 
 def get_db():
     db: Session = SessionLocal()
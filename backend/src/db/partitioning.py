@@ -0,0 +1,281 @@
+# File: backend/src/db/partitioning.py
+#
+# Particionamento (opcional, só MySQL) da tabela conversation_histories.
+#
+# Esquemas (Settings.HISTORY_PARTITIONING):
+#   "briefing_hash" -> PARTITION BY HASH(briefing_id): a consulta do histórico de um briefing
+#                      lê uma única partição; apagar um briefing toca uma única partição.
+#   "month"         -> PARTITION BY RANGE (TO_DAYS(timestamp)) com SUBPARTITION BY HASH(briefing_id):
+#                      retenção por DROP PARTITION (instantâneo) e a consulta por briefing continua
+#                      podando para uma subpartição por mês.
+#
+# Restrições do MySQL: toda chave única (inclusive a primária) precisa conter as colunas de
+# particionamento, e tabelas particionadas não aceitam FOREIGN KEY. A chave primária passa a ser
+# (id, briefing_id[, timestamp]) e a FK para briefings deixa de existir no banco; a integridade
+# continua garantida pelo ORM (cascade do relacionamento Briefing.conversation_histories).
+
+import logging
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HISTORY_TABLE = "conversation_histories"
+STAGING_TABLE = "conversation_histories_partitioned" # Cópia particionada durante a conversão
+OLD_TABLE = "conversation_histories_unpartitioned" # Tabela original, mantida após a troca
+HISTORY_FK_NAME = "conversation_histories_ibfk_1"
+MAX_PARTITION = "pmax"
+
+SCHEMES = ("briefing_hash", "month")
+
+
+def _check_scheme(scheme: str) -> None:
+    if scheme not in SCHEMES:
+        raise ValueError(f"Esquema de particionamento desconhecido: '{scheme}' (use {', '.join(SCHEMES)}).")
+
+
+def add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition_name(month_start: date) -> str:
+    return f"p{month_start.year}{month_start.month:02d}"
+
+
+def month_partition_definitions(months: List[date]) -> str:
+    """
+    Definições 'PARTITION pYYYYMM VALUES LESS THAN (TO_DAYS(<mês seguinte>))' + a partição MAXVALUE.
+    """
+    definitions = [
+        f"PARTITION {month_partition_name(month)} VALUES LESS THAN (TO_DAYS('{add_months(month, 1).isoformat()}'))"
+        for month in months
+    ]
+    definitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+    return ", ".join(definitions)
+
+
+def partition_primary_key(scheme: str) -> List[str]:
+    _check_scheme(scheme)
+    return ["id", "briefing_id"] + (["`timestamp`"] if scheme == "month" else [])
+
+
+def build_partition_clause(scheme: str, hash_partitions: int, months: Optional[List[date]] = None) -> str:
+    """
+    Cláusula PARTITION BY do esquema. 'months' (meses com dados, em ordem) só vale para "month".
+    """
+    _check_scheme(scheme)
+    hash_partitions = max(1, hash_partitions)
+    if scheme == "briefing_hash":
+        return f"PARTITION BY HASH(briefing_id) PARTITIONS {hash_partitions}"
+    return (
+        "PARTITION BY RANGE (TO_DAYS(`timestamp`)) "
+        f"SUBPARTITION BY HASH(briefing_id) SUBPARTITIONS {hash_partitions} "
+        f"({month_partition_definitions(months or [])})"
+    )
+
+
+def months_to_cover(first_timestamp: Optional[date], today: date, months_ahead: int) -> List[date]:
+    """
+    Meses do primeiro dado até 'months_ahead' meses à frente de hoje.
+    """
+    current = date(today.year, today.month, 1)
+    start = date(first_timestamp.year, first_timestamp.month, 1) if first_timestamp else current
+    months = []
+    while start <= add_months(current, months_ahead):
+        months.append(start)
+        start = add_months(start, 1)
+    return months
+
+
+# --- Consultas ao catálogo ---
+
+def list_partitions(connection: Connection, table: str = HISTORY_TABLE) -> List[Dict[str, object]]:
+    """
+    Partições da tabela (nome, método, limite superior e linhas estimadas); vazia se não for particionada.
+    """
+    rows = connection.execute(text(
+        "SELECT PARTITION_NAME, PARTITION_METHOD, PARTITION_DESCRIPTION, SUM(TABLE_ROWS) "
+        "FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+        "GROUP BY PARTITION_NAME, PARTITION_METHOD, PARTITION_DESCRIPTION, PARTITION_ORDINAL_POSITION "
+        "ORDER BY PARTITION_ORDINAL_POSITION"
+    ), {"table": table}).all()
+    return [
+        {"name": name, "method": method, "description": description, "rows": int(table_rows or 0)}
+        for name, method, description, table_rows in rows
+    ]
+
+
+def is_partitioned(connection: Connection, table: str = HISTORY_TABLE) -> bool:
+    return bool(list_partitions(connection, table))
+
+
+def _table_exists(connection: Connection, table: str) -> bool:
+    return bool(connection.execute(text(
+        "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+    ), {"table": table}).scalar())
+
+
+# --- Conversão online (cópia em lotes + troca atômica) ---
+
+def create_staging_table(connection: Connection, scheme: str, hash_partitions: int, months_ahead: int) -> None:
+    """
+    Cria a cópia vazia e particionada de conversation_histories (mesmas colunas e índices, sem a FK).
+    """
+    connection.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    connection.execute(text(f"CREATE TABLE {STAGING_TABLE} LIKE {HISTORY_TABLE}")) # LIKE não copia FKs
+    connection.execute(text(
+        f"ALTER TABLE {STAGING_TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(partition_primary_key(scheme))})"
+    ))
+    months = None
+    if scheme == "month":
+        first = connection.execute(text(f"SELECT MIN(`timestamp`) FROM {HISTORY_TABLE}")).scalar()
+        months = months_to_cover(first.date() if first else None, date.today(), months_ahead)
+    connection.execute(text(f"ALTER TABLE {STAGING_TABLE} {build_partition_clause(scheme, hash_partitions, months)}"))
+
+
+def copy_in_batches(
+    connection: Connection,
+    batch_size: int,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Copia conversation_histories para a tabela particionada em faixas de id (um INSERT curto por lote,
+    sem travar a tabela original). Retorna o último id copiado.
+    """
+    max_id = connection.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {HISTORY_TABLE}")).scalar()
+    last_id = connection.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {STAGING_TABLE}")).scalar()
+    while last_id < max_id:
+        upper = min(last_id + batch_size, max_id)
+        connection.execute(text(
+            f"INSERT IGNORE INTO {STAGING_TABLE} SELECT * FROM {HISTORY_TABLE} WHERE id > :lower AND id <= :upper"
+        ), {"lower": last_id, "upper": upper})
+        last_id = upper
+        if on_progress:
+            on_progress(last_id, max_id)
+    return last_id
+
+
+def swap_tables(connection: Connection) -> None:
+    """
+    Sob LOCK TABLES: reconcilia o que mudou durante a cópia (mensagens novas ou restauradas do arquivo,
+    e mensagens removidas) e troca as tabelas com um único RENAME. As escritas ficam bloqueadas só
+    durante essa etapa, que percorre as duas tabelas pela chave primária.
+    """
+    # Sob LOCK TABLES, cada apelido usado nas consultas também precisa ser travado
+    connection.execute(text(
+        f"LOCK TABLES {HISTORY_TABLE} WRITE, {HISTORY_TABLE} AS o WRITE, "
+        f"{STAGING_TABLE} WRITE, {STAGING_TABLE} AS n WRITE"
+    ))
+    try:
+        connection.execute(text(
+            f"INSERT INTO {STAGING_TABLE} SELECT o.* FROM {HISTORY_TABLE} o "
+            f"LEFT JOIN {STAGING_TABLE} n ON n.id = o.id WHERE n.id IS NULL"
+        ))
+        connection.execute(text(
+            f"DELETE n FROM {STAGING_TABLE} n LEFT JOIN {HISTORY_TABLE} o ON o.id = n.id WHERE o.id IS NULL"
+        ))
+        connection.execute(text(f"RENAME TABLE {HISTORY_TABLE} TO {OLD_TABLE}, {STAGING_TABLE} TO {HISTORY_TABLE}"))
+    finally:
+        connection.execute(text("UNLOCK TABLES"))
+
+
+def convert_history_table(
+    connection: Connection,
+    scheme: str,
+    hash_partitions: int,
+    months_ahead: int,
+    batch_size: int,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> bool:
+    """
+    Converte conversation_histories para o esquema particionado. A conexão deve estar em autocommit
+    (cada lote é a sua própria transação). Retorna False se a tabela já estiver particionada.
+    A tabela original fica em conversation_histories_unpartitioned até 'drop_old_table'.
+    """
+    _check_scheme(scheme)
+    if is_partitioned(connection):
+        logger.info("conversation_histories já está particionada; nada a fazer.")
+        return False
+    if _table_exists(connection, OLD_TABLE):
+        raise RuntimeError(f"A tabela '{OLD_TABLE}' de uma conversão anterior ainda existe; remova-a antes.")
+    create_staging_table(connection, scheme, hash_partitions, months_ahead)
+    last_id = copy_in_batches(connection, batch_size, on_progress)
+    logger.info(f"Cópia em lotes concluída até o id {last_id}; trocando as tabelas.")
+    swap_tables(connection)
+    return True
+
+
+def drop_old_table(connection: Connection) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {OLD_TABLE}"))
+
+
+def remove_partitioning(connection: Connection) -> None:
+    """
+    Volta ao formato original: sem partições, chave primária (id) e FK para briefings.
+    (REMOVE PARTITIONING reconstrói a tabela; usado apenas no downgrade.)
+    """
+    if not is_partitioned(connection):
+        return
+    connection.execute(text(f"ALTER TABLE {HISTORY_TABLE} REMOVE PARTITIONING"))
+    connection.execute(text(f"ALTER TABLE {HISTORY_TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id)"))
+    connection.execute(text(
+        f"ALTER TABLE {HISTORY_TABLE} ADD CONSTRAINT {HISTORY_FK_NAME} FOREIGN KEY (briefing_id) REFERENCES briefings (id)"
+    ))
+
+
+# --- Manutenção das partições ---
+
+def add_month_partitions(connection: Connection, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """
+    Esquema "month": cria as partições mensais que faltam até 'months_ahead' meses à frente,
+    dividindo a partição MAXVALUE (vazia em uso normal, então a operação é rápida).
+    """
+    existing = {p["name"] for p in list_partitions(connection)}
+    if MAX_PARTITION not in existing:
+        raise RuntimeError("conversation_histories não usa o particionamento mensal.")
+    month_names = sorted(name for name in existing if name != MAX_PARTITION)
+    current = date.today() if today is None else today
+    start = add_months(date(int(month_names[-1][1:5]), int(month_names[-1][5:7]), 1), 1) if month_names else date(current.year, current.month, 1)
+    missing = [month for month in months_to_cover(start, current, months_ahead) if month_partition_name(month) not in existing]
+    if not missing:
+        return []
+    connection.execute(text(
+        f"ALTER TABLE {HISTORY_TABLE} REORGANIZE PARTITION {MAX_PARTITION} INTO ({month_partition_definitions(missing)})"
+    ))
+    return [month_partition_name(month) for month in missing]
+
+
+def drop_month_partitions_before(connection: Connection, before: date) -> List[str]:
+    """
+    Esquema "month": remove (DROP PARTITION, sem DELETE linha a linha) as partições inteiramente
+    anteriores a 'before'. APAGA as mensagens desses meses: é a ferramenta de retenção.
+    """
+    limit = connection.execute(text("SELECT TO_DAYS(:before)"), {"before": before.isoformat()}).scalar()
+    names = [
+        p["name"] for p in list_partitions(connection)
+        if p["name"] != MAX_PARTITION and p["description"] not in (None, "MAXVALUE") and int(p["description"]) <= limit
+    ]
+    if names:
+        connection.execute(text(f"ALTER TABLE {HISTORY_TABLE} DROP PARTITION {', '.join(names)}"))
+    return names
+
+
+def resize_hash_partitions(connection: Connection, partitions: int) -> int:
+    """
+    Esquema "briefing_hash": ajusta a quantidade de partições (ADD PARTITION / COALESCE PARTITION).
+    Retorna a quantidade anterior.
+    """
+    current = len(list_partitions(connection))
+    if current == 0:
+        raise RuntimeError("conversation_histories não está particionada.")
+    if partitions > current:
+        connection.execute(text(f"ALTER TABLE {HISTORY_TABLE} ADD PARTITION PARTITIONS {partitions - current}"))
+    elif partitions < current:
+        connection.execute(text(f"ALTER TABLE {HISTORY_TABLE} COALESCE PARTITION {current - partitions}"))
+    return current
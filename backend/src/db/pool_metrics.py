@@ -0,0 +1,118 @@
+# File: backend/src/db/pool_metrics.py
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Métricas do pool de conexões de um engine: conexões em uso, overflow, tempo de espera
+    por uma conexão livre e timeouts. Alimentado pelos eventos do pool (connect/checkout/checkin/
+    invalidate) e, para o tempo de espera, pelo InstrumentedQueuePool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connections_opened = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_total_seconds = 0.0
+            self.wait_max_seconds = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_seconds += seconds
+            self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, engine: Engine) -> None:
+        """
+        Registra os listeners de eventos do pool do engine.
+        """
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.metrics = self
+
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connections_opened += 1
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        event.listen(pool, "connect", on_connect)
+        event.listen(pool, "checkout", on_checkout)
+        event.listen(pool, "checkin", on_checkin)
+        event.listen(pool, "invalidate", on_invalidate)
+
+    def snapshot(self, engine: Optional[Engine] = None) -> Dict[str, Any]:
+        """
+        Estado atual do pool (quando há engine) somado aos contadores acumulados.
+        """
+        with self._lock:
+            data: Dict[str, Any] = {
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_avg_ms": round(self.wait_total_seconds / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                "wait_max_ms": round(self.wait_max_seconds * 1000, 3),
+            }
+        if engine is not None:
+            pool = engine.pool
+            data["pool_class"] = pool.__class__.__name__
+            # size/overflow/checkedout só existem nos pools com fila (QueuePool e derivados)
+            for name in ("size", "checkedout", "overflow", "checkedin"):
+                method = getattr(pool, name, None)
+                data[name if name != "checkedout" else "checked_out"] = method() if callable(method) else None
+        return data
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mede quanto tempo cada requisição espera por uma conexão livre
+    (o pool do SQLAlchemy não tem evento "antes do checkout" para isso).
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started_at, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - started_at)
+        return connection
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,161 @@
+# File: backend/src/db/query_budget.py
+#
+# Orçamento de SQL por requisição: conta os comandos e o tempo de banco de cada requisição
+# (eventos do SQLAlchemy em todos os engines) e registra no log as rotas acima do orçamento
+# (QUERY_BUDGET_*). O mesmo comando repetido muitas vezes numa requisição é sinalizado como
+# provável N+1 (uma consulta por item de uma lista, em vez de uma para a lista toda).
+#
+# As respostas levam o cabeçalho Server-Timing ("db;dur=12.5;desc=\"7 queries\"").
+# Nos testes, 'query_budget' (tests/conftest.py) falha o teste quando uma rota passa do orçamento.
+
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Comando normalizado para a detecção de repetições: sem literais e com listas IN colapsadas
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _LITERALS.sub("?", statement)
+    statement = _IN_LISTS.sub("(?)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+class QueryStats:
+    """
+    Comandos SQL e tempo de banco de uma requisição (ou de um bloco 'track_queries').
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.db_seconds += seconds
+            self.statements[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """
+        Comandos executados 'threshold' vezes ou mais (prováveis N+1).
+        """
+        threshold = settings.QUERY_BUDGET_REPEAT_THRESHOLD if threshold is None else threshold
+        return {statement: times for statement, times in self.statements.items() if times >= threshold}
+
+    def over_budget(
+        self,
+        max_statements: Optional[int] = None,
+        max_db_ms: Optional[float] = None,
+        repeat_threshold: Optional[int] = None
+    ) -> List[str]:
+        """
+        Motivos pelos quais a requisição passou do orçamento (vazio quando está dentro).
+        """
+        max_statements = settings.QUERY_BUDGET_MAX_STATEMENTS if max_statements is None else max_statements
+        max_db_ms = settings.QUERY_BUDGET_MAX_DB_MS if max_db_ms is None else max_db_ms
+        reasons = []
+        if self.count > max_statements:
+            reasons.append(f"{self.count} comandos SQL (orçamento: {max_statements})")
+        if self.db_seconds * 1000 > max_db_ms:
+            reasons.append(f"{self.db_seconds * 1000:.1f} ms no banco (orçamento: {max_db_ms:.0f} ms)")
+        for statement, times in self.repeated(repeat_threshold).items():
+            reasons.append(f"provável N+1: {times}x {statement[:200]}")
+        return reasons
+
+    def describe(self) -> str:
+        lines = [f"{self.label}: {self.count} comando(s), {self.db_seconds * 1000:.1f} ms no banco"]
+        lines.extend(f"  {times}x {statement[:300]}" for statement, times in self.statements.most_common())
+        return "\n".join(lines)
+
+
+# Estatísticas da requisição em andamento (propagadas para o threadpool das rotas síncronas)
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+
+# Blocos 'track_queries' ativos: recebem os comandos de qualquer thread (ex: o TestClient roda a
+# aplicação em outra thread, fora do contexto do teste)
+_global_trackers: List[QueryStats] = []
+
+# Chamados ao fim de cada requisição com as estatísticas dela (usado pelos testes)
+request_observers: List[Callable[[QueryStats], None]] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_budget_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_budget_started")
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    for tracker in _global_trackers:
+        tracker.record(statement, seconds)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Comando que falhou: descarta a marca de início (o after_cursor_execute não acontece)
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_budget_started"):
+        connection.info["query_budget_started"].pop()
+
+
+@contextmanager
+def track_queries(label: str = "bloco") -> Iterator[QueryStats]:
+    """
+    Conta todos os comandos SQL executados (em qualquer thread) enquanto o bloco estiver ativo.
+    """
+    stats = QueryStats(label)
+    _global_trackers.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_trackers.remove(stats)
+
+
+async def query_budget_middleware(request: Request, call_next):
+    """
+    Mede os comandos SQL da requisição, adiciona o Server-Timing e registra as que passam do orçamento.
+    Rotas com resposta em streaming (exportações) são medidas só até o início da resposta.
+    """
+    if not settings.QUERY_BUDGET_ENABLED:
+        return await call_next(request)
+    stats = QueryStats(f"{request.method} {request.url.path}")
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    response.headers["Server-Timing"] = f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.count} queries"'
+    reasons = stats.over_budget()
+    if reasons:
+        logger.warning(f"Requisição acima do orçamento de SQL: {stats.label} ({'; '.join(reasons)})")
+    for observer in list(request_observers):
+        observer(stats)
+    return response
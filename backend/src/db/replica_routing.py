@@ -0,0 +1,174 @@
+# File: backend/src/db/replica_routing.py
+
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Depends, Request
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.core.config import settings
+from src.core.security import decode_access_token
+from src.db.database import create_app_engine, get_db
+from src.db.pool_metrics import PoolMetrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Métodos que não alteram dados: não disparam a janela de leitura no primário
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Limite de identidades guardadas para a janela de leitura no primário
+MAX_STICKY_KEYS = 10000
+
+
+class ReplicaRouter:
+    """
+    Escolhe a réplica de leitura de cada requisição (round-robin entre as saudáveis).
+    Réplicas que falham ficam fora do rodízio por REPLICA_RETRY_SECONDS. Depois de uma escrita,
+    a mesma identidade (usuário/admin do token) lê do primário por REPLICA_STICKY_SECONDS,
+    para enxergar a própria alteração mesmo com atraso de replicação.
+    O estado é por processo; com vários workers a janela vale para o worker que recebeu a escrita.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines: Dict[str, Engine] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self._down_until: Dict[str, float] = {}
+        self._sticky_until: Dict[str, float] = {}
+        self._urls: Tuple[str, ...] = ()
+        self._cycle = itertools.cycle(())
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.DATABASE_REPLICA_URLS)
+
+    def _sync_urls(self) -> None:
+        urls = tuple(settings.DATABASE_REPLICA_URLS)
+        if urls != self._urls:
+            self._urls = urls
+            self._cycle = itertools.cycle(urls)
+
+    def _engine_for(self, url: str) -> Engine:
+        # Engines das réplicas são criados no primeiro uso (o startup não depende delas)
+        engine = self._engines.get(url)
+        if engine is None:
+            metrics = PoolMetrics()
+            engine = create_app_engine(url, metrics=metrics)
+            self._engines[url] = engine
+            self._metrics[url] = metrics
+        return engine
+
+    def candidates(self) -> List[Tuple[str, Engine]]:
+        """
+        Réplicas disponíveis, na ordem em que devem ser tentadas.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._sync_urls()
+            ordered = [next(self._cycle) for _ in self._urls]
+            return [(url, self._engine_for(url)) for url in ordered if self._down_until.get(url, 0.0) <= now]
+
+    def mark_down(self, url: str, error: Exception) -> None:
+        logger.warning(f"Réplica de leitura indisponível, usando o primário por {settings.REPLICA_RETRY_SECONDS}s: {error}")
+        with self._lock:
+            self._down_until[url] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+    def mark_write(self, key: Optional[str]) -> None:
+        if not key or settings.REPLICA_STICKY_SECONDS <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._sticky_until) >= MAX_STICKY_KEYS:
+                self._sticky_until = {k: until for k, until in self._sticky_until.items() if until > now}
+            self._sticky_until[key] = now + settings.REPLICA_STICKY_SECONDS
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        with self._lock:
+            return self._sticky_until.get(key, 0.0) > time.monotonic()
+
+    def status(self) -> List[Dict[str, object]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "replica": index,
+                    "available": self._down_until.get(url, 0.0) <= now,
+                    "pool": self._metrics[url].snapshot(self._engines[url]) if url in self._engines else None,
+                }
+                for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._metrics.clear()
+            self._down_until.clear()
+            self._sticky_until.clear()
+            self._urls = ()
+            self._cycle = itertools.cycle(())
+
+
+replica_router = ReplicaRouter()
+
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_request_identity(request: Request) -> Optional[str]:
+    """
+    Identidade do autor da requisição ("user:1", "admin:3") a partir do token Bearer, se houver.
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    token_data = decode_access_token(token)
+    if token_data is None:
+        return None
+    return f"{token_data.user_type}:{token_data.id}"
+
+
+async def replica_routing_middleware(request: Request, call_next):
+    """
+    Abre a janela de leitura no primário para o autor de qualquer requisição de escrita.
+    """
+    response = await call_next(request)
+    if replica_router.enabled and request.method not in SAFE_METHODS:
+        replica_router.mark_write(get_request_identity(request))
+    return response
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Dependência de sessão para rotas somente leitura. Usa uma réplica quando configurada,
+    e o primário ('get_db') quando não há réplicas, quando o autor escreveu há pouco
+    ou quando nenhuma réplica responde.
+    """
+    if not replica_router.enabled or replica_router.is_sticky(get_request_identity(request)):
+        yield db
+        return
+
+    for url, engine in replica_router.candidates():
+        replica_db: Session = ReplicaSessionLocal(bind=engine)
+        try:
+            replica_db.connection() # Falha aqui (e não no meio da rota) se a réplica estiver fora
+        except (OperationalError, DBAPIError) as e:
+            replica_db.close()
+            replica_router.mark_down(url, e)
+            continue
+        try:
+            yield replica_db
+        finally:
+            replica_db.close()
+        return
+
+    yield db
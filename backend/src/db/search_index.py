@@ -0,0 +1,203 @@
+# File: backend/src/db/search_index.py
+#
+# Índice de busca textual sobre as mensagens (conversation_histories.message_content) e o
+# conteúdo compilado dos briefings (título + textos de Briefing.content).
+#
+# Uma tabela própria, 'search_documents', mantida a cada escrita (mensagem gravada, compilação,
+# edição e exclusão), em vez de um índice nas tabelas de origem:
+#   - MySQL: tabela InnoDB com índice FULLTEXT (MATCH ... AGAINST). conversation_histories pode
+#     estar particionada (HISTORY_PARTITIONING), e o MySQL não aceita FULLTEXT em tabela particionada.
+#   - SQLite (dev/testes): tabela virtual FTS5 (bm25, snippet), sem acentos nem caixa.
+# O histórico arquivado continua indexado: o arquivamento não toca 'search_documents'.
+#
+# O id do documento deriva da origem (id * 2 + tipo), então reindexar é um upsert pela chave
+# primária e apagar as mensagens de um lote não precisa de índice extra (o FTS5 só indexa o texto).
+# Pelo mesmo motivo, no SQLite os documentos de um briefing excluído saem pelo rowid, calculado a
+# partir dos ids das mensagens, e não por 'briefing_id' (não indexado no FTS5: varreria a tabela toda).
+
+import json
+import logging
+from typing import Any, Iterable, List, Tuple
+
+from sqlalchemy import BigInteger, Column, Index, Integer, MetaData, Table, Text, delete, event, insert, select, text
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.core.config import settings
+from src.db.database import Base
+from src.models.conversation_archive_models import ConversationHistoryArchive
+from src.models.conversation_history_models import ConversationHistory
+from src.utils.history_archive_utils import unpack_history
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "search_documents"
+
+# Tipo da origem, no bit menos significativo do id do documento
+MESSAGE = "message"
+BRIEFING = "briefing"
+SOURCE_KINDS = {MESSAGE: 0, BRIEFING: 1}
+
+SUPPORTED_DIALECTS = ("mysql", "sqlite")
+
+# Ids por DELETE ao remover mensagens arquivadas (abaixo do limite de parâmetros do SQLite)
+REMOVE_BATCH_SIZE = 500
+
+mysql_search_documents = Table(
+    SEARCH_TABLE, MetaData(),
+    Column("id", BigInteger, primary_key=True, autoincrement=False),
+    Column("briefing_id", Integer, nullable=False),
+    Column("body", Text().with_variant(MEDIUMTEXT(), "mysql"), nullable=False),
+    Index("ix_search_documents_briefing_id", "briefing_id"),
+    Index("ft_search_documents_body", "body", mysql_prefix="FULLTEXT"),
+    mysql_engine="InnoDB",
+    mysql_charset="utf8mb4",
+)
+
+# No FTS5 o id é o 'rowid' da tabela virtual; as demais colunas não são indexadas
+fts_search_documents = Table(
+    SEARCH_TABLE, MetaData(),
+    Column("rowid", BigInteger, key="id", primary_key=True),
+    Column("briefing_id", Integer),
+    Column("body", Text),
+)
+FTS5_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "body, briefing_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+
+def document_id(kind: str, source_id: int) -> int:
+    return source_id * 2 + SOURCE_KINDS[kind]
+
+
+def source_of(doc_id: int) -> Tuple[str, int]:
+    return (BRIEFING if doc_id % 2 else MESSAGE), doc_id // 2
+
+
+def is_enabled(bind: Any) -> bool:
+    return settings.SEARCH_INDEX_ENABLED and bind.dialect.name in SUPPORTED_DIALECTS
+
+
+def search_table(bind: Any) -> Table:
+    return fts_search_documents if bind.dialect.name == "sqlite" else mysql_search_documents
+
+
+# --- Esquema ---
+
+def create_search_table(connection: Connection) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(FTS5_DDL))
+    elif connection.dialect.name == "mysql":
+        mysql_search_documents.create(connection, checkfirst=True)
+
+
+def drop_search_table(connection: Connection) -> None:
+    if connection.dialect.name in SUPPORTED_DIALECTS:
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+# create_all/drop_all (testes, bancos descartáveis) também cuidam da tabela de busca
+@event.listens_for(Base.metadata, "after_create")
+def _after_metadata_create(target, connection, **kw):
+    create_search_table(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _before_metadata_drop(target, connection, **kw):
+    drop_search_table(connection)
+
+
+# --- Texto indexado ---
+
+def _iter_strings(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def briefing_search_text(content: Any) -> str:
+    """
+    Todos os textos do documento compilado (os valores; as chaves são o formato, não o conteúdo).
+    O título não entra: ele volta em cada resultado, e renomear um briefing não mexe no índice.
+    """
+    if isinstance(content, (str, bytes)):
+        try:
+            content = json.loads(content)
+        except ValueError:
+            pass
+    return "\n".join(part.strip() for part in _iter_strings(content) if part and part.strip())
+
+
+# --- Escrita (no mesmo commit de quem chama) ---
+
+def upsert_documents(db: Session, documents: List[dict]) -> None:
+    """
+    Grava (ou substitui) documentos {"id", "briefing_id", "body"}. Sem commit.
+    """
+    bind = db.get_bind()
+    if not documents or not is_enabled(bind):
+        return
+    if bind.dialect.name == "mysql":
+        stmt = mysql_insert(mysql_search_documents).values(documents)
+        db.execute(stmt.on_duplicate_key_update(briefing_id=stmt.inserted.briefing_id, body=stmt.inserted.body))
+    else:
+        # O FTS5 não tem upsert: apaga e insere pelo rowid
+        db.execute(delete(fts_search_documents).where(fts_search_documents.c.id.in_([d["id"] for d in documents])))
+        db.execute(insert(fts_search_documents), documents)
+
+
+def index_message(db: Session, message_id: int, briefing_id: int, content: str) -> None:
+    upsert_documents(db, [{"id": document_id(MESSAGE, message_id), "briefing_id": briefing_id, "body": content}])
+
+
+def index_briefing(db: Session, briefing_id: int, content: Any) -> None:
+    upsert_documents(db, [{"id": document_id(BRIEFING, briefing_id), "briefing_id": briefing_id, "body": briefing_search_text(content)}])
+
+
+def remove_messages(db: Session, message_ids: Iterable[int]) -> None:
+    bind = db.get_bind()
+    doc_ids = [document_id(MESSAGE, message_id) for message_id in message_ids]
+    if doc_ids and is_enabled(bind):
+        table = search_table(bind)
+        for start in range(0, len(doc_ids), REMOVE_BATCH_SIZE):
+            db.execute(delete(table).where(table.c.id.in_(doc_ids[start:start + REMOVE_BATCH_SIZE])))
+
+
+def remove_briefings(db: Session, briefing_ids: Any) -> None:
+    """
+    Remove os documentos (mensagens, inclusive as arquivadas, e conteúdo) dos briefings: lista de ids
+    ou subconsulta. Deve ser chamada antes de apagar o histórico e o arquivo: no SQLite os documentos
+    saem pelo rowid, derivado dos ids das mensagens.
+    """
+    bind = db.get_bind()
+    if not is_enabled(bind):
+        return
+    if bind.dialect.name == "mysql":
+        # 'briefing_id' é indexado na tabela InnoDB
+        db.execute(delete(mysql_search_documents).where(mysql_search_documents.c.briefing_id.in_(briefing_ids)))
+        return
+
+    table = fts_search_documents
+    message_doc_ids = select(ConversationHistory.id * 2 + SOURCE_KINDS[MESSAGE]).where(ConversationHistory.briefing_id.in_(briefing_ids))
+    db.execute(delete(table).where(table.c.id.in_(message_doc_ids)))
+    archives = db.execute(
+        select(ConversationHistoryArchive.compressed_history).where(ConversationHistoryArchive.briefing_id.in_(briefing_ids))
+    ).scalars()
+    for compressed_history in archives:
+        remove_messages(db, [message[0] for message in unpack_history(compressed_history)])
+    if isinstance(briefing_ids, Select):
+        ids = briefing_ids.subquery()
+        briefing_doc_ids = select(ids.c[0] * 2 + SOURCE_KINDS[BRIEFING])
+    else:
+        briefing_doc_ids = [document_id(BRIEFING, briefing_id) for briefing_id in briefing_ids]
+    db.execute(delete(table).where(table.c.id.in_(briefing_doc_ids)))
@@ -0,0 +1,136 @@
+# File: backend/src/db/sqlite_profile.py
+#
+# Perfil SQLite para instalações de um único nó (sem MySQL): PRAGMAs de concorrência em cada
+# conexão nova e uma fila única de escrita por processo.
+#
+# O SQLite aceita um escritor por vez. Sem coordenação, escritores concorrentes disputam o lock do
+# arquivo no busy handler (esperas crescentes, sem ordem) e erram com "database is locked" quando o
+# busy_timeout acaba. Aqui cada escrita espera a sua vez numa fila FIFO em memória, e o SQLite só
+# vê um escritor por processo. Vários processos (ex: vários workers do uvicorn) continuam
+# coordenados pelo busy_timeout, como antes.
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as WriteQueueTimeoutError
+
+from src.core.config import settings
+
+# Comandos que abrem uma transação de escrita (os SELECTs rodam fora de transação no pysqlite)
+WRITE_COMMANDS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+# Chave em connection_record.info: a conexão está com a vez na fila de escrita
+HOLDS_WRITE_TURN = "sqlite_write_turn"
+
+
+def is_file_database(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+class SQLiteWriteQueue:
+    """
+    Fila FIFO (por senhas) de transações de escrita. Uma conexão pega a vez no primeiro comando de
+    escrita da transação e a devolve quando volta ao pool, depois do COMMIT/ROLLBACK.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._tickets: Deque[object] = deque()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._condition:
+            self.writes = 0
+            self.timeouts = 0
+            self.wait_total_seconds = 0.0
+            self.wait_max_seconds = 0.0
+
+    def acquire(self, timeout: float) -> None:
+        ticket = object()
+        started_at = time.perf_counter()
+        with self._condition:
+            self._tickets.append(ticket)
+            turn = self._condition.wait_for(lambda: self._tickets[0] is ticket, timeout=timeout)
+            waited = time.perf_counter() - started_at
+            if not turn:
+                self._tickets.remove(ticket)
+                self._condition.notify_all()
+                self.timeouts += 1
+                raise WriteQueueTimeoutError(f"Fila de escrita do SQLite: sem vez para escrever após {timeout:.1f}s.")
+            self.writes += 1
+            self.wait_total_seconds += waited
+            self.wait_max_seconds = max(self.wait_max_seconds, waited)
+
+    def release(self) -> None:
+        with self._condition:
+            self._tickets.popleft()
+            self._condition.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "writes": self.writes,
+                "waiting": max(0, len(self._tickets) - 1),
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_seconds / self.writes * 1000, 3) if self.writes else 0.0,
+                "wait_max_ms": round(self.wait_max_seconds * 1000, 3),
+            }
+
+
+write_queue = SQLiteWriteQueue()
+
+
+def connect_args() -> Dict[str, Any]:
+    """
+    Argumentos do sqlite3.connect: conexões do pool usadas por várias threads (threadpool do FastAPI)
+    e o mesmo busy_timeout dos PRAGMAs.
+    """
+    return {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+
+
+def configure_engine(engine: Engine, queue: SQLiteWriteQueue = write_queue) -> None:
+    """
+    Registra os PRAGMAs de conexão e, com SQLITE_SERIALIZE_WRITES, a fila de escrita no engine.
+    """
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.close()
+
+    if not settings.SQLITE_SERIALIZE_WRITES:
+        return
+
+    @event.listens_for(engine, "checkout")
+    def begin_immediate(dbapi_connection, connection_record, connection_proxy):
+        # O pysqlite abre a transação (BEGIN) só antes do primeiro comando de escrita; IMMEDIATE pega
+        # o lock de escrita já no BEGIN, em vez de falhar no meio da transação ao tentar promovê-la
+        if isinstance(dbapi_connection, sqlite3.Connection) and dbapi_connection.isolation_level != "IMMEDIATE":
+            dbapi_connection.isolation_level = "IMMEDIATE"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def wait_write_turn(conn, cursor, statement, parameters, context, executemany):
+        info = conn.info # dicionário da conexão no pool (o mesmo do checkin)
+        if info.get(HOLDS_WRITE_TURN) or not statement.lstrip()[:7].upper().startswith(WRITE_COMMANDS):
+            return
+        queue.acquire(timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
+        info[HOLDS_WRITE_TURN] = True
+
+    def release_write_turn(dbapi_connection, connection_record, *args):
+        if connection_record is not None and connection_record.info.pop(HOLDS_WRITE_TURN, False):
+            queue.release()
+
+    # O checkin acontece depois do COMMIT/ROLLBACK (inclusive o rollback do reset do pool); a conexão
+    # invalidada (ex: erro de I/O) devolve a vez antes de ser descartada
+    event.listen(engine.pool, "checkin", release_write_turn)
+    event.listen(engine.pool, "invalidate", release_write_turn)
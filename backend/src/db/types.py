@@ -0,0 +1,33 @@
+# File: backend/src/db/types.py
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+from src.utils.datetime_utils import parse_datetime_str, to_utc
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DATETIME gravado sempre em UTC (sem fuso no banco) e lido como datetime com fuso UTC.
+    Aceita datetimes com fuso (convertidos para UTC), sem fuso (considerados UTC) e,
+    por compatibilidade, textos nos formatos antigos 'DD/MM/YYYY HH:MM:SS' / 'YYYY-MM-DD HH:MM:SS'.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[datetime]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            parsed = parse_datetime_str(value)
+            if parsed is None:
+                raise ValueError(f"Data/hora inválida: '{value}'")
+            value = parsed
+        return to_utc(value).replace(tzinfo=None)
+
+    def process_result_value(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is None:
+            return None
+        return value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,58 @@
+# File: backend/src/db/versioning.py
+#
+# Atualização com controle de concorrência otimista: cada tabela versionada tem a coluna
+# 'version', incrementada a cada escrita. A alteração é um único
+#   UPDATE ... SET ..., version = version + 1 WHERE id = ? [AND version = ?]
+# em vez de SELECT + setattr + UPDATE + SELECT (refresh).
+
+import logging
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def versioned_update(
+    db: Session,
+    model: Type[T],
+    object_id: int,
+    values: Dict[str, Any],
+    expected_version: Optional[int] = None
+) -> Optional[T]:
+    """
+    Executa o UPDATE condicional e faz o commit (erros, como IntegrityError, ficam com o chamador).
+    Retorna a instância com os valores gravados,
+    ou None se nenhuma linha casou (id inexistente ou, com 'expected_version', versão diferente);
+    nesse caso nenhuma consulta extra é feita.
+    Onde o banco tem UPDATE ... RETURNING (SQLite, PostgreSQL) a linha volta no próprio UPDATE;
+    no MySQL ela é relida pela chave primária, só quando o UPDATE alterou a linha.
+    A instância é desanexada da sessão antes do commit, para que o commit não a expire
+    (o que faria a serialização da resposta consultar o banco de novo).
+    """
+    stmt = (
+        update(model)
+        .where(model.id == object_id)
+        .values(**values, version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(model.version == expected_version)
+
+    if db.get_bind().dialect.update_returning:
+        instance = db.execute(
+            stmt.returning(model), execution_options={"populate_existing": True}
+        ).scalars().first()
+    else:
+        result = db.execute(stmt)
+        instance = db.get(model, object_id, populate_existing=True) if result.rowcount else None
+    if instance is None:
+        # Nenhuma linha alterada: não há o que gravar nem desfazer
+        return None
+    db.expunge(instance)
+    db.commit()
+    return instance
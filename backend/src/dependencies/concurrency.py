@@ -0,0 +1,40 @@
+# File: backend/src/dependencies/concurrency.py
+
+import re
+from typing import Optional
+from fastapi import Header, HTTPException, Response, status
+
+ETAG_HEADER = "ETag"
+
+# '"7"' ou 'W/"7"'; o ETag é a versão da linha (coluna 'version')
+_ETAG_PATTERN = re.compile(r'^(?:W/)?"(\d+)"$')
+
+def make_etag(version: int) -> str:
+    return f'"{version}"'
+
+def set_etag(response: Response, version: Optional[int]) -> None:
+    """
+    Publica a versão atual do recurso no cabeçalho 'ETag' (usado depois em 'If-Match').
+    """
+    if version is not None:
+        response.headers[ETAG_HEADER] = make_etag(version)
+
+def get_expected_version(
+    if_match: Optional[str] = Header(None, description="ETag recebido na leitura; a alteração só é gravada se a versão não mudou.")
+) -> Optional[int]:
+    """
+    Dependência das rotas de alteração: versão esperada do recurso, lida de 'If-Match'.
+    Sem cabeçalho (ou com '*') a alteração não é condicional.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    match = _ETAG_PATTERN.match(if_match.strip())
+    if not match:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cabeçalho If-Match inválido.")
+    return int(match.group(1))
+
+def version_conflict(resource: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"{resource} foi alterado por outra requisição. Leia novamente e reenvie a alteração."
+    )
@@ -65,14 +65,15 @@ async def get_current_user_from_token(
     # Esta parte é para validação de EXISTÊNCIA e ATIVIDADE do usuário no DB.
     # Não altere o que é retornado no final da função!
     if token_data.user_type == "admin":
-        user_in_db = db.query(AdminUser).filter(AdminUser.id == token_data.id).first()
+        user_in_db = db.get(AdminUser, token_data.id)
         if not user_in_db or (hasattr(user_in_db, 'is_active') and not user_in_db.is_active):
             logger.warning(f"AdminUser com ID '{token_data.id}' não encontrado ou inativo para token válido.")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Administrador não encontrado ou inativo.")
         logger.info(f"AdminUser ID {user_in_db.id} autenticado via token.")
     elif token_data.user_type == "user":
-        user_in_db = db.query(User).filter(User.id == token_data.id).first()
-        if not user_in_db or (hasattr(user_in_db, 'is_active') and not user_in_db.is_active):
+        user_in_db = db.get(User, token_data.id)
+        # status 'deleted': exclusão lógica, aguardando a remoção em segundo plano
+        if not user_in_db or user_in_db.status == 'deleted' or (hasattr(user_in_db, 'is_active') and not user_in_db.is_active):
             logger.warning(f"User com ID '{token_data.id}' não encontrado ou inativo para token válido.")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado ou inativo.")
         logger.info(f"User ID {user_in_db.id} autenticado via token.")
@@ -80,6 +81,10 @@ async def get_current_user_from_token(
         logger.error(f"Tipo de usuário desconhecido no token: '{token_data.user_type}'")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Tipo de usuário não reconhecido.")
 
+    # O identity map da sessão guarda referências fracas: a referência em db.info mantém o objeto
+    # vivo até as dependências abaixo (get_current_*_user), que o recebem de db.get() sem nova consulta
+    db.info["authenticated_user"] = user_in_db
+
     # AQUI ESTÁ A MUDANÇA MAIS IMPORTANTE:
     # Retorne o objeto TokenData que você decodificou, não o objeto do DB.
     return token_data
@@ -100,8 +105,9 @@ async def get_current_admin_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Operação não permitida. Requer privilégios de administrador."
         )
-    # Agora busque o AdminUser real do banco de dados
-    admin_user_in_db = db.query(AdminUser).filter(AdminUser.id == token_data.id).first()
+    # Mesma sessão da validação do token (get_db é resolvido uma vez por requisição):
+    # db.get() devolve o objeto já carregado, sem nova consulta
+    admin_user_in_db = db.get(AdminUser, token_data.id)
     if not admin_user_in_db:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Administrador não encontrado no DB.")
     return admin_user_in_db
@@ -120,8 +126,8 @@ async def get_current_common_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Operação não permitida. Requer privilégios de usuário comum."
         )
-    # Agora busque o User real do banco de dados
-    user_in_db = db.query(User).filter(User.id == token_data.id).first()
+    # Mesma sessão da validação do token: db.get() devolve o objeto já carregado, sem nova consulta
+    user_in_db = db.get(User, token_data.id)
     if not user_in_db:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado no DB.")
     return user_in_db
\ No newline at end of file
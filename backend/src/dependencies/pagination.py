@@ -0,0 +1,94 @@
+# File: backend/src/dependencies/pagination.py
+
+import base64
+import binascii
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from fastapi import HTTPException, Query, Response, status
+
+from src.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _encode_cursor_data(data: Dict[str, Any]) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor_data(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, TypeError, UnicodeEncodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido.")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido.")
+    return data
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Cursor opaco para a próxima página: último id entregue, em base64 url-safe.
+    """
+    return _encode_cursor_data({"id": last_id})
+
+def decode_cursor(cursor: str) -> int:
+    last_id = _decode_cursor_data(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido.")
+    return last_id
+
+def encode_rank_cursor(score: float, last_id: int) -> str:
+    """
+    Cursor de listagens ordenadas por relevância: (pontuação, id) do último item entregue.
+    """
+    return _encode_cursor_data({"score": score, "id": last_id})
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    data = _decode_cursor_data(cursor)
+    score, last_id = data.get("score"), data.get("id")
+    if not isinstance(score, (int, float)) or isinstance(score, bool) or not isinstance(last_id, int):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido.")
+    return float(score), last_id
+
+
+class PageParams:
+    """
+    Dependência de paginação por cursor (keyset por id) das rotas de listagem.
+    A lista continua no corpo da resposta; o cursor da próxima página vai no cabeçalho
+    'X-Next-Cursor' (ausente na última página). 'skip' é mantido apenas por compatibilidade:
+    o custo de uma página com 'cursor' não depende da profundidade, o de 'skip' sim.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        cursor: Optional[str] = Query(None, description="Cursor retornado em 'X-Next-Cursor' pela página anterior."),
+        skip: int = Query(0, ge=0, deprecated=True, description="Obsoleto: use 'cursor'."),
+        limit: Optional[int] = Query(None, ge=1, description="Itens por página (limitado por PAGE_SIZE_MAX)."),
+    ):
+        self.response = response
+        self.after_id: Optional[int] = decode_cursor(cursor) if cursor else None
+        self.skip = 0 if cursor else skip
+        self.limit = min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+        if self.skip:
+            logger.warning(f"Paginação com 'skip={self.skip}' (obsoleta); prefira 'cursor'.")
+            response.headers["Deprecation"] = "true"
+
+    @property
+    def fetch_limit(self) -> int:
+        # Um item a mais indica se existe próxima página
+        return self.limit + 1
+
+    def paginate(self, items: List[T], key: Callable[[T], Any] = lambda item: item.id) -> List[T]:
+        """
+        Recorta o item extra buscado e publica o cursor da próxima página.
+        """
+        page = items[:self.limit]
+        if len(items) > self.limit:
+            self.response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(page[-1]))
+        return page
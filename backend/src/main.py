@@ -1,11 +1,12 @@
 # File: backend/src/main.py
 
 from fastapi import FastAPI, Depends, HTTPException, status
+import asyncio
 import uvicorn
 import os
 import sys
-from src.db.database import get_db, Session
-import time
+from typing import List
+from src.db.database import get_db, Session, wait_for_database
 from src.utils.datetime_utils import get_current_datetime_str
 
 from src.middlewares.cors import CORS_MIDDLEWARE_SETTINGS
@@ -13,14 +14,18 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.routers import admin_user_routers, briefing_routers, \
                             employee_routers, user_routers, \
-                            auth_admin_routers, auth_user_routers, auth_social_routers
+                            auth_admin_routers, auth_user_routers, auth_social_routers, \
+                            job_routers, monitoring_routers, export_routers, import_routers, search_routers
+from src.services.job_queue_service import job_pool
+from src.db.replica_routing import replica_routing_middleware
+from src.db.query_budget import query_budget_middleware
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 backend_root = os.path.abspath(os.path.join(current_dir, "../"))
 if backend_root not in sys.path:
     sys.path.insert(0, backend_root)
 
-from src.db.database import SessionLocal, engine, Base
+from src.db.database import SessionLocal, Base
 import src.models # <--- Mantenha esta importação para o SQLAlchemy conhecer seus modelos
 
 app = FastAPI(
@@ -35,32 +40,33 @@ app.add_middleware(
     allow_credentials=CORS_MIDDLEWARE_SETTINGS["allow_credentials"],
     allow_methods=CORS_MIDDLEWARE_SETTINGS["allow_methods"],
     allow_headers=CORS_MIDDLEWARE_SETTINGS["allow_headers"],
+    expose_headers=CORS_MIDDLEWARE_SETTINGS["expose_headers"],
 )
 
+app.middleware("http")(replica_routing_middleware)
+app.middleware("http")(query_budget_middleware)
+
+# Tarefa de startup em segundo plano: espera o banco e então inicia o pool de tarefas
+startup_tasks: List[asyncio.Task] = []
+
+async def start_when_database_ready():
+    await wait_for_database()
+    await job_pool.start()
+    print("Lógica de startup da aplicação concluída.")
+
 @app.on_event("startup")
 async def startup_event_handler():
+    # Não bloqueia o startup: a aplicação atende (e responde 503 em /monitoring/ready) até o banco subir
     print("Iniciando a lógica de startup da aplicação...")
+    startup_tasks.append(asyncio.create_task(start_when_database_ready(), name="startup-database"))
 
-    MAX_RETRIES = 5
-    RETRY_DELAY_SECONDS = 5
-
-    for i in range(MAX_RETRIES):
-        try:
-            print(f"Tentando conectar ao banco de dados (tentativa {i + 1}/{MAX_RETRIES})...")
-            with engine.connect() as connection:
-                pass # Apenas testa a conexão
-            print("Conexão com o banco de dados estabelecida com sucesso.")
-            break
-        except Exception as e:
-            print(f"Falha ao conectar ao banco de dados: {e}")
-            if i < MAX_RETRIES - 1:
-                print(f"Aguardando {RETRY_DELAY_SECONDS} segundos antes de tentar novamente...")
-                time.sleep(RETRY_DELAY_SECONDS)
-            else:
-                print("Número máximo de tentativas de conexão atingido. Exiting.")
-                sys.exit(1)
-    
-    print("Lógica de startup da aplicação concluída.")
+@app.on_event("shutdown")
+async def shutdown_event_handler():
+    for task in startup_tasks:
+        task.cancel()
+    await asyncio.gather(*startup_tasks, return_exceptions=True)
+    startup_tasks.clear()
+    await job_pool.stop()
 
 app.include_router(user_routers.router)
 app.include_router(admin_user_routers.router)
@@ -69,6 +75,11 @@ app.include_router(briefing_routers.router)
 app.include_router(auth_admin_routers.router)
 app.include_router(auth_user_routers.router)
 app.include_router(auth_social_routers.router)
+app.include_router(job_routers.router)
+app.include_router(monitoring_routers.router)
+app.include_router(export_routers.router)
+app.include_router(import_routers.router)
+app.include_router(search_routers.router)
 
 @app.get("/")
 def read_root():
@@ -19,4 +19,5 @@ CORS_MIDDLEWARE_SETTINGS = {
     "allow_credentials": True, # Permitir cookies, cabeçalhos de autorização, etc.
     "allow_methods": ["*"],    # Permitir todos os métodos (GET, POST, PUT, DELETE, OPTIONS, etc.)
     "allow_headers": ["*"],    # Permitir todos os cabeçalhos
+    "expose_headers": ["X-Next-Cursor", "ETag"], # Cursor da próxima página nas listagens; versão do recurso (If-Match)
 }
\ No newline at end of file
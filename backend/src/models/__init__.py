@@ -6,5 +6,9 @@ from .admin_user_models import AdminUser
 from .employee_models import Employee
 from .briefing_models import Briefing
 from .conversation_history_models import ConversationHistory
+from .conversation_archive_models import ConversationHistoryArchive
+from .job_models import Job
+# Tabela de busca textual (fora do ORM: FULLTEXT no MySQL, FTS5 no SQLite), criada junto no create_all
+from ..db import search_index
 # Adicione aqui quaisquer outros modelos que você possa ter (ex: other_model.py)
 # from .other_model import OtherModel
\ No newline at end of file
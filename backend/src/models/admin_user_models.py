@@ -2,6 +2,7 @@
 
 from sqlalchemy import Column, Integer, String, Boolean
 from ..db.database import Base # Importar a Base declarativa
+from ..db.types import UTCDateTime
 
 class AdminUser(Base):
     __tablename__ = 'admin_users'
@@ -11,8 +12,9 @@ class AdminUser(Base):
     password_hash = Column(String(255), nullable=False) # Hash da senha administrativa
     two_factor_secret = Column(String(255), nullable=True) # Armazena o segredo para 2FA TOTP
     is_two_factor_enabled = Column(Boolean, default=False)
-    creation_date = Column(String(19), nullable=False)
-    last_login = Column(String(19), nullable=True)
+    creation_date = Column(UTCDateTime(), nullable=False)
+    last_login = Column(UTCDateTime(), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1') # Incrementada a cada alteração do perfil (ETag / If-Match)
 
     def __repr__(self):
         return f"<AdminUser(id={self.id}, username='{self.username}', last_login='{self.last_login}')>"
@@ -1,22 +1,35 @@
 # File: backend/src/models/briefing_models.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, JSON, String, ForeignKey, UniqueConstraint, Index # JSON genérico: JSON no MySQL, TEXT com funções JSON no SQLite
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.mysql import JSON # Usar JSON do MySQL/MariaDB para o conteúdo
 from ..db.database import Base # Importar a Base declarativa
+from ..db.types import UTCDateTime
 
 class Briefing(Base):
     __tablename__ = 'briefings'
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False) # Vincula o briefing ao usuário
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False) # Vincula o briefing ao usuário
     title = Column(String(255), nullable=False) # Título do briefing (ex: "Meus Hobbies", "Projeto E-commerce X")
     content = Column(JSON, nullable=True) # Conteúdo estruturado do briefing gerado/editado (Pode ser NULL no início)
     status = Column(String(50), default='Em Construção', nullable=False) # Status (ex: 'Em Construção', 'Pronto para Revisão', 'Finalizado')
     development_roteiro = Column(JSON, nullable=True) # Roteiro/orçamento manual do administrador (JSON)
-    creation_date = Column(String(19), nullable=False) # Data de criação do briefing
-    update_date = Column(String(19), nullable=True) # Data da última alteração
+    creation_date = Column(UTCDateTime(), nullable=False) # Data de criação do briefing
+    update_date = Column(UTCDateTime(), nullable=True) # Data da última alteração
     last_edited_by = Column(String(5), nullable=True) # Quem fez a última edição (user_type: 'user' ou 'admin')
+    # Marca d'água da última compilação bem-sucedida: último conversation_histories.id incluído
+    # e a versão (hash) do roteiro do 'Assistente de Palco' usado. Permite a compilação incremental.
+    compiled_until_message_id = Column(Integer, nullable=True)
+    compiled_script_version = Column(String(64), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1') # Incrementada a cada escrita (ETag / If-Match)
+    # Atividade do chat, desnormalizada para a listagem (mantida junto com cada mensagem gravada;
+    # recalculável com scripts/backfill_briefing_activity.py). Inclui as mensagens arquivadas.
+    message_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_message_at = Column(UTCDateTime(), nullable=True)
+    last_sender = Column(String(30), nullable=True) # sender_type da última mensagem
+    # Exclusão lógica de briefings grandes: o briefing some das consultas na hora e o histórico
+    # é removido em lotes por uma tarefa em segundo plano (ver src/services/purge_service.py)
+    deleted_at = Column(UTCDateTime(), nullable=True)
 
     # Define o relacionamento com a tabela users
     user = relationship("User", back_populates="briefings")
@@ -25,11 +38,26 @@ class Briefing(Base):
     conversation_histories = relationship(
         "ConversationHistory",
         back_populates="briefing",
-        cascade="all, delete-orphan" # Deleta o histórico se o briefing for deletado
+        cascade="all, delete-orphan", # Deleta o histórico se o briefing for deletado
+        passive_deletes=True, # ... via ON DELETE CASCADE / DELETE em massa, sem carregar as mensagens
+        order_by="ConversationHistory.id" # Ordem cronológica também no carregamento em lote (selectinload)
     )
 
-    # Garante que a combinação user_id e title seja única
-    __table_args__ = (UniqueConstraint('user_id', 'title', name='_user_title_uc'),)
+    # Histórico antigo arquivado e comprimido (briefings ociosos); volta para a tabela no próximo chat
+    history_archive = relationship(
+        "ConversationHistoryArchive",
+        back_populates="briefing",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    # Garante que a combinação user_id e title seja única; o índice atende à listagem por usuário
+    __table_args__ = (
+        UniqueConstraint('user_id', 'title', name='_user_title_uc'),
+        Index('ix_briefings_user_id_update_date', 'user_id', 'update_date'),
+        Index('ix_briefings_update_date', 'update_date'), # Janelas de tempo em relatórios e retenção
+    )
 
     def __repr__(self):
         return f"<Briefing(id={self.id}, user_id={self.user_id}, title='{self.title}', status='{self.status}')>"
\ No newline at end of file
@@ -0,0 +1,25 @@
+# File: backend/src/models/conversation_archive_models.py
+
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary
+from sqlalchemy.dialects.mysql import LONGBLOB
+from sqlalchemy.orm import relationship
+from ..db.database import Base
+from ..db.types import UTCDateTime
+
+
+class ConversationHistoryArchive(Base):
+    __tablename__ = 'conversation_history_archives'
+
+    # Um blob comprimido por briefing, com todas as mensagens arquivadas (ids originais preservados)
+    briefing_id = Column(Integer, ForeignKey('briefings.id', ondelete='CASCADE'), primary_key=True)
+    message_count = Column(Integer, nullable=False) # Quantidade de mensagens no blob
+    first_message_id = Column(Integer, nullable=False)
+    last_message_id = Column(Integer, nullable=False) # Maior conversation_histories.id arquivado
+    raw_bytes = Column(Integer, nullable=False) # Tamanho do histórico antes da compressão
+    compressed_history = Column(LargeBinary().with_variant(LONGBLOB(), "mysql"), nullable=False) # JSON comprimido (zlib)
+    archived_at = Column(UTCDateTime(), nullable=False)
+
+    briefing = relationship("Briefing", back_populates="history_archive")
+
+    def __repr__(self):
+        return f"<ConversationHistoryArchive(briefing_id={self.briefing_id}, message_count={self.message_count}, archived_at='{self.archived_at}')>"
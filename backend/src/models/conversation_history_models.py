@@ -1,21 +1,31 @@
 # File: backend/src/models/conversation_history_models.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from ..db.database import Base
+from ..db.types import UTCDateTime
 
 
 class ConversationHistory(Base):
     __tablename__ = 'conversation_histories'
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    briefing_id = Column(Integer, ForeignKey('briefings.id'), nullable=False) # Chave estrangeira para o briefing
+    briefing_id = Column(Integer, ForeignKey('briefings.id', ondelete='CASCADE'), nullable=False) # Chave estrangeira para o briefing
+    # Com HISTORY_PARTITIONING (MySQL) a tabela é particionada: a chave primária no banco inclui briefing_id
+    # (e timestamp no esquema mensal) e a FK não existe no banco; ver src/db/partitioning.py
     sender_type = Column(String(30), nullable=False, default='User') # Tipo do remetente: 'users.nickname' ou 'employees.employee_name'
     message_content = Column(Text, nullable=False) # Conteúdo da mensagem. Usar Text para mensagens longas.
-    timestamp = Column(String(19), nullable=False) # Data e hora da mensagem
+    timestamp = Column(UTCDateTime(), nullable=False) # Data e hora da mensagem
 
     # Relacionamento com a tabela de briefings
     briefing = relationship("Briefing", back_populates="conversation_histories")
 
+    # Histórico de um briefing em ordem de id (chat, compilação, marca d'água);
+    # janelas de tempo (relatórios, retenção) pelo timestamp
+    __table_args__ = (
+        Index('ix_conversation_histories_briefing_id_id', 'briefing_id', 'id'),
+        Index('ix_conversation_histories_timestamp', 'timestamp'),
+    )
+
     def __repr__(self):
         return f"<ConversationHistory(id={self.id}, briefing_id={self.briefing_id}, sender_type='{self.sender_type}', timestamp='{self.timestamp}')>"
\ No newline at end of file
@@ -1,8 +1,8 @@
 # File: backend/src/models/employee_models.py
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, JSON, String
 from ..db.database import Base
-from sqlalchemy.dialects.mysql import JSON
+from ..db.types import UTCDateTime
 
 class Employee(Base): 
     __tablename__ = 'employees'
@@ -15,7 +15,8 @@ class Employee(Base):
     endpoint_key = Column(String(255), nullable=False) # A chave da API
     headers_template = Column(JSON, nullable=False)
     body_template = Column(JSON, nullable=False)
-    last_update = Column(String(19), nullable=True)
+    last_update = Column(UTCDateTime(), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1') # Incrementada a cada alteração (ETag / If-Match)
 
     def __repr__(self):
         return f"<Employee(id={self.id}, employee_name='{self.employee_name}', last_update='{self.last_update}')>"
\ No newline at end of file
@@ -0,0 +1,30 @@
+# File: backend/src/models/job_models.py
+
+from sqlalchemy import Column, Integer, JSON, String, Text, Index
+from ..db.database import Base
+from ..db.types import UTCDateTime
+
+class Job(Base):
+    __tablename__ = 'jobs'
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_type = Column(String(50), nullable=False) # Tipo da tarefa (ex: 'compile_briefing')
+    # Chave de deduplicação: preenchida enquanto a tarefa está ativa e limpa ao terminar.
+    # O índice único garante que duas requisições simultâneas compartilhem a mesma tarefa.
+    dedup_key = Column(String(100), unique=True, nullable=True)
+    payload = Column(JSON, nullable=False) # Parâmetros da tarefa (ex: briefing_id, user_id)
+    status = Column(String(20), default='pending', nullable=False) # 'pending', 'running', 'succeeded', 'failed'
+    attempts = Column(Integer, default=0, nullable=False) # Tentativas já executadas
+    max_attempts = Column(Integer, default=3, nullable=False)
+    result = Column(JSON, nullable=True) # Resultado da execução bem-sucedida
+    error = Column(Text, nullable=True) # Última mensagem de erro
+    user_id = Column(Integer, nullable=True) # Quem solicitou a tarefa (para controle de acesso ao status)
+    creation_date = Column(UTCDateTime(), nullable=False)
+    update_date = Column(UTCDateTime(), nullable=True)
+    finished_date = Column(UTCDateTime(), nullable=True)
+
+    # Retomada da fila no startup: busca por status em ordem de criação
+    __table_args__ = (Index('ix_jobs_status_id', 'status', 'id'),)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, job_type='{self.job_type}', status='{self.status}', attempts={self.attempts})>"
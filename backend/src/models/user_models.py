@@ -1,8 +1,9 @@
 # File: /backend/src/models/user_models.py
 
-from sqlalchemy import Column, Integer, String, Boolean # Removido DateTime, text
+from sqlalchemy import Column, Integer, String, Boolean, Index # Removido DateTime, text
 from sqlalchemy.orm import relationship
 from ..db.database import Base # Importar a Base declarativa
+from ..db.types import UTCDateTime
 
 class User(Base):
     __tablename__ = 'users'
@@ -17,11 +18,19 @@ class User(Base):
     github_id = Column(String(255), unique=True, nullable=True) # ID único do GitHub para login social
     two_factor_secret = Column(String(255), nullable=True) # Armazena o segredo para 2FA TOTP
     is_two_factor_enabled = Column(Boolean, default=False)
-    status = Column(String(50), default='active') # ex: 'active', 'blocked', 'deleted'
-    creation_date = Column(String(19), nullable=False) # Data de criação, será preenchida pelo CRUD
-    last_login = Column(String(19), nullable=True) # Último login, será preenchido pelo CRUD
+    status = Column(String(50), default='active') # ex: 'active', 'blocked', 'deleted' (aguardando a remoção em segundo plano)
+    creation_date = Column(UTCDateTime(), nullable=False) # Data de criação, será preenchida pelo CRUD
+    last_login = Column(UTCDateTime(), nullable=True) # Último login, será preenchido pelo CRUD
+    version = Column(Integer, nullable=False, default=1, server_default='1') # Incrementada a cada alteração do perfil (ETag / If-Match)
 
-    briefings = relationship("Briefing", back_populates="user")
+    # Briefings (e históricos) saem junto com o usuário, via ON DELETE CASCADE, sem carregá-los
+    briefings = relationship("Briefing", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+
+    # Listagens administrativas por status/data de criação e busca por apelido
+    __table_args__ = (
+        Index('ix_users_status_creation_date', 'status', 'creation_date'),
+        Index('ix_users_nickname', 'nickname'),
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', nickname='{self.nickname}', last_login='{self.last_login}')>"
\ No newline at end of file
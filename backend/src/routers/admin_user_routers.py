@@ -1,13 +1,16 @@
 # File: backend/src/routers/admin_user_routers.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from src.cruds import admin_user_cruds
 from src.schemas.admin_user_schemas import AdminUserCreate, AdminUserUpdate, AdminUserRead 
 from src.db.database import get_db
+from src.db.replica_routing import get_read_db
 from src.dependencies.oauth_file import get_current_user_from_token
+from src.dependencies.pagination import PageParams
+from src.dependencies.concurrency import get_expected_version, set_etag
 from src.schemas.token_schemas import TokenData # Importar TokenData para tipagem
 
 router = APIRouter(
@@ -55,9 +58,8 @@ def create_new_admin_user(
 
 @router.get("/", response_model=List[AdminUserRead]) # CORREÇÃO: response_model para List[AdminUserRead]
 def read_admin_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_admin_token: TokenData = Depends(get_current_user_from_token) # Apenas usuários autenticados como admin
 ):
     """
@@ -70,11 +72,12 @@ def read_admin_users(
     if current_admin_token.user_type != "admin":
          raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operação não permitida. Requer privilégios de administrador.")
     
-    admin_users = admin_user_cruds.get_admin_users(db, skip=skip, limit=limit)
-    return admin_users
+    admin_users = admin_user_cruds.get_admin_users(db, skip=page.skip, limit=page.fetch_limit, after_id=page.after_id)
+    return page.paginate(admin_users)
 
 @router.get("/me", response_model=AdminUserRead) # Rota para o próprio admin
 def read_admin_users_me(
+    response: Response,
     db: Session = Depends(get_db),
     current_admin_token: TokenData = Depends(get_current_user_from_token)
 ):
@@ -91,13 +94,15 @@ def read_admin_users_me(
     db_admin_user = admin_user_cruds.get_admin_user(db, admin_user_id=admin_user_id)
     if db_admin_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Administrador autenticado não encontrado.")
+    set_etag(response, db_admin_user.version)
     return db_admin_user
 
 
 @router.get("/{admin_user_id}", response_model=AdminUserRead) # CORREÇÃO: response_model para AdminUserRead
 def read_specific_admin_user(
     admin_user_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_admin_token: TokenData = Depends(get_current_user_from_token)
 ):
     """
@@ -114,6 +119,7 @@ def read_specific_admin_user(
     db_admin_user = admin_user_cruds.get_admin_user(db, admin_user_id=admin_user_id)
     if db_admin_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin Usuário não encontrado")
+    set_etag(response, db_admin_user.version)
     return db_admin_user
 
 
@@ -121,12 +127,15 @@ def read_specific_admin_user(
 def update_existing_admin_user(
     admin_user_id: int,
     admin_user: AdminUserUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_admin_token: TokenData = Depends(get_current_user_from_token)
+    current_admin_token: TokenData = Depends(get_current_user_from_token),
+    expected_version: Optional[int] = Depends(get_expected_version)
 ):
     """
     Atualiza um usuário administrador existente.
     Qualquer administrador pode atualizar o perfil de outro administrador.
+    Com 'If-Match: <ETag>' a alteração só é gravada se o perfil não mudou desde a leitura (409 caso contrário).
     """
     # Lógica de autorização: Qualquer admin pode atualizar o perfil de qualquer outro admin.
     if current_admin_token.user_type != "admin":
@@ -135,9 +144,12 @@ def update_existing_admin_user(
             detail="Não autorizado a atualizar perfis de administradores."
         )
     
-    db_admin_user = admin_user_cruds.update_admin_user(db, admin_user_id=admin_user_id, admin_user=admin_user)
+    db_admin_user = admin_user_cruds.update_admin_user(
+        db, admin_user_id=admin_user_id, admin_user=admin_user, expected_version=expected_version
+    )
     if db_admin_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin Usuário não encontrado")
+    set_etag(response, db_admin_user.version)
     return db_admin_user
 
 
@@ -6,7 +6,7 @@ from src.db.database import get_db
 from src.models.admin_user_models import AdminUser
 from src.core.security import create_access_token, verify_password
 from src.schemas.token_schemas import Token
-from datetime import datetime
+from src.utils.datetime_utils import get_current_datetime
 
 router = APIRouter(prefix="/auth/login", tags=["Admin Auth"])
 
@@ -27,7 +27,7 @@ def login_admin_user(
     }
     token = create_access_token(token_data)
 
-    admin.last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    admin.last_login = get_current_datetime()
     db.commit()
 
     return {"access_token": token, "token_type": "bearer"}
@@ -4,7 +4,7 @@ from src.db.database import get_db
 from src.models.user_models import User
 from src.schemas.token_schemas import Token
 from src.core.security import create_access_token
-from datetime import datetime
+from src.utils.datetime_utils import get_current_datetime
 
 router = APIRouter(prefix="/auth/social", tags=["Social Auth"])
 
@@ -24,7 +24,7 @@ def login_google(google_id: str, nickname: str, email: str, db: Session = Depend
             email=email,
             email_verified=True,
             status="Ativo",
-            creation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            creation_date=get_current_datetime()
         )
         db.add(user)
         db.commit()
@@ -37,7 +37,7 @@ def login_google(google_id: str, nickname: str, email: str, db: Session = Depend
         "user_type": "user"
     }
 
-    user.last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    user.last_login = get_current_datetime()
     db.commit()
 
     token = create_access_token(token_data)
@@ -57,7 +57,7 @@ def login_github(github_id: str, nickname: str, db: Session = Depends(get_db)):
             github_id=github_id,
             nickname=nickname,
             status="Ativo",
-            creation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            creation_date=get_current_datetime()
         )
         db.add(user)
         db.commit()
@@ -70,7 +70,7 @@ def login_github(github_id: str, nickname: str, db: Session = Depends(get_db)):
         "user_type": "user"
     }
 
-    user.last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    user.last_login = get_current_datetime()
     db.commit()
 
     token = create_access_token(token_data)
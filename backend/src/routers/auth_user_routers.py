@@ -6,7 +6,7 @@ from src.db.database import get_db
 from src.models.user_models import User
 from src.core.security import create_access_token, verify_password
 from src.schemas.token_schemas import Token
-from datetime import datetime
+from src.utils.datetime_utils import get_current_datetime
 
 router = APIRouter(prefix="/auth/login", tags=["User Auth"])
 
@@ -28,7 +28,7 @@ def login_common_user(
         "user_type": "user"
     }
 
-    user.last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    user.last_login = get_current_datetime()
     db.commit()
 
     token = create_access_token(token_data)
@@ -1,15 +1,22 @@
 # File: backend/src/routers/briefing_routers.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 
 from src.db.database import get_db
-from src.schemas.briefing_schemas import BriefingCreate, BriefingUpdate, BriefingRead, BriefingWithHistoryRead
+from src.db.replica_routing import get_read_db
+from src.schemas.briefing_schemas import (
+    BriefingCreate, BriefingUpdate, BriefingRead, BriefingWithHistoryRead,
+    BriefingContentPatchRead, JsonPatchOperation
+)
 from src.schemas.user_schemas import UserRead
+from src.schemas.job_schemas import JobRead
 from src.cruds import briefing_cruds
-from src.services import chat_service, compila_briefing_service
-from src.dependencies.oauth_file import get_current_user_from_token
+from src.services import chat_service, transcript_cache_service, job_queue_service, purge_service
+from src.dependencies.oauth_file import get_current_user_from_token, get_current_admin_user
+from src.dependencies.pagination import PageParams
+from src.dependencies.concurrency import get_expected_version, set_etag
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -61,30 +68,34 @@ async def create_new_briefing(
 # --- Endpoint para obter briefings de um usuário ---
 @router.get("/", response_model=List[BriefingRead])
 async def get_briefings_for_user(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_user: UserRead = Depends(get_current_user_from_token),
-    skip: int = 0,
-    limit: int = 100
+    page: PageParams = Depends()
 ):
     """
-    Retorna todos os briefings pertencentes ao usuário logado.
+    Retorna os briefings pertencentes ao usuário logado, paginados por cursor ('X-Next-Cursor').
     """
     logger.info(f"Usuário {current_user.id} solicitou listagem de briefings.")
-    briefings = briefing_cruds.get_briefings_by_user_id(db, user_id=current_user.id, skip=skip, limit=limit)
-    return briefings
+    briefings = briefing_cruds.get_briefings_by_user_id(
+        db, user_id=current_user.id, skip=page.skip, limit=page.fetch_limit, after_id=page.after_id
+    )
+    return page.paginate(briefings)
 
 # --- Endpoint para obter um briefing específico com seu histórico de conversa ---
 @router.get("/{briefing_id}", response_model=BriefingWithHistoryRead)
 async def get_single_briefing_with_history(
     briefing_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserRead = Depends(get_current_user_from_token)
+    response: Response,
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
+    current_user: UserRead = Depends(get_current_user_from_token),
+    message_limit: Optional[int] = Query(None, ge=1, description="Retorna apenas as últimas N mensagens do histórico.")
 ):
     """
-    Retorna um briefing específico pelo seu ID, incluindo todo o histórico de conversas associado.
+    Retorna um briefing específico pelo seu ID, incluindo o histórico de conversas associado
+    (completo, ou as últimas 'message_limit' mensagens).
     """
     logger.info(f"Usuário {current_user.id} solicitou briefing com ID: {briefing_id} e histórico.")
-    briefing = briefing_cruds.get_briefing_with_history(db, briefing_id)
+    briefing = briefing_cruds.get_briefing_with_history(db, briefing_id, message_limit=message_limit)
     if not briefing:
         logger.warning(f"Briefing com ID {briefing_id} não encontrado ou não pertence ao usuário {current_user.id}.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Briefing não encontrado.")
@@ -94,6 +105,7 @@ async def get_single_briefing_with_history(
         logger.warning(f"Usuário {current_user.id} tentou acessar briefing {briefing_id} de outro usuário.")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para acessar este briefing.")
     
+    set_etag(response, briefing.version)
     return briefing
 
 # --- Endpoint para enviar mensagem ao Entrevistador Pessoal e continuar o chat ---
@@ -126,56 +138,120 @@ async def chat_with_employee(
     return chat_response
 
 # --- Endpoint para acionar a compilação do Briefing pelo Assistente de Palco ---
-@router.post("/{briefing_id}/compile", response_model=Dict[str, Any])
+@router.post("/{briefing_id}/compile", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
 async def compile_briefing(
     briefing_id: int,
+    mode: Literal["auto", "single", "chunked", "incremental"] = "auto",
     db: Session = Depends(get_db),
     current_user: UserRead = Depends(get_current_user_from_token)
 ):
     """
-    Aciona o 'Assistente de Palco' para compilar o histórico de conversa
-    do briefing em um formato JSON e salvá-lo.
+    Agenda a compilação do histórico de conversa do briefing pelo 'Assistente de Palco'.
+    Retorna imediatamente (202) com a tarefa; o resultado é consultado em GET /jobs/{job_id}.
+    Solicitações repetidas para o mesmo briefing e o mesmo modo compartilham a tarefa ativa.
+    'mode=chunked' força a compilação em blocos (map-reduce) para entrevistas longas;
+    'mode=single' força a compilação completa em uma chamada (ignora a marca d'água).
     """
     logger.info(f"Usuário {current_user.id} solicitou compilação para briefing ID: {briefing_id}.")
-    
-    compilation_result = await compila_briefing_service.compile_briefing_content(
-        db=db,
-        briefing_id=briefing_id,
-        user_id=current_user.id
-    )
-    return compilation_result
+
+    briefing = briefing_cruds.get_briefing(db, briefing_id)
+    if not briefing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Briefing {briefing_id} não encontrado.")
+
+    if briefing.user_id != current_user.id:
+        logger.warning(f"Usuário {current_user.id} tentou compilar briefing {briefing_id} de outro usuário.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sem permissão para compilar este briefing.")
+
+    job = job_queue_service.submit_compile_briefing_job(db, briefing_id=briefing_id, user_id=current_user.id, mode=mode)
+    logger.info(f"Compilação do briefing {briefing_id} associada à tarefa {job.id} ({job.status}).")
+    return job
+
+# --- Endpoint para arquivar o histórico de briefings ociosos ---
+@router.post("/archive_idle_histories", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+def archive_idle_histories(
+    db: Session = Depends(get_db),
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE DISPARAR
+):
+    """
+    Dispara, em segundo plano, o arquivamento comprimido do histórico dos briefings ociosos há
+    HISTORY_ARCHIVE_IDLE_DAYS dias. As leituras do histórico continuam transparentes e o próximo
+    chat do briefing traz as mensagens de volta. O resultado fica em GET /jobs/{job_id}.
+    Rota protegida: Apenas administradores podem acessar.
+    """
+    return job_queue_service.submit_history_archive_job(db)
 
 # --- Endpoint para atualizar um Briefing (ex: status, roteiro) ---
 @router.put("/{briefing_id}", response_model=BriefingRead)
 async def update_existing_briefing(
     briefing_id: int,
     briefing_update: BriefingUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: UserRead = Depends(get_current_user_from_token)
+    current_user: UserRead = Depends(get_current_user_from_token),
+    expected_version: Optional[int] = Depends(get_expected_version)
 ):
     """
     Atualiza informações de um briefing existente.
     Pode ser usado para atualizar o 'development_roteiro' ou status.
+    Com 'If-Match: <ETag>' a alteração só é gravada se o briefing não mudou desde a leitura (409 caso contrário).
     """
     logger.info(f"Usuário {current_user.id} solicitou atualização do briefing ID: {briefing_id}.")
     
-    db_briefing = briefing_cruds.get_briefing(db, briefing_id)
-    if not db_briefing:
+    owner_id = briefing_cruds.get_briefing_owner_id(db, briefing_id)
+    if owner_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Briefing não encontrado.")
     
     # Garantir que o briefing pertence ao usuário
-    if db_briefing.user_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para atualizar este briefing.")
     
     # 'last_edited_by' será o usuário para atualizações diretas
-    updated_briefing = briefing_cruds.update_briefing(db, db_briefing.id, briefing_update, last_edited_by="user")
+    updated_briefing = briefing_cruds.update_briefing(
+        db, briefing_id, briefing_update, editor_type="user", expected_version=expected_version
+    )
     
     if not updated_briefing:
         logger.error(f"Falha inesperada ao atualizar briefing ID {briefing_id}.")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Não foi possível atualizar o briefing.")
     
+    set_etag(response, updated_briefing.version)
     return updated_briefing
 
+# --- Endpoint para alterar partes do conteúdo do Briefing (JSON Patch, RFC 6902) ---
+@router.patch("/{briefing_id}/content", response_model=BriefingContentPatchRead)
+async def patch_briefing_content(
+    briefing_id: int,
+    operations: List[JsonPatchOperation],
+    response: Response,
+    document: Literal["content", "development_roteiro"] = "content",
+    db: Session = Depends(get_db),
+    current_user: UserRead = Depends(get_current_user_from_token),
+    expected_version: Optional[int] = Depends(get_expected_version)
+):
+    """
+    Aplica um JSON Patch (lista de operações add/remove/replace/move/copy/test) ao conteúdo do briefing
+    (ou ao 'development_roteiro', com ?document=development_roteiro) sem reenviar o documento inteiro.
+    Retorna apenas os caminhos alterados, com o valor final. Um 'test' que falha ou um caminho
+    inexistente resulta em 409 e nenhuma alteração é gravada; o mesmo vale para 'If-Match' com
+    uma versão que não é mais a atual.
+    """
+    logger.info(f"Usuário {current_user.id} solicitou JSON Patch em '{document}' do briefing ID: {briefing_id}.")
+
+    owner_id = briefing_cruds.get_briefing_owner_id(db, briefing_id)
+    if owner_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Briefing não encontrado.")
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para atualizar este briefing.")
+
+    result = briefing_cruds.patch_briefing_document(
+        db, briefing_id, [operation.to_patch_dict() for operation in operations],
+        document=document, editor_type="user", expected_version=expected_version
+    )
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Briefing não encontrado.")
+    set_etag(response, result["version"])
+    return result
+
 # --- Endpoint para deletar um Briefing ---
 @router.delete("/{briefing_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_existing_briefing(
@@ -185,6 +261,8 @@ async def delete_existing_briefing(
 ):
     """
     Deleta um briefing e todo o seu histórico de conversas associado.
+    Briefings com histórico grande são excluídos logicamente (somem na hora) e o histórico
+    é removido em lotes por uma tarefa em segundo plano; a resposta não espera a remoção.
     """
     logger.info(f"Usuário {current_user.id} solicitou deleção do briefing ID: {briefing_id}.")
     
@@ -196,8 +274,14 @@ async def delete_existing_briefing(
     if db_briefing.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para deletar este briefing.")
     
-    if not briefing_cruds.delete_briefing(db, briefing_id):
+    if purge_service.needs_background_purge(db_briefing.message_count or 0):
+        if briefing_cruds.soft_delete_briefing(db, briefing_id):
+            job_queue_service.submit_purge_briefing_job(db, briefing_id=briefing_id, user_id=current_user.id)
+    elif not briefing_cruds.delete_briefing(db, briefing_id):
         logger.error(f"Falha inesperada ao deletar briefing ID {briefing_id}.")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Não foi possível deletar o briefing.")
+
+    # Libera a transcrição em cache neste worker (os demais invalidam ao validar o último id)
+    transcript_cache_service.invalidate_transcript(briefing_id)
     
     return {"message": "Briefing deletado com sucesso."}
\ No newline at end of file
@@ -1,15 +1,21 @@
 # File: backend/src/routers/employee_routers.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any # Adicionado Dict, Any para current_admin_user
+from typing import List, Dict, Any, Optional # Adicionado Dict, Any para current_admin_user
 
 from src.cruds import employee_cruds
 from src.schemas.employee_schemas import EmployeeRead, EmployeeUpdate # EmployeeCreateInternal não é mais necessário aqui
+from src.schemas.job_schemas import JobRead
 from src.db.database import get_db
+from src.db.replica_routing import get_read_db
 # from src.models.employee_models import Base, Employee # Base e Employee não são mais necessários aqui para startup_event
 from src.services import connect_ai_service # Necessário para test_ai_connections
+from src.services import job_queue_service
+from src.services.bulk_recompile_service import ASSISTANT_EMPLOYEE_NAME
 from src.dependencies.oauth_file import get_current_admin_user # Proteger as rotas de Employee
+from src.dependencies.pagination import PageParams
+from src.dependencies.concurrency import get_expected_version, set_etag
 
 # CORRIGIDO: Adicionado prefix e tags para organização da API
 router = APIRouter(
@@ -26,22 +32,22 @@ router = APIRouter(
 
 @router.get("/", response_model=List[EmployeeRead])
 def read_employees(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE VER EMPLOYEES
 ):
     """
     Retorna uma lista de todos os funcionários.
     Rota protegida: Apenas administradores podem acessar.
     """
-    employees = employee_cruds.get_all_employees(db, skip=skip, limit=limit)
-    return employees
+    employees = employee_cruds.get_all_employees(db, skip=page.skip, limit=page.fetch_limit, after_id=page.after_id)
+    return page.paginate(employees)
 
 @router.get("/{employee_id}", response_model=EmployeeRead)
 def read_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE VER EMPLOYEES
 ):
     """
@@ -51,25 +57,54 @@ def read_employee(
     db_employee = employee_cruds.get_employee_by_id(db, employee_id=employee_id)
     if db_employee is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Funcionário não encontrado")
+    set_etag(response, db_employee.version)
     return db_employee
 
 @router.put("/{employee_id}", response_model=EmployeeRead)
 def update_existing_employee(
     employee_id: int,
     employee: EmployeeUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE ATUALIZAR EMPLOYEES
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user), # APENAS ADMIN PODE ATUALIZAR EMPLOYEES
+    expected_version: Optional[int] = Depends(get_expected_version)
 ):
     """
     Atualiza um funcionário existente. O campo 'employee_name' não pode ser modificado.
+    Com 'If-Match: <ETag>' a alteração só é gravada se o funcionário não mudou desde a leitura (409 caso contrário).
     Rota protegida: Apenas administradores podem acessar.
     """
     # Use o método do crud, não um método no schema
-    db_employee = employee_cruds.update_employee(db, employee_id=employee_id, employee_update_data=employee)
+    db_employee = employee_cruds.update_employee(
+        db, employee_id=employee_id, employee_update_data=employee, expected_version=expected_version
+    )
     if db_employee is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Funcionário não encontrado")
+    set_etag(response, db_employee.version)
     return db_employee
 
+@router.post("/{employee_id}/recompile_briefings", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+def recompile_briefings_after_script_change(
+    employee_id: int,
+    db: Session = Depends(get_db),
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE DISPARAR
+):
+    """
+    Dispara, em segundo plano, a recompilação de todos os briefings compilados com uma versão
+    anterior do roteiro do 'Assistente de Palco' (ex: após um PUT /employees/{id}).
+    Retorna a tarefa; o progresso (vazão e ETA) fica em GET /jobs/{job_id}.
+    Rota protegida: Apenas administradores podem acessar.
+    """
+    db_employee = employee_cruds.get_employee_by_id(db, employee_id=employee_id)
+    if db_employee is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Funcionário não encontrado")
+    if db_employee.employee_name != ASSISTANT_EMPLOYEE_NAME:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Apenas o roteiro do '{ASSISTANT_EMPLOYEE_NAME}' é usado na compilação de briefings."
+        )
+    return job_queue_service.submit_bulk_recompile_job(db)
+
 # ROTAS POST (CRIAR) E DELETE (EXCLUIR) FORAM REMOVIDAS, CONFORME PLANO ANTERIOR.
 # Se precisar de um POST para criar, ele deve ser adicionado aqui com proteção de admin.
 
@@ -0,0 +1,87 @@
+# File: backend/src/routers/export_routers.py
+
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Literal, Optional
+import logging
+
+from src.db.replica_routing import get_read_db
+from src.dependencies.oauth_file import get_current_admin_user
+from src.services import export_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["Exports"],
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+def _streaming_response(body, export_name: str, export_format: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=export_service.EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_name}.{export_format}"'},
+    )
+
+# --- Exportação de usuários ---
+@router.get("/users")
+def export_users(
+    format: ExportFormat = "ndjson",
+    status: Optional[str] = Query(None, description="Ex: 'active', 'blocked'."),
+    created_from: Optional[datetime] = Query(None, description="Criados a partir deste instante (ISO 8601; sem fuso = UTC)."),
+    created_to: Optional[datetime] = Query(None, description="Criados antes deste instante (ISO 8601; sem fuso = UTC)."),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE EXPORTAR
+):
+    """
+    Exporta todos os usuários (sem segredos) em NDJSON ou CSV, em uma única resposta em streaming.
+    """
+    logger.info(f"Exportação de usuários solicitada ({format}, status={status}, de={created_from}, até={created_to}).")
+    body = export_service.stream_users(db, format, status=status, created_from=created_from, created_to=created_to)
+    return _streaming_response(body, "users", format)
+
+# --- Exportação de briefings ---
+@router.get("/briefings")
+def export_briefings(
+    format: ExportFormat = "ndjson",
+    status: Optional[str] = Query(None, description="Ex: 'Em Construção', 'Compilado'."),
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="Criados a partir deste instante (ISO 8601; sem fuso = UTC)."),
+    created_to: Optional[datetime] = Query(None, description="Criados antes deste instante (ISO 8601; sem fuso = UTC)."),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE EXPORTAR
+):
+    """
+    Exporta os briefings (com 'content' e 'development_roteiro') em NDJSON ou CSV, em streaming.
+    """
+    logger.info(f"Exportação de briefings solicitada ({format}, status={status}, user_id={user_id}, de={created_from}, até={created_to}).")
+    body = export_service.stream_briefings(
+        db, format, status=status, user_id=user_id, created_from=created_from, created_to=created_to
+    )
+    return _streaming_response(body, "briefings", format)
+
+# --- Exportação dos históricos de conversa ---
+@router.get("/conversation_histories")
+def export_conversation_histories(
+    format: ExportFormat = "ndjson",
+    briefing_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="Mensagens a partir deste instante (ISO 8601; sem fuso = UTC)."),
+    created_to: Optional[datetime] = Query(None, description="Mensagens antes deste instante (ISO 8601; sem fuso = UTC)."),
+    include_archived: bool = Query(True, description="Inclui as mensagens dos históricos arquivados."),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE EXPORTAR
+):
+    """
+    Exporta as mensagens dos históricos de conversa em NDJSON ou CSV, em streaming.
+    """
+    logger.info(f"Exportação de históricos solicitada ({format}, briefing_id={briefing_id}, de={created_from}, até={created_to}).")
+    body = export_service.stream_conversation_histories(
+        db, format, briefing_id=briefing_id, created_from=created_from, created_to=created_to,
+        include_archived=include_archived
+    )
+    return _streaming_response(body, "conversation_histories", format)
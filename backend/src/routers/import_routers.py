@@ -0,0 +1,48 @@
+# File: backend/src/routers/import_routers.py
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from typing import Any, Dict
+import logging
+
+from src.db.database import get_db
+from src.dependencies.oauth_file import get_current_admin_user
+from src.schemas.import_schemas import ImportReport
+from src.services import bulk_import_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["Imports"],
+)
+
+# --- Importação em massa de usuários (migração do sistema antigo) ---
+@router.post("/users", response_model=ImportReport)
+async def import_users(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE IMPORTAR
+):
+    """
+    Recebe um NDJSON (Content-Type: application/x-ndjson), um usuário por linha, com 'password'
+    em texto ou 'password_hash' bcrypt. Linhas inválidas ou duplicadas não impedem as demais:
+    o relatório traz, por linha, o motivo de cada falha.
+    """
+    logger.info("Importação em massa de usuários iniciada.")
+    return await bulk_import_service.import_users(db, request.stream())
+
+# --- Importação em massa de briefings ---
+@router.post("/briefings", response_model=ImportReport)
+async def import_briefings(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE IMPORTAR
+):
+    """
+    Recebe um NDJSON, um briefing por linha, com o dono em 'user_id' ou 'user_email'.
+    Retorna o relatório por linha, como em /imports/users.
+    """
+    logger.info("Importação em massa de briefings iniciada.")
+    return await bulk_import_service.import_briefings(db, request.stream())
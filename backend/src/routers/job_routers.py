@@ -0,0 +1,41 @@
+# File: backend/src/routers/job_routers.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+import logging
+
+from src.db.database import get_db
+from src.db.replica_routing import get_read_db
+from src.cruds import job_cruds
+from src.schemas.job_schemas import JobRead
+from src.schemas.token_schemas import TokenData
+from src.dependencies.oauth_file import get_current_user_from_token
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+)
+
+# --- Endpoint para consultar o status/resultado de uma tarefa assíncrona ---
+@router.get("/{job_id}", response_model=JobRead)
+def read_job(
+    job_id: int,
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
+    current_user: TokenData = Depends(get_current_user_from_token)
+):
+    """
+    Retorna o status de uma tarefa e, quando concluída, o seu resultado ou erro.
+    Usuários comuns só enxergam as próprias tarefas; administradores enxergam todas.
+    """
+    job = job_cruds.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada.")
+
+    if current_user.user_type != "admin" and job.user_id != current_user.id:
+        logger.warning(f"Usuário {current_user.id} tentou acessar a tarefa {job_id} de outro usuário.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para acessar esta tarefa.")
+
+    return job
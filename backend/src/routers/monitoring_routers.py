@@ -0,0 +1,68 @@
+# File: backend/src/routers/monitoring_routers.py
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from typing import Any, Dict
+import logging
+
+from src.core.config import settings
+from src.db import sqlite_profile
+from src.db.database import get_engine, readiness
+from src.db.pool_metrics import pool_metrics
+from src.db.replica_routing import replica_router
+from src.dependencies.oauth_file import get_current_admin_user
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/monitoring",
+    tags=["Monitoring"],
+)
+
+# --- Sondas de liveness/readiness (sem autenticação; usadas pelo orquestrador/balanceador) ---
+@router.get("/live")
+def read_liveness():
+    """
+    O processo está de pé e atendendo (não depende do banco).
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def read_readiness():
+    """
+    200 quando a conexão inicial com o banco foi estabelecida;
+    503 enquanto o startup ainda tenta conectar (com o número de tentativas e o tipo do último erro).
+    """
+    data = readiness.snapshot()
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=data)
+
+
+# --- Endpoint com as métricas do pool de conexões do banco ---
+@router.get("/db_pool")
+def read_db_pool_metrics(
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE VER MÉTRICAS
+):
+    """
+    Retorna o estado do pool de conexões (em uso, overflow, tamanho) e os contadores
+    acumulados de checkouts, timeouts e tempo de espera por uma conexão livre.
+    No perfil SQLite, inclui a fila de escrita (escritas, em espera, tempo de espera pela vez).
+    """
+    engine = get_engine()
+    data = pool_metrics.snapshot(engine)
+    if settings.SQLITE_PROFILE_ENABLED and sqlite_profile.is_file_database(str(engine.url)):
+        data["sqlite_write_queue"] = sqlite_profile.write_queue.snapshot()
+    return data
+
+
+# --- Endpoint com o estado das réplicas de leitura ---
+@router.get("/db_replicas")
+def read_db_replicas_status(
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE VER MÉTRICAS
+):
+    """
+    Retorna, para cada réplica configurada, se está no rodízio e as métricas do seu pool.
+    As URLs não são expostas (contêm credenciais).
+    """
+    return replica_router.status()
@@ -0,0 +1,48 @@
+# File: backend/src/routers/search_routers.py
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Literal, Optional
+import logging
+
+from src.core.config import settings
+from src.db.replica_routing import get_read_db
+from src.dependencies.oauth_file import get_current_admin_user
+from src.dependencies.pagination import NEXT_CURSOR_HEADER, decode_rank_cursor, encode_rank_cursor
+from src.schemas.search_schemas import SearchResults
+from src.services import search_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"],
+)
+
+# --- Busca textual nas entrevistas e nos briefings compilados ---
+@router.get("/", response_model=SearchResults)
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=500, description="Palavras buscadas (todas obrigatórias); 'termo*' busca por prefixo."),
+    scope: Literal["all", "messages", "briefings"] = "all",
+    briefing_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description="Cursor retornado em 'next_cursor' pela página anterior."),
+    limit: int = Query(20, ge=1, description="Itens por página (limitado por PAGE_SIZE_MAX)."),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
+    current_admin_user: Dict[str, Any] = Depends(get_current_admin_user) # APENAS ADMIN PODE BUSCAR
+):
+    """
+    Busca nas mensagens das entrevistas (inclusive as arquivadas) e no conteúdo compilado dos
+    briefings, do resultado mais relevante para o menos relevante, com o trecho encontrado destacado.
+    """
+    limit = min(limit, settings.PAGE_SIZE_MAX)
+    after = decode_rank_cursor(cursor) if cursor else None
+    hits = search_service.search(db, q, scope=scope, briefing_id=briefing_id, user_id=user_id, limit=limit + 1, after=after)
+
+    page, next_cursor = hits[:limit], None
+    if len(hits) > limit:
+        next_cursor = encode_rank_cursor(page[-1]["score"], page[-1]["document_id"])
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return {"items": page, "next_cursor": next_cursor}
@@ -1,14 +1,18 @@
 # File: backend/src/routers/user_routers.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from src.cruds import user_cruds as crud_user
+from src.cruds import briefing_cruds, user_cruds as crud_user
 from src.schemas.user_schemas import UserCreate, UserUpdate, UserRead
 from src.db.database import get_db
+from src.db.replica_routing import get_read_db
 from src.dependencies.oauth_file import get_current_admin_user, get_current_common_user
+from src.dependencies.pagination import PageParams
+from src.dependencies.concurrency import get_expected_version, set_etag
 from src.models.user_models import User
+from src.services import job_queue_service, purge_service
 
 router = APIRouter(
     prefix="/users",
@@ -29,42 +33,45 @@ def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
 # --- Lista de usuarios (apenas admin) ---
 @router.get("/", response_model=List[UserRead])
 def read_users(
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_admin: User = Depends(get_current_admin_user)
 ):
-    users = crud_user.get_users(db, skip=skip, limit=limit)
-    return users
+    users = crud_user.get_users(db, skip=page.skip, limit=page.fetch_limit, after_id=page.after_id)
+    return page.paginate(users)
 
 # --- Leitura do proprio perfil (/users/me) ---
 @router.get("/me", response_model=UserRead)
 def read_own_profile(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_common_user)
 ):
-    db_user = crud_user.get_user(db, user_id=current_user.id)
-    if db_user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário autenticado não encontrado.")
-    return db_user
+    # 'current_user' já vem da mesma sessão (carregado na validação do token): sem nova consulta
+    set_etag(response, current_user.version)
+    return current_user
 
 # --- Atualizacao do proprio perfil (/users/me) ---
 @router.put("/me", response_model=UserRead)
 def update_own_profile(
     user: UserUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_common_user)
+    current_user: User = Depends(get_current_common_user),
+    expected_version: Optional[int] = Depends(get_expected_version)
 ):
-    db_user = crud_user.update_user(db, user_id=current_user.id, user=user)
+    db_user = crud_user.update_user(db, user_id=current_user.id, user=user, expected_version=expected_version)
     if db_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
+    set_etag(response, db_user.version)
     return db_user
 
 # --- Leitura de usuario especifico (admin ou self) ---
 @router.get("/{user_id}", response_model=UserRead)
 def read_specific_user(
     user_id: int, 
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db), # Somente leitura: pode ir para uma réplica
     current_user: User = Depends(get_current_common_user)
 ):
     if current_user.id != user_id:
@@ -73,6 +80,7 @@ def read_specific_user(
     db_user = crud_user.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
+    set_etag(response, db_user.version)
     return db_user
 
 # --- Atualizacao de outro usuario (apenas admin) ---
@@ -80,12 +88,15 @@ def read_specific_user(
 def update_existing_user(
     user_id: int,
     user: UserUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: User = Depends(get_current_admin_user),
+    expected_version: Optional[int] = Depends(get_expected_version)
 ):
-    db_user = crud_user.update_user(db, user_id=user_id, user=user)
+    db_user = crud_user.update_user(db, user_id=user_id, user=user, expected_version=expected_version)
     if db_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
+    set_etag(response, db_user.version)
     return db_user
 
 # --- Exclusao de usuario (apenas admin) ---
@@ -99,6 +110,14 @@ def delete_existing_user(
     if db_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
 
-    deleted = crud_user.delete_user(db, user_id=user_id)
+    # Usuários com muito histórico: exclusão lógica agora, remoção em lotes em segundo plano
+    _, message_count = briefing_cruds.get_user_briefing_totals(db, user_id)
+    if purge_service.needs_background_purge(message_count):
+        # Repetir a exclusão de um usuário já marcado só reaproveita a tarefa ativa (deduplicada)
+        crud_user.soft_delete_user(db, user_id=user_id)
+        job_queue_service.submit_purge_user_job(db, user_id=user_id)
+        deleted = True
+    else:
+        deleted = crud_user.delete_user(db, user_id=user_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Falha ao deletar o usuário.")
@@ -3,6 +3,7 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from src.utils.validate_password import validate_password_complexity
+from src.utils.datetime_utils import DateTimeStr
 
 # Esquema Base para AdminUser
 class AdminUserBase(BaseModel):
@@ -36,8 +37,8 @@ class AdminUserUpdate(BaseModel):
 # CORREÇÃO: Renomeado AdminUserInDB para AdminUserRead para clareza
 class AdminUserRead(AdminUserBase):
     id: int
-    creation_date: str # Conforme o modelo (String(19))
-    last_login: Optional[str] = None # Conforme o modelo (String(19))
+    creation_date: DateTimeStr # DATETIME no banco, 'DD/MM/YYYY HH:MM:SS' na API
+    last_login: Optional[DateTimeStr] = None
     
     # Estes campos são para uso interno ou para o próprio admin ao gerenciar seu perfil
     two_factor_secret: Optional[str] = None # O segredo pode ser nulo se 2FA não ativado
@@ -1,11 +1,12 @@
 # File: backend/src/schemas/briefing_schemas.py
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, model_validator
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime # Esta importação não é mais usada para tipagem de campos, mas pode ser útil para funções de data.
 
 # Importar o schema de histórico de conversas
 from src.schemas.conversation_history_schemas import ConversationHistoryRead 
+from src.utils.datetime_utils import DateTimeStr
 
 # Reutilizando os Schemas existentes
 class BriefingBase(BaseModel):
@@ -26,12 +27,34 @@ class BriefingUpdate(BaseModel):
     # será preenchido automaticamente pelo backend.
 
 
+# Esquema de cada linha da importação em massa (POST /imports/briefings)
+class BriefingImport(BriefingBase):
+    """
+    O dono é indicado por 'user_id' ou, vindo do sistema antigo, por 'user_email'.
+    Campos desconhecidos são ignorados (a saída de GET /exports/briefings pode ser reimportada).
+    """
+    user_id: Optional[int] = None
+    user_email: Optional[EmailStr] = None
+    development_roteiro: Optional[Dict[str, Any]] = None
+    creation_date: Optional[datetime] = None
+    update_date: Optional[datetime] = None
+
+    @model_validator(mode='after')
+    def validate_owner(self) -> 'BriefingImport':
+        if self.user_id is None and not self.user_email:
+            raise ValueError('Informe user_id ou user_email do dono do briefing.')
+        return self
+
+
 class BriefingRead(BriefingBase):
     id: int
     user_id: int
-    creation_date: str # Mudado para str para corresponder ao modelo do DB
-    update_date: Optional[str] = None # Mudado para str
+    creation_date: DateTimeStr # DATETIME no banco, 'DD/MM/YYYY HH:MM:SS' na API
+    update_date: Optional[DateTimeStr] = None
     last_edited_by: Optional[str] = None
+    message_count: int = 0 # Mensagens no histórico (inclusive arquivadas)
+    last_message_at: Optional[DateTimeStr] = None
+    last_sender: Optional[str] = None
     # >>> NOVIDADE: Adicionado development_roteiro ao schema de leitura <<<\n
     development_roteiro: Optional[Dict[str, Any]] = None
 
@@ -41,4 +64,35 @@ class BriefingRead(BriefingBase):
 
 # NOVO SCHEMA: Briefing com histórico de conversas
 class BriefingWithHistoryRead(BriefingRead):
-    conversation_history: List[ConversationHistoryRead] = []
\ No newline at end of file
+    # Lido da relação 'conversation_histories' do modelo (já carregada pelo CRUD), ou de
+    # 'conversation_history' quando o CRUD junta mensagens arquivadas
+    conversation_history: List[ConversationHistoryRead] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices("conversation_history", "conversation_histories")
+    )
+
+
+# JSON Patch (RFC 6902) do conteúdo do briefing
+class JsonPatchOperation(BaseModel):
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Any = None
+    from_: Optional[str] = Field(default=None, alias="from")
+
+    def to_patch_dict(self) -> Dict[str, Any]:
+        # 'value' só vai para o patch quando enviado (null é um valor válido em 'add'/'replace')
+        return self.model_dump(by_alias=True, exclude_unset=True)
+
+
+class JsonPatchChange(BaseModel):
+    path: str
+    op: Literal["set", "remove"]
+    value: Any = None
+
+
+class BriefingContentPatchRead(BaseModel):
+    id: int
+    update_date: Optional[DateTimeStr] = None
+    version: int # Nova versão do briefing (também no cabeçalho ETag)
+    changes: List[JsonPatchChange] # Apenas os caminhos alterados, com o valor final
+
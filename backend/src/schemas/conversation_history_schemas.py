@@ -3,6 +3,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any # Dict e Any são usados em BriefingRequest, não diretamente nos schemas de history
 from datetime import datetime # Importação não utilizada diretamente para tipagem dos campos.
+from src.utils.datetime_utils import DateTimeStr
 
 class ConversationHistoryBase(BaseModel):
     sender_type: str = Field(..., max_length=30, description="Tipo do remetente: 'User.nickname' ou Employee.employee_name(ex: 'Entrevistador Pessoal').")
@@ -14,7 +15,7 @@ class ConversationHistoryCreate(ConversationHistoryBase):
 class ConversationHistoryRead(ConversationHistoryBase): # Usado para leitura (resposta da API)
     id: int
     briefing_id: int
-    timestamp: str # Mudado para str para corresponder ao modelo do DB
+    timestamp: DateTimeStr # DATETIME no banco, 'DD/MM/YYYY HH:MM:SS' na API
 
     class Config:
         from_attributes = True
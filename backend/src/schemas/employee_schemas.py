@@ -2,6 +2,7 @@
 
 from pydantic import BaseModel, Field
 from typing import Optional, Any
+from src.utils.datetime_utils import DateTimeStr
 
 class EmployeeRead(BaseModel):
     id: int
@@ -12,7 +13,7 @@ class EmployeeRead(BaseModel):
     endpoint_key: str
     headers_template: Any
     body_template: Any
-    last_update: Optional[str] = None
+    last_update: Optional[DateTimeStr] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,17 @@
+# File: backend/src/schemas/import_schemas.py
+
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    line: int # Linha do NDJSON enviado (começando em 1)
+    error: str
+
+class ImportReport(BaseModel):
+    received: int # Linhas não vazias lidas
+    imported: int
+    failed: int
+    errors: List[ImportRowError] # Até IMPORT_MAX_REPORTED_ERRORS erros, em ordem de linha
+    errors_truncated: bool = False
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,21 @@
+# File: backend/src/schemas/job_schemas.py
+
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from src.utils.datetime_utils import DateTimeStr
+
+class JobRead(BaseModel):
+    id: int
+    job_type: str
+    status: str # 'pending', 'running', 'succeeded', 'failed'
+    attempts: int
+    max_attempts: int
+    payload: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    creation_date: DateTimeStr
+    update_date: Optional[DateTimeStr] = None
+    finished_date: Optional[DateTimeStr] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,17 @@
+# File: backend/src/schemas/search_schemas.py
+
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+class SearchHit(BaseModel):
+    source_type: Literal["message", "briefing"] # Mensagem do chat ou conteúdo compilado do briefing
+    source_id: int # conversation_histories.id ou briefings.id
+    briefing_id: int
+    briefing_title: str
+    user_id: int
+    score: float # Relevância (maior = mais relevante); só comparável dentro da mesma busca
+    snippet: str # Trecho em HTML escapado, com os termos em <mark>
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None # Também no cabeçalho 'X-Next-Cursor'; ausente na última página
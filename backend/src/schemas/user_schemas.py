@@ -1,9 +1,11 @@
 # File: backend/src/schemas/user_schemas.py
 
 from pydantic import BaseModel, EmailStr, Field, model_validator, field_validator
+from datetime import datetime
 from typing import Optional
 from src.utils.validate_password import validate_password_complexity
 from src.utils.validate_phone_number import validate_phone_number_format
+from src.utils.datetime_utils import DateTimeStr
 
 class UserBase(BaseModel):
     nickname: str = Field(..., min_length=3, max_length=255)
@@ -57,14 +59,53 @@ class UserUpdate(UserBase):
             return validate_password_complexity(value)
         return value
 
+# Esquema de cada linha da importação em massa (POST /imports/users)
+class UserImport(UserBase):
+    """
+    Aceita a senha em texto ('password', validada e convertida em hash na importação) ou já em
+    hash bcrypt ('password_hash', vindo do sistema antigo). Campos desconhecidos são ignorados,
+    então a saída de GET /exports/users pode ser reimportada.
+    """
+    password: Optional[str] = Field(None, min_length=6, max_length=255)
+    password_hash: Optional[str] = Field(None, max_length=255)
+    email_verified: bool = False
+    status: str = Field(default="active", max_length=50)
+    creation_date: Optional[datetime] = None
+
+    @field_validator('password')
+    @classmethod
+    def validate_import_password(cls, value: Optional[str]) -> Optional[str]:
+        if value:
+            return validate_password_complexity(value)
+        return value
+
+    @field_validator('password_hash')
+    @classmethod
+    def validate_import_password_hash(cls, value: Optional[str]) -> Optional[str]:
+        if value and not value.startswith(("$2a$", "$2b$", "$2y$")):
+            raise ValueError('password_hash deve ser um hash bcrypt.')
+        return value
+
+    @model_validator(mode='after')
+    def validate_import_logic(self) -> 'UserImport':
+        if self.password and self.password_hash:
+            raise ValueError('Informe apenas um entre password e password_hash.')
+        if self.google_id or self.github_id:
+            return self
+        if not self.email and not self.phone_number:
+            raise ValueError('Pelo menos um email ou um número de telefone deve ser fornecido para o cadastro manual.')
+        if not self.password and not self.password_hash:
+            raise ValueError('Senha (password ou password_hash) obrigatória no cadastro manual.')
+        return self
+
 # Esquema para leitura de usuário (saída da API)
 class UserRead(UserBase):
     id: int
     email_verified: bool
     is_two_factor_enabled: bool
     status: str
-    creation_date: str
-    last_login: Optional[str] = None
+    creation_date: DateTimeStr
+    last_login: Optional[DateTimeStr] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,246 @@
+# File: backend/src/services/bulk_import_service.py
+#
+# Importação em massa (NDJSON, um objeto por linha) de usuários e briefings.
+# O corpo é lido em streaming e processado em lotes de IMPORT_CHUNK_SIZE linhas: validação
+# (schemas UserImport/BriefingImport), checagem de unicidade com uma consulta por lote,
+# hashes bcrypt em paralelo (IMPORT_HASH_WORKERS threads) e um único INSERT multi-linha
+# com commit por lote. Linhas inválidas entram no relatório e não impedem as demais.
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.security import get_password_hash
+from src.cruds import briefing_cruds, user_cruds
+from src.schemas.briefing_schemas import BriefingImport
+from src.schemas.user_schemas import UserImport
+from src.utils.datetime_utils import get_current_datetime
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo de uma linha do NDJSON (um briefing com conteúdo grande cabe com folga)
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+Line = Tuple[int, bytes]
+
+_hash_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=max(1, settings.IMPORT_HASH_WORKERS), thread_name_prefix="import-hash")
+    return _hash_pool
+
+
+async def _hash_passwords(passwords: List[Optional[str]]) -> List[Optional[str]]:
+    """
+    Hashes bcrypt calculados em paralelo no pool de threads (o bcrypt libera o GIL).
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_hash_pool()
+    pending = {index: loop.run_in_executor(pool, get_password_hash, password) for index, password in enumerate(passwords) if password}
+    hashes = dict(zip(pending, await asyncio.gather(*pending.values())))
+    return [hashes.get(index) for index in range(len(passwords))]
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[Line]:
+    """
+    Linhas não vazias do corpo, com o número da linha (a partir de 1), sem ler o corpo inteiro.
+    """
+    buffer = b""
+    line_number = 0
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line_number += 1
+            if raw.strip():
+                yield line_number, raw
+        if len(buffer) > MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Linha {line_number + 1} excede {MAX_LINE_BYTES} bytes."
+            )
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def _iter_chunks(stream: AsyncIterator[bytes]) -> AsyncIterator[List[Line]]:
+    chunk_size = max(1, settings.IMPORT_CHUNK_SIZE)
+    chunk: List[Line] = []
+    async for line in _iter_lines(stream):
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _fail(report: Dict[str, Any], line: int, error: str) -> None:
+    report["failed"] += 1
+    if len(report["errors"]) < settings.IMPORT_MAX_REPORTED_ERRORS:
+        report["errors"].append({"line": line, "error": error})
+    else:
+        report["errors_truncated"] = True
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+def _validate(chunk: List[Line], schema: Any, report: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    records = []
+    for line, raw in chunk:
+        try:
+            records.append((line, schema.model_validate_json(raw)))
+        except ValidationError as e:
+            _fail(report, line, _validation_message(e))
+    return records
+
+
+def _insert_chunk(
+    db: Session,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    insert_rows: Callable[[Session, List[Dict[str, Any]]], None],
+    report: Dict[str, Any]
+) -> None:
+    """
+    Insere o lote em um único INSERT multi-linha e faz o commit. Se uma escrita concorrente
+    provocar conflito de unicidade, o lote é refeito linha a linha (cada uma em um savepoint)
+    para apontar no relatório exatamente quais linhas falharam.
+    """
+    if rows:
+        try:
+            with db.begin_nested():
+                insert_rows(db, [row for _, row in rows])
+            report["imported"] += len(rows)
+        except IntegrityError:
+            logger.warning("Conflito de unicidade no INSERT do lote; reinserindo linha a linha.")
+            for line, row in rows:
+                try:
+                    with db.begin_nested():
+                        insert_rows(db, [row])
+                    report["imported"] += 1
+                except IntegrityError as e:
+                    _fail(report, line, f"Conflito de dados únicos: {e.orig}")
+    db.commit()
+
+
+async def _import_user_chunk(db: Session, chunk: List[Line], report: Dict[str, Any]) -> None:
+    records = _validate(chunk, UserImport, report)
+
+    # Unicidade contra o banco (uma consulta por lote) e entre as linhas do próprio lote
+    taken = user_cruds.get_taken_user_identifiers(db, {
+        field: [getattr(record, field) for _, record in records if getattr(record, field)]
+        for field in user_cruds.USER_UNIQUE_FIELDS
+    })
+    accepted = []
+    for line, record in records:
+        clash = next((field for field in user_cruds.USER_UNIQUE_FIELDS if getattr(record, field) in taken[field]), None)
+        if clash:
+            _fail(report, line, f"{clash} já registrado por outro usuário.")
+            continue
+        for field in user_cruds.USER_UNIQUE_FIELDS:
+            if getattr(record, field):
+                taken[field].add(getattr(record, field))
+        accepted.append((line, record))
+
+    hashes = await _hash_passwords([record.password for _, record in accepted])
+    now = get_current_datetime()
+    rows = [
+        (line, {
+            "nickname": record.nickname,
+            "email": record.email,
+            "email_verified": record.email_verified,
+            "phone_number": record.phone_number,
+            "password_hash": password_hash or record.password_hash,
+            "google_id": record.google_id,
+            "github_id": record.github_id,
+            "is_two_factor_enabled": False,
+            "status": record.status,
+            "creation_date": record.creation_date or now,
+            "version": 1,
+        })
+        for (line, record), password_hash in zip(accepted, hashes)
+    ]
+    _insert_chunk(db, rows, user_cruds.insert_users, report)
+
+
+async def _import_briefing_chunk(db: Session, chunk: List[Line], report: Dict[str, Any]) -> None:
+    records = _validate(chunk, BriefingImport, report)
+
+    # Dono: por id ou pelo email do sistema antigo (uma consulta por lote para cada forma)
+    ids_by_email = user_cruds.get_user_ids_by_emails(db, [record.user_email for _, record in records if record.user_id is None])
+    known_ids = user_cruds.get_existing_user_ids(db, [record.user_id for _, record in records if record.user_id is not None])
+    owned = []
+    for line, record in records:
+        user_id = record.user_id if record.user_id is not None else ids_by_email.get(record.user_email)
+        if user_id is None or (record.user_id is not None and user_id not in known_ids):
+            _fail(report, line, "Usuário dono do briefing não encontrado.")
+            continue
+        owned.append((line, user_id, record))
+
+    taken = briefing_cruds.get_taken_briefing_titles(db, [(user_id, record.title) for _, user_id, record in owned])
+    now = get_current_datetime()
+    rows = []
+    for line, user_id, record in owned:
+        if (user_id, record.title) in taken:
+            _fail(report, line, "Já existe um briefing com este título para este usuário.")
+            continue
+        taken.add((user_id, record.title))
+        rows.append((line, {
+            "user_id": user_id,
+            "title": record.title,
+            "status": record.status,
+            "content": record.content,
+            "development_roteiro": record.development_roteiro,
+            "creation_date": record.creation_date or now,
+            "update_date": record.update_date,
+            "last_edited_by": "admin",
+            "version": 1,
+        }))
+    _insert_chunk(db, rows, briefing_cruds.insert_briefings, report)
+
+
+async def _run_import(db: Session, stream: AsyncIterator[bytes], entity: str, import_chunk) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"received": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    started_at = time.monotonic()
+    async for chunk in _iter_chunks(stream):
+        report["received"] += len(chunk)
+        await import_chunk(db, chunk, report)
+        logger.info(f"Importação de {entity}: {report['imported']} inserido(s), {report['failed']} com erro, de {report['received']} linha(s).")
+
+    elapsed = time.monotonic() - started_at
+    report["errors"].sort(key=lambda item: item["line"])
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["imported"] / elapsed, 1) if elapsed > 0 else 0.0
+    logger.info(f"Importação de {entity} concluída em {report['elapsed_seconds']}s ({report['rows_per_second']} linhas/s).")
+    return report
+
+
+async def import_users(db: Session, stream: AsyncIterator[bytes]) -> Dict[str, Any]:
+    """
+    Importa usuários de um corpo NDJSON (um UserImport por linha). Retorna o relatório (ImportReport).
+    """
+    return await _run_import(db, stream, "usuários", _import_user_chunk)
+
+
+async def import_briefings(db: Session, stream: AsyncIterator[bytes]) -> Dict[str, Any]:
+    """
+    Importa briefings de um corpo NDJSON (um BriefingImport por linha). Retorna o relatório (ImportReport).
+    """
+    return await _run_import(db, stream, "briefings", _import_briefing_chunk)
@@ -0,0 +1,132 @@
+# File: backend/src/services/bulk_recompile_service.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+from src.cruds import briefing_cruds, employee_cruds, job_cruds
+from src.db.database import SessionLocal
+from src.services import compila_briefing_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ASSISTANT_EMPLOYEE_NAME = "Assistente de Palco"
+
+# Quantos ids com falha são guardados no progresso (o total fica em 'failed')
+MAX_REPORTED_FAILURES = 100
+
+
+def _open_worker_session(db: Session) -> Session:
+    """
+    Sessão própria para cada recompilação concorrente, no mesmo bind da sessão da tarefa.
+    """
+    return SessionLocal(bind=db.get_bind(), join_transaction_mode="create_savepoint")
+
+
+def _report(progress: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+    """
+    Atualiza as métricas de vazão (briefings/minuto) e ETA do progresso.
+    """
+    done = progress["succeeded"] + progress["failed"]
+    remaining = max(0, progress["total"] - done)
+    rate = done / elapsed if elapsed > 0 else 0.0
+    progress["processed"] = done
+    progress["elapsed_seconds"] = round(elapsed, 2)
+    progress["briefings_per_minute"] = round(rate * 60, 2)
+    progress["eta_seconds"] = round(remaining / rate, 1) if rate > 0 else None
+    return progress
+
+
+async def _recompile_one(db: Session, briefing_id: int, user_id: int) -> Optional[str]:
+    """
+    Recompila um briefing por completo (o roteiro mudou, então a marca d'água não vale).
+    Retorna a descrição do erro, ou None em caso de sucesso.
+    """
+    worker_db = _open_worker_session(db)
+    try:
+        await compila_briefing_service.compile_briefing_content(worker_db, briefing_id, user_id, mode="auto")
+        return None
+    except HTTPException as e:
+        worker_db.rollback()
+        return f"{e.status_code}: {e.detail}"
+    except Exception as e:
+        worker_db.rollback()
+        return str(e) or e.__class__.__name__
+    finally:
+        worker_db.close()
+
+
+async def run_bulk_recompile(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recompila todos os briefings compilados com uma versão antiga do roteiro do 'Assistente de Palco'.
+    O scan é por keyset (id > último id processado), em páginas de BULK_RECOMPILE_PAGE_SIZE, e cada
+    página é processada por até BULK_RECOMPILE_CONCURRENCY recompilações simultâneas. Ao fim de
+    cada página o progresso é gravado na tarefa, e uma nova execução (retry ou reinício do processo)
+    retoma a partir dele. Briefings já recompilados deixam de ser selecionados pelo filtro de versão.
+    """
+    job = job_cruds.get_job(db, payload["job_id"])
+    assistant_employee = employee_cruds.get_employee_by_name(db, ASSISTANT_EMPLOYEE_NAME)
+    if not assistant_employee:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Personagem '{ASSISTANT_EMPLOYEE_NAME}' não encontrado.")
+    script_version = compila_briefing_service.get_script_version(assistant_employee.employee_script)
+
+    checkpoint = job.result if isinstance(job.result, dict) and job.result.get("script_version") == script_version else None
+    if checkpoint:
+        progress = dict(checkpoint)
+        logger.info(f"Recompilação em massa retomada após o briefing {progress['last_id']} ({progress['processed']}/{progress['total']}).")
+    else:
+        progress = {
+            "script_version": script_version,
+            "last_id": 0,
+            "total": briefing_cruds.count_stale_compiled_briefings(db, script_version),
+            "succeeded": 0,
+            "failed": 0,
+            "failed_ids": [],
+            "elapsed_seconds": 0.0,
+        }
+        logger.info(f"Recompilação em massa iniciada: {progress['total']} briefing(s) desatualizado(s).")
+
+    concurrency = max(1, settings.BULK_RECOMPILE_CONCURRENCY)
+    page_size = max(1, settings.BULK_RECOMPILE_PAGE_SIZE)
+    semaphore = asyncio.Semaphore(concurrency)
+    elapsed_before = float(progress.get("elapsed_seconds") or 0.0)
+    started_at = time.monotonic()
+
+    async def run_limited(briefing_id: int, user_id: int) -> Tuple[int, Optional[str]]:
+        async with semaphore:
+            return briefing_id, await _recompile_one(db, briefing_id, user_id)
+
+    while True:
+        page: List[Tuple[int, int]] = briefing_cruds.get_stale_compiled_briefings(
+            db, script_version, after_id=progress["last_id"], limit=page_size
+        )
+        if not page:
+            break
+
+        for briefing_id, error in await asyncio.gather(*(run_limited(b_id, u_id) for b_id, u_id in page)):
+            if error is None:
+                progress["succeeded"] += 1
+            else:
+                progress["failed"] += 1
+                if len(progress["failed_ids"]) < MAX_REPORTED_FAILURES:
+                    progress["failed_ids"].append(briefing_id)
+                logger.warning(f"Recompilação do briefing {briefing_id} falhou: {error}")
+
+        progress["last_id"] = page[-1][0]
+        progress["total"] = max(progress["total"], progress["succeeded"] + progress["failed"])
+        _report(progress, elapsed_before + time.monotonic() - started_at)
+        job = job_cruds.save_job_checkpoint(db, job, dict(progress))
+        logger.info(
+            f"Recompilação em massa: {progress['processed']}/{progress['total']} "
+            f"({progress['briefings_per_minute']} briefings/min, ETA {progress['eta_seconds']}s)."
+        )
+
+    progress = _report(progress, elapsed_before + time.monotonic() - started_at)
+    progress["eta_seconds"] = 0
+    logger.info(f"Recompilação em massa concluída: {progress['succeeded']} ok, {progress['failed']} com falha.")
+    return progress
@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from src.cruds import employee_cruds, briefing_cruds, conversation_history_cruds, user_cruds
 from src.schemas.conversation_history_schemas import ConversationHistoryCreate
 from src.services.connect_ai_service import call_external_ai_api
+from src.services import transcript_cache_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -51,17 +52,21 @@ async def start_or_continue_chat(
         logger.error(f"Script inválido para '{employee_name}'.")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Script inválido para '{employee_name}'.")
 
+    # --- Histórico arquivado (briefing ocioso) volta para a tabela antes do novo turno ---
+    conversation_history_cruds.restore_briefing_history(db, briefing_id)
+
     # --- Registrar mensagem do usuário ---
     user_entry = ConversationHistoryCreate(
         briefing_id=briefing_id,
         sender_type=user_nickname,
         message_content=user_message_content
     )
-    conversation_history_cruds.create_conversation_entry(db, user_entry)
+    db_user_entry = conversation_history_cruds.create_conversation_entry(db, user_entry)
+    transcript_cache_service.append_to_transcript(db_user_entry)
     logger.info(f"Mensagem do usuário '{user_nickname}' registrada no briefing {briefing_id}.")
 
-    # --- Obter histórico para enviar para a IA ---
-    history_entries = conversation_history_cruds.get_conversation_history_by_briefing_id(db, briefing_id, limit=50)
+    # --- Obter histórico para enviar para a IA (cache validado pelo último id) ---
+    history_entries = transcript_cache_service.get_recent_transcript(db, briefing_id)
 
     formatted_user_prompt = "\n".join(
         f"{entry.sender_type}: {entry.message_content}"
@@ -87,7 +92,8 @@ async def start_or_continue_chat(
         sender_type=employee_name,
         message_content=ai_response_text
     )
-    conversation_history_cruds.create_conversation_entry(db, ai_entry)
+    db_ai_entry = conversation_history_cruds.create_conversation_entry(db, ai_entry)
+    transcript_cache_service.append_to_transcript(db_ai_entry)
     logger.info(f"Resposta da IA registrada no briefing {briefing_id}.")
 
     # --- Checar se o diálogo foi finalizado ---
@@ -1,27 +1,263 @@
 # File: backend/src/services/compila_briefing_service.py
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from pydantic import ConfigDict, JsonValue, TypeAdapter, ValidationError, create_model
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from src.core.config import settings
 from src.cruds import employee_cruds, briefing_cruds, conversation_history_cruds
-from src.schemas.briefing_schemas import BriefingUpdate
+from src.models.employee_models import Employee
 from src.services.connect_ai_service import call_external_ai_api
+from src.utils.json_utils import extract_json_object, repair_json_object
+from src.utils.token_utils import estimate_tokens, split_lines_into_chunks
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 'auto' usa a compilação incremental quando a marca d'água é válida; senão escolhe
+# o modo em blocos quando a transcrição passa de COMPILE_CHUNK_MAX_TOKENS
+COMPILE_MODES = ("auto", "single", "chunked", "incremental")
+
+# Também atende ao JSON mode dos provedores, que exige a palavra "JSON" no prompt
+JSON_OUTPUT_INSTRUCTIONS = "Responda somente com um objeto JSON contendo o briefing compilado."
+
+INCREMENTAL_INSTRUCTIONS = (
+    "Você receberá o briefing JSON já compilado desta entrevista e, em seguida, apenas as mensagens "
+    "novas trocadas depois dessa compilação. Atualize o briefing com as informações novas, mantendo "
+    "o que continua válido. Responda somente com o JSON completo e atualizado."
+)
+
+MAP_INSTRUCTIONS = (
+    "Você receberá apenas o trecho {part} de {total} de uma entrevista longa. "
+    "Extraia deste trecho as informações do briefing e responda somente com um JSON parcial, "
+    "omitindo os campos que não aparecem neste trecho."
+)
+
+REDUCE_INSTRUCTIONS = (
+    "Você receberá uma lista JSON de briefings parciais, extraídos em ordem de trechos consecutivos "
+    "da mesma entrevista. Una-os em um único briefing JSON: combine listas, elimine repetições e, "
+    "em caso de conflito, prefira a informação do trecho mais recente. Responda somente com o JSON final."
+)
+
+
+def get_script_version(employee_script: Any) -> str:
+    """
+    Versão do roteiro de um personagem: hash do JSON canônico do 'employee_script'.
+    Qualquer edição do roteiro (ex: PUT /employees/{id}) muda a versão.
+    """
+    canonical = json.dumps(employee_script, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+REPAIR_INSTRUCTIONS = (
+    "A resposta abaixo deveria ser um briefing em JSON, mas é inválida: {error}. "
+    "Corrija apenas o formato, sem inventar nem remover informações, e responda somente com o objeto JSON."
+)
+
+# Limite do texto enviado na chamada de reparo (a resposta inválida, não a transcrição)
+REPAIR_MAX_CHARS = 24000
+
+
+def get_required_fields(employee_script: Any) -> Tuple[str, ...]:
+    """
+    Campos obrigatórios do briefing compilado, opcionalmente definidos no roteiro
+    do 'Assistente de Palco' em 'required_fields'.
+    """
+    fields = employee_script.get("required_fields") if isinstance(employee_script, dict) else None
+    if not isinstance(fields, list):
+        return ()
+    return tuple(str(field) for field in fields if field)
+
+
+@lru_cache(maxsize=32)
+def _content_validator(required_fields: Tuple[str, ...]) -> TypeAdapter:
+    """
+    Schema do content compilado: objeto JSON com os campos obrigatórios do roteiro.
+    O validador é compilado uma única vez por conjunto de campos.
+    """
+    if not required_fields:
+        return TypeAdapter(Dict[str, JsonValue])
+    model = create_model(
+        "BriefingCompiledContent",
+        __config__=ConfigDict(extra="allow"),
+        **{field: (JsonValue, ...) for field in required_fields}
+    )
+    return TypeAdapter(model)
+
+
+def _validate_content(content: Dict[str, Any], required_fields: Tuple[str, ...], partial: bool) -> Optional[str]:
+    """
+    Retorna a descrição do problema do content, ou None se for válido.
+    Parciais do map-reduce só precisam ser objetos JSON (podem omitir campos).
+    """
+    try:
+        _content_validator(() if partial else required_fields).validate_python(content)
+    except ValidationError as e:
+        missing = [str(error["loc"][0]) for error in e.errors() if error["type"] == "missing"]
+        if missing:
+            return f"campos obrigatórios ausentes: {', '.join(missing)}"
+        return f"estrutura inválida: {e.errors()[0]['msg']}"
+    if not partial and not content:
+        return "o briefing está vazio"
+    return None
+
+
+async def _parse_briefing_json(
+    assistant_employee: Employee,
+    raw_ai_response: str,
+    briefing_id: int,
+    partial: bool = False
+) -> Dict[str, Any]:
+    """
+    Extrai e valida o JSON do briefing da resposta em texto da IA.
+    Se a resposta for inválida, tenta primeiro um reparo local (vírgulas finais, JSON truncado)
+    e depois chamadas curtas de reparo, que reenviam só a resposta inválida, sem a transcrição.
+    """
+    required_fields = get_required_fields(assistant_employee.employee_script)
+    attempts_left = max(0, settings.COMPILE_REPAIR_ATTEMPTS)
+
+    while True:
+        content = extract_json_object(raw_ai_response) or repair_json_object(raw_ai_response)
+        error = "não contém um objeto JSON" if content is None else _validate_content(content, required_fields, partial)
+        if error is None:
+            logger.info(f"Briefing {briefing_id} — JSON decodificado com sucesso.")
+            return content
+
+        logger.warning(f"Briefing {briefing_id} — resposta da IA inválida: {error}")
+        if attempts_left <= 0:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Resposta da IA não é um JSON válido: {error}")
+        attempts_left -= 1
+
+        repair_prompt = REPAIR_INSTRUCTIONS.format(error=error)
+        if required_fields and not partial:
+            repair_prompt += f" O JSON deve conter os campos: {', '.join(required_fields)}."
+        raw_ai_response = await _call_assistant(
+            assistant_employee, repair_prompt, raw_ai_response[:REPAIR_MAX_CHARS], briefing_id
+        )
+
+
+async def _call_assistant(assistant_employee: Employee, system_prompt: str, user_prompt: str, briefing_id: int) -> str:
+    try:
+        raw_ai_response = await call_external_ai_api(
+            endpoint_url=assistant_employee.endpoint_url,
+            endpoint_key=assistant_employee.endpoint_key,
+            headers_template=assistant_employee.headers_template,
+            body_template=assistant_employee.body_template,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            ia_name=assistant_employee.ia_name,
+            json_mode=settings.COMPILE_JSON_MODE
+        )
+        logger.info(f"Resposta da IA para compilação: {raw_ai_response[:100]}...")
+        return raw_ai_response
+
+    except Exception as e:
+        logger.error(f"Erro ao compilar briefing {briefing_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro ao compilar briefing: {e}")
+
+
+async def _compile_single(assistant_employee: Employee, system_prompt: str, lines: List[str], briefing_id: int) -> Dict[str, Any]:
+    raw_ai_response = await _call_assistant(assistant_employee, system_prompt, "\n".join(lines), briefing_id)
+    return await _parse_briefing_json(assistant_employee, raw_ai_response, briefing_id)
+
+
+async def _compile_chunked(assistant_employee: Employee, system_prompt: str, chunks: List[str], briefing_id: int) -> Dict[str, Any]:
+    """
+    Map-reduce: cada bloco da transcrição gera um briefing parcial (chamadas concorrentes,
+    limitadas por COMPILE_MAP_CONCURRENCY) e os parciais são unidos no briefing final.
+    O tempo total passa a depender do tamanho do bloco, e não do tamanho da entrevista.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.COMPILE_MAP_CONCURRENCY))
+    max_tokens = settings.COMPILE_CHUNK_MAX_TOKENS
+
+    async def run_limited(prompt_system: str, prompt_user: str, partial: bool) -> Dict[str, Any]:
+        async with semaphore:
+            raw_ai_response = await _call_assistant(assistant_employee, prompt_system, prompt_user, briefing_id)
+            return await _parse_briefing_json(assistant_employee, raw_ai_response, briefing_id, partial=partial)
+
+    total = len(chunks)
+    logger.info(f"Briefing {briefing_id}: compilação em {total} bloco(s) de até ~{max_tokens} tokens.")
+    partials = await asyncio.gather(*(
+        run_limited(f"{system_prompt}\n\n{MAP_INSTRUCTIONS.format(part=i + 1, total=total)}", chunk, partial=True)
+        for i, chunk in enumerate(chunks)
+    ))
+
+    reduce_system_prompt = f"{system_prompt}\n\n{REDUCE_INSTRUCTIONS}"
+
+    async def reduce_group(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(group) == 1:
+            return group[0]
+        return await run_limited(reduce_system_prompt, json.dumps(group, ensure_ascii=False), partial=True)
+
+    # Se os parciais ainda não cabem em um único prompt, reduz em grupos até sobrar um nível só
+    while len(partials) > 1:
+        serialized = [json.dumps(partial, ensure_ascii=False) for partial in partials]
+        if estimate_tokens("".join(serialized)) <= max_tokens:
+            break
+        groups: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_tokens = 0
+        for partial, text in zip(partials, serialized):
+            tokens = estimate_tokens(text)
+            if current and current_tokens + tokens > max_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(partial)
+            current_tokens += tokens
+        groups.append(current)
+        if len(groups) == len(partials):
+            break # Cada parcial sozinho já estoura o limite: segue para a redução final
+        partials = await asyncio.gather(*(reduce_group(group) for group in groups))
+
+    if len(partials) == 1:
+        error = _validate_content(partials[0], get_required_fields(assistant_employee.employee_script), partial=False)
+        if error is None:
+            return partials[0]
+    return await run_limited(reduce_system_prompt, json.dumps(partials, ensure_ascii=False), partial=False)
+
+
+async def _compile_incremental(
+    assistant_employee: Employee,
+    system_prompt: str,
+    current_content: Dict[str, Any],
+    new_lines: List[str],
+    briefing_id: int
+) -> Dict[str, Any]:
+    user_prompt = (
+        "BRIEFING ATUAL:\n"
+        f"{json.dumps(current_content, ensure_ascii=False)}\n\n"
+        "MENSAGENS NOVAS:\n"
+        + "\n".join(new_lines)
+    )
+    raw_ai_response = await _call_assistant(
+        assistant_employee, f"{system_prompt}\n\n{INCREMENTAL_INSTRUCTIONS}", user_prompt, briefing_id
+    )
+    return await _parse_briefing_json(assistant_employee, raw_ai_response, briefing_id)
+
+
 async def compile_briefing_content(
     db: Session,
     briefing_id: int,
-    user_id: int
+    user_id: int,
+    mode: str = "auto"
 ) -> Dict[str, Any]:
     """
     Compila o briefing via 'Assistente de Palco' e salva no campo 'content' do briefing.
+    Modos: 'single' envia a transcrição inteira em uma chamada; 'chunked' divide a transcrição
+    em blocos limitados por tokens (map-reduce); 'incremental' envia o content atual e apenas as
+    mensagens posteriores à marca d'água; 'auto' tenta o incremental e, se a marca d'água não for
+    válida (ex: roteiro alterado), faz a compilação completa escolhendo o modo pelo tamanho.
     """
-    logger.info(f"Compilando briefing — briefing_id: {briefing_id}, user_id: {user_id}")
+    logger.info(f"Compilando briefing — briefing_id: {briefing_id}, user_id: {user_id}, modo: {mode}")
+
+    if mode not in COMPILE_MODES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Modo de compilação inválido: '{mode}'.")
 
     briefing = briefing_cruds.get_briefing(db, briefing_id)
     if not briefing:
@@ -32,6 +268,9 @@ async def compile_briefing_content(
         logger.warning(f"Usuário {user_id} tentou compilar briefing {briefing_id} de outro usuário.")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sem permissão para compilar este briefing.")
 
+    # Versão lida antes das chamadas à IA: a gravação só acontece se o briefing não mudou até lá
+    base_version = briefing.version
+
     assistant_employee_name = "Assistente de Palco"
     assistant_employee = employee_cruds.get_employee_by_name(db, assistant_employee_name)
 
@@ -43,64 +282,89 @@ async def compile_briefing_content(
         logger.error(f"Script inválido para '{assistant_employee_name}'.")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Script inválido para '{assistant_employee_name}'.")
 
-    # --- Obter histórico completo da conversa ---
-    history_entries = conversation_history_cruds.get_conversation_history_by_briefing_id(db, briefing_id, limit=500)
+    system_prompt = f"Contexto do seu papel: {assistant_employee.employee_script['context']}\n\n{JSON_OUTPUT_INSTRUCTIONS}"
+    required_fields = get_required_fields(assistant_employee.employee_script)
+    if required_fields:
+        system_prompt += f" O briefing final deve conter os campos: {', '.join(required_fields)}."
+    script_version = get_script_version(assistant_employee.employee_script)
 
-    if not history_entries:
-        logger.warning(f"Sem histórico para briefing {briefing_id}. Não é possível compilar.")
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sem histórico para compilar.")
+    briefing_content_json: Optional[Dict[str, Any]] = None
+    compiled_mode = mode
+    chunk_count = 1
+    new_message_count = 0
+    last_message_id: Optional[int] = None
 
-    formatted_user_prompt = "\n".join(
-        f"{entry.sender_type}: {entry.message_content}"
-        for entry in history_entries
+    # --- Compilação incremental a partir da marca d'água ---
+    watermark_valid = (
+        isinstance(briefing.content, dict)
+        and briefing.compiled_until_message_id is not None
+        and briefing.compiled_script_version == script_version
     )
+    if mode in ("auto", "incremental"):
+        if not watermark_valid:
+            logger.info(f"Briefing {briefing_id}: sem marca d'água válida (ou roteiro alterado); compilação completa.")
+        else:
+            new_rows = conversation_history_cruds.get_transcript_rows(
+                db, briefing_id, after_id=briefing.compiled_until_message_id
+            )
+            new_message_count = len(new_rows)
+            if not new_rows:
+                logger.info(f"Briefing {briefing_id} já está atualizado; nenhuma chamada à IA necessária.")
+                return {
+                    "message": "Briefing já está atualizado.",
+                    "briefing_id": briefing_id,
+                    "mode": "incremental",
+                    "chunks": 0,
+                    "new_messages": 0,
+                    "content": briefing.content
+                }
+            new_lines = [f"{sender_type}: {message_content}" for _, sender_type, message_content in new_rows]
+            prompt_tokens = estimate_tokens(json.dumps(briefing.content, ensure_ascii=False)) + estimate_tokens("\n".join(new_lines))
+            if prompt_tokens <= settings.COMPILE_CHUNK_MAX_TOKENS:
+                briefing_content_json = await _compile_incremental(
+                    assistant_employee, system_prompt, briefing.content, new_lines, briefing_id
+                )
+                compiled_mode = "incremental"
+                last_message_id = new_rows[-1][0]
+            else:
+                logger.info(f"Briefing {briefing_id}: mensagens novas excedem o bloco; compilação completa.")
 
-    system_prompt = f"Contexto do seu papel: {assistant_employee.employee_script['context']}"
-
-    # --- Chamar IA ---
-    try:
-        raw_ai_response = await call_external_ai_api(
-            endpoint_url=assistant_employee.endpoint_url,
-            endpoint_key=assistant_employee.endpoint_key,
-            headers_template=assistant_employee.headers_template,
-            body_template=assistant_employee.body_template,
-            system_prompt=system_prompt,
-            user_prompt=formatted_user_prompt,
-            ia_name=assistant_employee.ia_name
-        )
-        logger.info(f"Resposta da IA para compilação: {raw_ai_response[:100]}...")
-
-    except Exception as e:
-        logger.error(f"Erro ao compilar briefing {briefing_id}: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro ao compilar briefing: {e}")
+    # --- Compilação completa (uma chamada ou map-reduce em blocos) ---
+    if briefing_content_json is None:
+        # Histórico completo da conversa (tuplas leves, sem objetos ORM)
+        history_rows = conversation_history_cruds.get_transcript_rows(db, briefing_id)
 
-    # --- Processar resposta (JSON) ---
-    briefing_content_json: Optional[Dict[str, Any]] = None
-    try:
-        json_start = raw_ai_response.find('{')
-        json_end = raw_ai_response.rfind('}')
-        if json_start != -1 and json_end != -1 and json_end > json_start:
-            json_str = raw_ai_response[json_start:json_end + 1]
-            briefing_content_json = json.loads(json_str)
-        else:
-            briefing_content_json = json.loads(raw_ai_response)
+        if not history_rows:
+            logger.warning(f"Sem histórico para briefing {briefing_id}. Não é possível compilar.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sem histórico para compilar.")
 
-        logger.info(f"Briefing {briefing_id} — JSON decodificado com sucesso.")
+        lines = [f"{sender_type}: {message_content}" for _, sender_type, message_content in history_rows]
+        last_message_id = history_rows[-1][0]
+        new_message_count = len(history_rows)
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Erro de JSON no briefing {briefing_id}: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Resposta da IA não é um JSON válido: {e}")
+        chunks: Optional[List[str]] = None
+        if mode != "single":
+            chunks = split_lines_into_chunks(lines, settings.COMPILE_CHUNK_MAX_TOKENS)
+            if mode != "chunked" and len(chunks) == 1:
+                chunks = None
 
-    except Exception as e:
-        logger.error(f"Erro inesperado ao processar resposta da IA — briefing {briefing_id}: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro inesperado na resposta da IA: {e}")
+        if chunks:
+            briefing_content_json = await _compile_chunked(assistant_employee, system_prompt, chunks, briefing_id)
+            compiled_mode = "chunked"
+            chunk_count = len(chunks)
+        else:
+            briefing_content_json = await _compile_single(assistant_employee, system_prompt, lines, briefing_id)
+            compiled_mode = "single"
 
-    # --- Salvar briefing ---
-    briefing_update = BriefingUpdate(
+    # --- Salvar briefing com a nova marca d'água ---
+    updated_briefing = briefing_cruds.save_compiled_content(
+        db,
+        briefing.id,
         content=briefing_content_json,
-        status="Compilado"
+        compiled_until_message_id=last_message_id,
+        compiled_script_version=script_version,
+        expected_version=base_version
     )
-    updated_briefing = briefing_cruds.update_briefing(db, briefing.id, briefing_update, last_edited_by=assistant_employee_name)
 
     if not updated_briefing:
         logger.error(f"Falha ao salvar briefing {briefing_id}.")
@@ -111,5 +375,8 @@ async def compile_briefing_content(
     return {
         "message": "Briefing compilado com sucesso!",
         "briefing_id": briefing_id,
+        "mode": compiled_mode,
+        "chunks": chunk_count,
+        "new_messages": new_message_count,
         "content": briefing_content_json
     }
@@ -1,11 +1,15 @@
 # File: backend/src/services/connect_ai_service.py
 
+import copy
 import httpx
 import json
 import logging
 from typing import Dict, Any
 from fastapi import HTTPException, status
 
+from src.core.config import settings
+from src.utils.rate_limiter import provider_rate_limiter
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -16,18 +20,21 @@ async def call_external_ai_api(
     body_template: Dict[str, Any],
     system_prompt: str,
     user_prompt: str,
-    ia_name: str
+    ia_name: str,
+    json_mode: bool = False
 ) -> str:
     """
     Chamada HTTP para API de IA externa.
     Injeta system_prompt e user_prompt no body_template conforme padrão da IA.
+    Com 'json_mode', pede saída estruturada (JSON) aos provedores que suportam.
     Retorna a resposta em texto.
     """
     logger.info(f"Chamando API externa de IA ({ia_name}) em: {endpoint_url}")
     logger.debug(f"system_prompt (100): {system_prompt[:100]}...")
     logger.debug(f"user_prompt (100): {user_prompt[:100]}...")
 
-    final_body = body_template.copy()
+    # Cópia profunda: as listas do template (ex: 'messages') não podem acumular mensagens entre chamadas
+    final_body = copy.deepcopy(body_template)
 
     # --- INJEÇÃO POR TIPO DE IA ---
 
@@ -51,6 +58,21 @@ async def call_external_ai_api(
         if not final_body:
             final_body = {"prompt": f"{system_prompt}\n\n{user_prompt}"}
 
+    # --- MODO JSON (SAÍDA ESTRUTURADA) ---
+    if json_mode:
+        if 'messages' in final_body:
+            # OpenAI / DeepSeek / Azure: JSON mode (o prompt precisa mencionar "JSON")
+            final_body.setdefault('response_format', {"type": "json_object"})
+        elif 'contents' in final_body:
+            # Gemini: responseMimeType no generationConfig
+            generation_config = final_body.setdefault('generationConfig', {})
+            generation_config.setdefault('responseMimeType', "application/json")
+
+    # Respeita a cota do provedor (compartilhada por chat, compilação e recompilação em massa)
+    waited = await provider_rate_limiter.acquire(ia_name, settings.AI_RATE_LIMITS_PER_MINUTE.get(ia_name))
+    if waited:
+        logger.info(f"Chamada à IA ({ia_name}) aguardou {waited:.2f}s pelo limite de requisições.")
+
     headers = {**headers_template}
     if endpoint_key:
         if "Authorization" not in headers:
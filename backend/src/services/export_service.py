@@ -0,0 +1,249 @@
+# File: backend/src/services/export_service.py
+#
+# Exportação em massa (NDJSON ou CSV) de usuários, briefings e históricos de conversa.
+# As linhas são lidas em lotes de EXPORT_BATCH_SIZE por keyset (id > último id do lote anterior),
+# cada lote com 'yield_per' (cursor no servidor onde o driver suporta), e convertidas em texto
+# à medida que a resposta é enviada: a memória usada não depende do total de linhas.
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.db.database import SessionLocal
+from src.models.briefing_models import Briefing
+from src.models.conversation_archive_models import ConversationHistoryArchive
+from src.models.conversation_history_models import ConversationHistory
+from src.models.user_models import User
+from src.utils.datetime_utils import to_utc
+from src.utils.history_archive_utils import unpack_history
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Campos exportados de cada entidade (segredos, como hashes de senha e 2FA, ficam de fora)
+USER_EXPORT_COLUMNS = (
+    User.id, User.email, User.email_verified, User.phone_number, User.nickname, User.google_id,
+    User.github_id, User.is_two_factor_enabled, User.status, User.creation_date, User.last_login,
+)
+BRIEFING_EXPORT_COLUMNS = (
+    Briefing.id, Briefing.user_id, Briefing.title, Briefing.status, Briefing.content, Briefing.development_roteiro,
+    Briefing.creation_date, Briefing.update_date, Briefing.last_edited_by, Briefing.version,
+)
+HISTORY_EXPORT_COLUMNS = (
+    ConversationHistory.id, ConversationHistory.briefing_id, ConversationHistory.sender_type,
+    ConversationHistory.message_content, ConversationHistory.timestamp,
+)
+
+# Tamanho aproximado de cada pedaço do CSV enviado ao cliente
+CSV_CHUNK_BYTES = 64 * 1024
+
+# Arquivos comprimidos de histórico lidos por vez (cada um pode ter milhares de mensagens)
+ARCHIVE_BATCH_SIZE = 10
+
+
+def _open_export_session(db: Session) -> Session:
+    """
+    Sessão própria da exportação, no mesmo bind da sessão da requisição (primário ou réplica):
+    o corpo da resposta é gerado depois que a sessão da requisição já foi fechada.
+    """
+    return SessionLocal(bind=db.get_bind())
+
+
+def _export_value(value: Any) -> Any:
+    # Datas em ISO 8601 (UTC), para serem lidas de volta sem ambiguidade de fuso
+    if isinstance(value, datetime):
+        return to_utc(value).isoformat()
+    return value
+
+
+def _iter_rows(
+    session: Session,
+    columns: Sequence[Any],
+    id_column: Any,
+    filters: List[Any]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Percorre a consulta em lotes por keyset; só um lote fica na memória por vez.
+    """
+    batch_size = max(1, settings.EXPORT_BATCH_SIZE)
+    last_id = 0
+    while True:
+        result = session.execute(
+            select(*columns)
+            .where(id_column > last_id, *filters)
+            .order_by(id_column)
+            .limit(batch_size)
+            .execution_options(yield_per=batch_size)
+        )
+        count = 0
+        for row in result:
+            count += 1
+            last_id = row[0]
+            yield {key: _export_value(value) for key, value in row._mapping.items()}
+        if count < batch_size:
+            return
+
+
+def _iter_archived_messages(
+    session: Session,
+    briefing_id: Optional[int],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Mensagens dos históricos arquivados (ver history_archive_service), descomprimidas um arquivo por vez.
+    """
+    filters = [ConversationHistoryArchive.briefing_id == briefing_id] if briefing_id is not None else []
+    last_id = 0
+    while True:
+        archives = session.execute(
+            select(ConversationHistoryArchive.briefing_id, ConversationHistoryArchive.compressed_history)
+            .where(ConversationHistoryArchive.briefing_id > last_id, *filters)
+            .order_by(ConversationHistoryArchive.briefing_id)
+            .limit(ARCHIVE_BATCH_SIZE)
+        ).all()
+        for archived_briefing_id, blob in archives:
+            for message_id, sender_type, content, timestamp in unpack_history(blob):
+                if timestamp is not None and (
+                    (created_from and timestamp < to_utc(created_from)) or (created_to and timestamp >= to_utc(created_to))
+                ):
+                    continue
+                yield {
+                    "id": message_id,
+                    "briefing_id": archived_briefing_id,
+                    "sender_type": sender_type,
+                    "message_content": content,
+                    "timestamp": _export_value(timestamp),
+                }
+        if len(archives) < ARCHIVE_BATCH_SIZE:
+            return
+        last_id = archives[-1][0]
+
+
+def _date_filters(column: Any, created_from: Optional[datetime], created_to: Optional[datetime]) -> List[Any]:
+    # Intervalo semiaberto [created_from, created_to); datas sem fuso são consideradas UTC
+    filters = []
+    if created_from is not None:
+        filters.append(column >= created_from)
+    if created_to is not None:
+        filters.append(column < created_to)
+    return filters
+
+
+def _encode(records: Iterator[Dict[str, Any]], fieldnames: List[str], export_format: str) -> Iterator[str]:
+    """
+    Converte os registros em linhas NDJSON ou CSV (com cabeçalho). Valores JSON vão como texto JSON no CSV.
+    """
+    if export_format == "ndjson":
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+
+    def flush() -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return text
+
+    writer.writeheader()
+    for record in records:
+        writer.writerow({
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        })
+        if buffer.tell() >= CSV_CHUNK_BYTES:
+            yield flush()
+    yield flush()
+
+
+def _stream(db: Session, export_name: str, export_format: str, fieldnames: List[str], produce: Callable[[Session], Iterator[Dict[str, Any]]]) -> Iterator[str]:
+    session = _open_export_session(db)
+    exported = 0
+    try:
+        def counted(records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            nonlocal exported
+            for record in records:
+                exported += 1
+                yield record
+        yield from _encode(counted(produce(session)), fieldnames, export_format)
+    finally:
+        session.close()
+        logger.info(f"Exportação de {export_name} ({export_format}) encerrada: {exported} registro(s).")
+
+
+def stream_users(
+    db: Session,
+    export_format: str = "ndjson",
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Iterator[str]:
+    """
+    Usuários filtrados por status e data de criação, em ordem de id.
+    """
+    filters = _date_filters(User.creation_date, created_from, created_to)
+    if status is not None:
+        filters.append(User.status == status)
+    fieldnames = [column.key for column in USER_EXPORT_COLUMNS]
+    return _stream(db, "usuários", export_format, fieldnames, lambda session: _iter_rows(session, USER_EXPORT_COLUMNS, User.id, filters))
+
+
+def stream_briefings(
+    db: Session,
+    export_format: str = "ndjson",
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Iterator[str]:
+    """
+    Briefings (com o conteúdo) filtrados por status, usuário e data de criação, em ordem de id.
+    """
+    filters = _date_filters(Briefing.creation_date, created_from, created_to)
+    filters.append(Briefing.deleted_at.is_(None))
+    if status is not None:
+        filters.append(Briefing.status == status)
+    if user_id is not None:
+        filters.append(Briefing.user_id == user_id)
+    fieldnames = [column.key for column in BRIEFING_EXPORT_COLUMNS]
+    return _stream(db, "briefings", export_format, fieldnames, lambda session: _iter_rows(session, BRIEFING_EXPORT_COLUMNS, Briefing.id, filters))
+
+
+def stream_conversation_histories(
+    db: Session,
+    export_format: str = "ndjson",
+    briefing_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_archived: bool = True
+) -> Iterator[str]:
+    """
+    Mensagens filtradas por briefing e data da mensagem: primeiro as da tabela (em ordem de id),
+    depois as dos históricos arquivados (por briefing).
+    """
+    filters = _date_filters(ConversationHistory.timestamp, created_from, created_to)
+    if briefing_id is not None:
+        filters.append(ConversationHistory.briefing_id == briefing_id)
+    fieldnames = [column.key for column in HISTORY_EXPORT_COLUMNS]
+
+    def produce(session: Session) -> Iterator[Dict[str, Any]]:
+        yield from _iter_rows(session, HISTORY_EXPORT_COLUMNS, ConversationHistory.id, filters)
+        if include_archived:
+            yield from _iter_archived_messages(session, briefing_id, created_from, created_to)
+
+    return _stream(db, "históricos de conversa", export_format, fieldnames, produce)
@@ -0,0 +1,56 @@
+# File: backend/src/services/history_archive_service.py
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.cruds import conversation_history_cruds, job_cruds
+from src.utils.datetime_utils import get_current_datetime
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run_history_archive(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Arquiva (comprime em um blob por briefing) o histórico dos briefings sem mensagens nem
+    alterações há HISTORY_ARCHIVE_IDLE_DAYS dias. O scan é por keyset sobre briefing_id, em páginas
+    de HISTORY_ARCHIVE_BATCH_SIZE, com o progresso gravado na tarefa ao fim de cada página.
+    Briefings já arquivados deixam de ser selecionados, então uma nova execução apenas continua.
+    """
+    job = job_cruds.get_job(db, payload["job_id"])
+    idle_before = get_current_datetime() - timedelta(days=settings.HISTORY_ARCHIVE_IDLE_DAYS)
+    page_size = max(1, settings.HISTORY_ARCHIVE_BATCH_SIZE)
+    checkpoint = job.result if isinstance(job.result, dict) and "last_id" in job.result else None
+    progress: Dict[str, Any] = dict(checkpoint) if checkpoint else {
+        "last_id": 0,
+        "briefings": 0,
+        "messages": 0,
+        "raw_bytes": 0,
+        "compressed_bytes": 0,
+    }
+    logger.info(f"Arquivamento de históricos iniciado (ociosos desde {idle_before.isoformat()}, após o briefing {progress['last_id']}).")
+
+    while True:
+        briefing_ids = conversation_history_cruds.get_idle_briefing_ids_with_history(
+            db, idle_before, after_id=progress["last_id"], limit=page_size
+        )
+        if not briefing_ids:
+            break
+        for briefing_id in briefing_ids:
+            archived = conversation_history_cruds.archive_briefing_history(db, briefing_id)
+            progress["briefings"] += 1
+            progress["messages"] += archived["messages"]
+            progress["raw_bytes"] += archived["raw_bytes"]
+            progress["compressed_bytes"] += archived["compressed_bytes"]
+        progress["last_id"] = briefing_ids[-1]
+        job = job_cruds.save_job_checkpoint(db, job, dict(progress))
+
+    progress["compression_ratio"] = round(progress["raw_bytes"] / progress["compressed_bytes"], 2) if progress["compressed_bytes"] else None
+    logger.info(
+        f"Arquivamento concluído: {progress['briefings']} briefing(s), {progress['messages']} mensagem(ns), "
+        f"{progress['raw_bytes']} -> {progress['compressed_bytes']} bytes."
+    )
+    return progress
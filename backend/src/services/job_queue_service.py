@@ -0,0 +1,301 @@
+# File: backend/src/services/job_queue_service.py
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+from src.cruds import job_cruds
+from src.db.database import SessionLocal
+from src.models.job_models import Job
+from src.services import compila_briefing_service, bulk_recompile_service, history_archive_service, purge_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+COMPILE_BRIEFING_JOB = "compile_briefing"
+BULK_RECOMPILE_JOB = "bulk_recompile_briefings"
+HISTORY_ARCHIVE_JOB = "archive_idle_histories"
+PURGE_JOB = "purge_deleted"
+
+
+async def _run_compile_briefing(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await compila_briefing_service.compile_briefing_content(
+        db=db,
+        briefing_id=payload["briefing_id"],
+        user_id=payload["user_id"],
+        mode=payload.get("mode", "auto")
+    )
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    COMPILE_BRIEFING_JOB: _run_compile_briefing,
+    BULK_RECOMPILE_JOB: bulk_recompile_service.run_bulk_recompile,
+    HISTORY_ARCHIVE_JOB: history_archive_service.run_history_archive,
+    PURGE_JOB: purge_service.run_purge,
+}
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Erros do cliente (4xx: briefing inexistente, sem histórico...) não melhoram com nova tentativa.
+    # O 409 sim: o briefing mudou durante a execução, e a nova tentativa parte da versão atual
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500 or error.status_code == status.HTTP_409_CONFLICT
+    return True
+
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return f"{error.status_code}: {error.detail}"
+    return str(error) or error.__class__.__name__
+
+
+class JobWorkerPool:
+    """
+    Pool de workers asyncio, no próprio processo, que executa as tarefas
+    persistidas na tabela 'jobs'. A tabela é a fonte da verdade: a fila em memória
+    guarda apenas ids, e tarefas pendentes são retomadas no startup.
+    Uma tarefa é tomada por um UPDATE condicional ('pending' -> 'running'), então vários workers
+    ou processos nunca executam a mesma tarefa; durante a execução a concessão (update_date) é
+    renovada, e só tarefas com a concessão expirada (processo que caiu) voltam para a fila.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        session_factory: Callable[[], Session] = SessionLocal,
+        retry_base_delay_seconds: float = 5.0,
+        heartbeat_seconds: float = 30.0,
+        lease_seconds: float = 300.0
+    ):
+        self.concurrency = max(1, concurrency)
+        self.session_factory = session_factory
+        self.retry_base_delay_seconds = retry_base_delay_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lease_seconds = lease_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._retry_handles: List[asyncio.TimerHandle] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Pool de tarefas iniciado com {self.concurrency} worker(s).")
+
+        # Retoma as tarefas pendentes e as abandonadas por um processo que caiu (concessão expirada).
+        # Tarefas 'running' de outros processos vivos continuam com eles.
+        db = self.session_factory()
+        try:
+            job_cruds.requeue_stale_jobs(db, self.lease_seconds)
+            for job_id in job_cruds.get_pending_job_ids(db):
+                self._queue.put_nowait(job_id)
+        except Exception as e:
+            logger.error(f"Não foi possível retomar as tarefas pendentes: {e}")
+        finally:
+            db.close()
+        # Concessões que expirarem depois do startup (outro processo caiu) também são recuperadas
+        self._workers.append(asyncio.create_task(self._recover_stale_jobs(), name="job-lease-reaper"))
+
+    async def stop(self) -> None:
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles = []
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def enqueue(self, job_id: int) -> None:
+        """
+        Coloca a tarefa na fila em memória. Se o pool não estiver rodando,
+        a tarefa permanece 'pending' no banco e será retomada no próximo startup.
+        """
+        if self._queue is None:
+            logger.warning(f"Pool de tarefas parado; tarefa {job_id} ficará pendente.")
+            return
+        self._queue.put_nowait(job_id)
+
+    def _schedule_retry(self, job_id: int, attempt: int) -> None:
+        delay = self.retry_base_delay_seconds * (2 ** (attempt - 1))
+        logger.info(f"Tarefa {job_id} será reexecutada em {delay:.1f}s.")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._retry_handles = [h for h in self._retry_handles if not h.cancelled()]
+        self._retry_handles.append(loop.call_later(delay, self.enqueue, job_id))
+
+    async def _recover_stale_jobs(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            db = self.session_factory()
+            try:
+                for job_id in job_cruds.requeue_stale_jobs(db, self.lease_seconds):
+                    self.enqueue(job_id)
+            except Exception as e:
+                logger.error(f"Falha ao recuperar tarefas com concessão expirada: {e}")
+            finally:
+                db.close()
+
+    async def _heartbeat(self, job_id: int) -> None:
+        # Sessão própria: a do handler pode estar no meio de uma transação
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            db = self.session_factory()
+            try:
+                job_cruds.touch_job(db, job_id)
+            except Exception as e:
+                logger.warning(f"Não foi possível renovar a concessão da tarefa {job_id}: {e}")
+            finally:
+                db.close()
+
+    async def _worker(self, worker_number: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                logger.error(f"Worker {worker_number}: erro inesperado na tarefa {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def run_job(self, job_id: int) -> Optional[Job]:
+        """
+        Executa uma tarefa com uma sessão própria e registra o resultado.
+        Retorna a tarefa no estado final desta execução.
+        """
+        db = self.session_factory()
+        try:
+            job = job_cruds.get_job(db, job_id)
+            # Só tarefas pendentes são executadas: ids duplicados na fila são inofensivos
+            if job is None or job.status != "pending":
+                return job
+
+            handler = JOB_HANDLERS.get(job.job_type)
+            if handler is None:
+                return job_cruds.mark_job_failed(db, job, f"Tipo de tarefa desconhecido: '{job.job_type}'", retry=False)
+
+            if not job_cruds.claim_job(db, job_id):
+                # Outro worker (ou processo) tomou a tarefa entre a leitura e o UPDATE
+                logger.info(f"Tarefa {job_id} já foi tomada por outro worker.")
+                return job_cruds.get_job(db, job_id)
+            job = job_cruds.get_job(db, job_id)
+            logger.info(f"Executando tarefa {job.id} ({job.job_type}), tentativa {job.attempts}/{job.max_attempts}.")
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                # 'job_id' permite que tarefas longas gravem checkpoints de progresso
+                result = await handler(db, {**job.payload, "job_id": job.id})
+            except Exception as e:
+                db.rollback()
+                job = job_cruds.get_job(db, job_id)
+                retry = _is_retryable(e) and job.attempts < job.max_attempts
+                logger.error(f"Tarefa {job_id} falhou: {_describe_error(e)} (nova tentativa: {retry})")
+                job = job_cruds.mark_job_failed(db, job, _describe_error(e), retry=retry)
+                if retry:
+                    self._schedule_retry(job.id, job.attempts)
+                return job
+            finally:
+                heartbeat.cancel()
+
+            job = job_cruds.get_job(db, job_id)
+            logger.info(f"Tarefa {job_id} concluída com sucesso.")
+            return job_cruds.mark_job_succeeded(db, job, result)
+        finally:
+            db.close()
+
+
+job_pool = JobWorkerPool(
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    retry_base_delay_seconds=settings.JOB_RETRY_BASE_DELAY_SECONDS,
+    heartbeat_seconds=settings.JOB_HEARTBEAT_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+)
+
+
+def submit_job(
+    db: Session,
+    job_type: str,
+    payload: Dict[str, Any],
+    dedup_key: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> Job:
+    """
+    Persiste (ou reaproveita, via 'dedup_key') uma tarefa e a coloca na fila.
+    """
+    job = job_cruds.create_job(
+        db,
+        job_type=job_type,
+        payload=payload,
+        dedup_key=dedup_key,
+        user_id=user_id,
+        max_attempts=settings.JOB_MAX_ATTEMPTS
+    )
+    if job.status == "pending":
+        job_pool.enqueue(job.id)
+    return job
+
+
+def submit_compile_briefing_job(db: Session, briefing_id: int, user_id: int, mode: str = "auto") -> Job:
+    # O modo faz parte da chave: uma recompilação completa pedida durante uma incremental
+    # não pode ser descartada em favor da tarefa incremental já ativa
+    return submit_job(
+        db,
+        job_type=COMPILE_BRIEFING_JOB,
+        payload={"briefing_id": briefing_id, "user_id": user_id, "mode": mode},
+        dedup_key=f"{COMPILE_BRIEFING_JOB}:{briefing_id}:{mode}",
+        user_id=user_id
+    )
+
+
+def submit_bulk_recompile_job(db: Session) -> Job:
+    # Uma única recompilação em massa ativa por vez
+    return submit_job(
+        db,
+        job_type=BULK_RECOMPILE_JOB,
+        payload={},
+        dedup_key=BULK_RECOMPILE_JOB
+    )
+
+
+def submit_history_archive_job(db: Session) -> Job:
+    # Um único arquivamento ativo por vez
+    return submit_job(
+        db,
+        job_type=HISTORY_ARCHIVE_JOB,
+        payload={},
+        dedup_key=HISTORY_ARCHIVE_JOB
+    )
+
+
+def submit_purge_briefing_job(db: Session, briefing_id: int, user_id: int) -> Job:
+    return submit_job(
+        db,
+        job_type=PURGE_JOB,
+        payload={"briefing_id": briefing_id},
+        dedup_key=f"{PURGE_JOB}:briefing:{briefing_id}",
+        user_id=user_id
+    )
+
+
+def submit_purge_user_job(db: Session, user_id: int) -> Job:
+    return submit_job(
+        db,
+        job_type=PURGE_JOB,
+        payload={"user_id": user_id},
+        dedup_key=f"{PURGE_JOB}:user:{user_id}"
+    )
@@ -0,0 +1,68 @@
+# File: backend/src/services/purge_service.py
+#
+# Remoção em segundo plano de briefings e usuários grandes. A requisição de exclusão só faz a
+# exclusão lógica (briefings.deleted_at / users.status = 'deleted') e enfileira a tarefa; aqui o
+# histórico sai em lotes de PURGE_BATCH_SIZE mensagens, um DELETE e um commit por lote, sem
+# transações longas nem bloqueio de muitas linhas de uma vez. Apagar é idempotente: uma nova
+# execução (retry ou reinício do processo) apenas continua de onde a anterior parou.
+
+import asyncio
+import logging
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.cruds import briefing_cruds, job_cruds, user_cruds
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def needs_background_purge(message_count: int) -> bool:
+    """
+    Se a exclusão deve ser lógica + remoção em segundo plano (histórico grande, inclusive o arquivado).
+    """
+    return message_count > settings.PURGE_SOFT_DELETE_MIN_MESSAGES
+
+
+async def _purge_briefing(db: Session, briefing_id: int, progress: Dict[str, Any]) -> None:
+    batch_size = max(1, settings.PURGE_BATCH_SIZE)
+    while True:
+        removed = briefing_cruds.purge_briefing_history_batch(db, briefing_id, batch_size)
+        progress["messages"] += removed
+        if removed < batch_size:
+            break
+        # Devolve o event loop às requisições entre um lote e outro
+        await asyncio.sleep(0)
+    # Histórico vazio: o restante (arquivo comprimido e o briefing) sai em uma transação curta
+    if briefing_cruds.delete_briefing(db, briefing_id):
+        progress["briefings"] += 1
+
+
+async def run_purge(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Remove definitivamente um briefing ('briefing_id') ou um usuário com todos os briefings ('user_id').
+    No caso do usuário, os briefings são percorridos por keyset e o progresso é gravado na tarefa.
+    """
+    job = job_cruds.get_job(db, payload["job_id"])
+    progress: Dict[str, Any] = {"briefings": 0, "messages": 0}
+
+    if payload.get("briefing_id") is not None:
+        await _purge_briefing(db, payload["briefing_id"], progress)
+        logger.info(f"Briefing {payload['briefing_id']} removido: {progress['messages']} mensagem(ns).")
+        return progress
+
+    user_id = payload["user_id"]
+    last_id = 0
+    while True:
+        briefing_ids = briefing_cruds.get_user_briefing_ids(db, user_id, after_id=last_id, limit=max(1, settings.PURGE_BATCH_SIZE))
+        if not briefing_ids:
+            break
+        for briefing_id in briefing_ids:
+            await _purge_briefing(db, briefing_id, progress)
+        last_id = briefing_ids[-1]
+        job = job_cruds.save_job_checkpoint(db, job, dict(progress, last_id=last_id))
+    progress["user_deleted"] = user_cruds.delete_user(db, user_id)
+    logger.info(f"Usuário {user_id} removido: {progress['briefings']} briefing(s), {progress['messages']} mensagem(ns).")
+    return progress
@@ -0,0 +1,169 @@
+# File: backend/src/services/search_service.py
+#
+# Busca textual (administradores) nas mensagens das entrevistas e no conteúdo compilado dos
+# briefings, sobre o índice 'search_documents' (ver src/db/search_index.py).
+# Ordem por relevância (maior primeiro) e id; a paginação é por keyset sobre (pontuação, id),
+# então o custo de uma página não depende de quantas vieram antes. Buscas que encontram mais de
+# SEARCH_RANK_MAX_MATCHES documentos são ordenadas por recência (ver search()).
+
+import html
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.db import search_index
+from src.models.briefing_models import Briefing
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEARCH_SCOPES = ("all", "messages", "briefings")
+
+MAX_TERMS = 16
+# Delimitadores do destaque antes do escape HTML (caracteres de uso privado, não aparecem no texto)
+MARK_START, MARK_END = "\ue000", "\ue001"
+ELLIPSIS = "…"
+
+
+def parse_terms(query: str) -> List[Tuple[str, bool]]:
+    """
+    Termos da busca: palavras (letras/dígitos), todas obrigatórias; 'termo*' busca por prefixo.
+    Operadores e aspas do texto digitado são ignorados (nada chega cru ao MATCH).
+    """
+    terms = [(word, bool(star)) for word, star in re.findall(r"(\w+)(\*?)", query or "")]
+    if not terms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Informe ao menos uma palavra para a busca.")
+    return terms[:MAX_TERMS]
+
+
+def _fts5_query(terms: List[Tuple[str, bool]]) -> str:
+    return " ".join(f'"{word}"' + ("*" if prefix else "") for word, prefix in terms)
+
+
+def _mysql_boolean_query(terms: List[Tuple[str, bool]]) -> str:
+    return " ".join(f"+{word}" + ("*" if prefix else "") for word, prefix in terms)
+
+
+def _fold(text: str) -> str:
+    # Sem acentos e em minúsculas, caractere a caractere (mesmo comprimento do texto original)
+    return "".join((unicodedata.normalize("NFKD", char)[:1] or char).lower()[:1] for char in text)
+
+
+def highlight(body: str, terms: List[Tuple[str, bool]], width: Optional[int] = None) -> str:
+    """
+    Trecho de até ~'width' caracteres em volta da primeira ocorrência, com os termos marcados
+    (usado no MySQL; o FTS5 do SQLite gera o trecho com snippet()).
+    """
+    width = width or settings.SEARCH_SNIPPET_CHARS
+    folded = _fold(body)
+    pattern = re.compile("|".join(
+        r"\b" + re.escape(_fold(word)) + (r"\w*" if prefix else r"\b") for word, prefix in terms
+    ))
+    first = pattern.search(folded)
+    start = max(0, (first.start() if first else 0) - width // 3)
+    end = min(len(body), start + width)
+    # Corta nos espaços, sem partir palavras nas bordas do trecho
+    if start > 0 and body.find(" ", start, (first.start() if first else end)) != -1:
+        start = body.find(" ", start, (first.start() if first else end)) + 1
+    if end < len(body) and body.rfind(" ", start, end) > (first.end() if first else start):
+        end = body.rfind(" ", start, end)
+    pieces, position = [], start
+    for found in pattern.finditer(folded, start, end):
+        if found.end() > end:
+            break
+        pieces.append(body[position:found.start()])
+        pieces.append(MARK_START + body[found.start():found.end()] + MARK_END)
+        position = found.end()
+    pieces.append(body[position:end])
+    return (ELLIPSIS if start > 0 else "") + "".join(pieces) + (ELLIPSIS if end < len(body) else "")
+
+
+def render_snippet(marked: str) -> str:
+    # Escapa o texto do usuário e troca os delimitadores por <mark>
+    return html.escape(marked).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def search(
+    db: Session,
+    query: str,
+    scope: str = "all",
+    briefing_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    limit: int = 20,
+    after: Optional[Tuple[float, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Documentos que contêm todos os termos, do mais para o menos relevante.
+    'after' é o (score, document_id) do último item da página anterior.
+    Retorna até 'limit' itens (o chamador pede um a mais para saber se há próxima página).
+    """
+    bind = db.get_bind()
+    if not search_index.is_enabled(bind):
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Busca textual indisponível neste banco de dados.")
+    terms = parse_terms(query)
+    table = search_index.search_table(bind)
+
+    if bind.dialect.name == "sqlite":
+        # bm25(): quanto menor, mais relevante; o sinal é invertido para a ordem ser a mesma do MySQL
+        score = -func.bm25(literal_column(search_index.SEARCH_TABLE))
+        matches = literal_column(search_index.SEARCH_TABLE).op("MATCH")(_fts5_query(terms))
+        snippet = func.snippet(literal_column(search_index.SEARCH_TABLE), 0, MARK_START, MARK_END, ELLIPSIS, 24)
+    else:
+        score = match(table.c.body, against=_mysql_boolean_query(terms)).in_boolean_mode()
+        matches = score > 0
+        snippet = table.c.body
+
+    filters = [matches]
+    if scope != "all":
+        filters.append(table.c.id % 2 == search_index.SOURCE_KINDS[search_index.MESSAGE if scope == "messages" else search_index.BRIEFING])
+    if briefing_id is not None:
+        filters.append(table.c.briefing_id == briefing_id)
+    base = select(table.c.id).join(Briefing, Briefing.id == table.c.briefing_id).where(*filters, Briefing.deleted_at.is_(None))
+    if user_id is not None:
+        base = base.where(Briefing.user_id == user_id)
+
+    # A relevância é calculada para cada documento encontrado antes do LIMIT. Termos presentes em boa
+    # parte das mensagens ("projeto") têm relevância quase nula e custariam segundos; nesses casos a
+    # ordem é do mais recente para o mais antigo, com pontuação 0 (o cursor das páginas seguintes a carrega)
+    if after is not None:
+        by_recency = after[0] == 0
+    else:
+        cap = settings.SEARCH_RANK_MAX_MATCHES
+        # Contagem só no índice (sem o JOIN), parando no teto
+        counted = base if user_id is not None else select(table.c.id).where(*filters)
+        by_recency = db.execute(select(func.count()).select_from(counted.limit(cap + 1).subquery())).scalar() > cap
+    if by_recency:
+        score = literal(0.0)
+
+    stmt = base.add_columns(table.c.briefing_id, score.label("score"), snippet.label("snippet"), Briefing.title, Briefing.user_id)
+    if after is not None:
+        after_score, after_id = after
+        if by_recency:
+            stmt = stmt.where(table.c.id < after_id)
+        else:
+            stmt = stmt.where(or_(score < after_score, and_(score == after_score, table.c.id < after_id)))
+    stmt = stmt.order_by(*([] if by_recency else [score.desc()]), table.c.id.desc()).limit(limit)
+
+    hits = []
+    for row in db.execute(stmt):
+        source_type, source_id = search_index.source_of(row.id)
+        marked = row.snippet if bind.dialect.name == "sqlite" else highlight(row.snippet, terms)
+        hits.append({
+            "document_id": row.id,
+            "source_type": source_type,
+            "source_id": source_id,
+            "briefing_id": row.briefing_id,
+            "briefing_title": row.title,
+            "user_id": row.user_id,
+            "score": float(row.score),
+            "snippet": render_snippet(marked),
+        })
+    logger.info(f"Busca '{query}' ({scope}): {len(hits)} resultado(s) na página.")
+    return hits
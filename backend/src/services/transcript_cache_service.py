@@ -0,0 +1,173 @@
+# File: backend/src/services/transcript_cache_service.py
+
+import sys
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.cruds import conversation_history_cruds
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TranscriptEntry(NamedTuple):
+    """Mensagem imutável do histórico, desacoplada da sessão do SQLAlchemy."""
+    id: int
+    sender_type: str
+    message_content: str
+
+
+class _CachedTranscript(NamedTuple):
+    entries: Tuple[TranscriptEntry, ...]
+    message_count: int # Total de mensagens do briefing no banco (não só da janela)
+    last_message_id: int
+    size_bytes: int
+    expires_at: float
+
+
+def _estimate_size(entries: Tuple[TranscriptEntry, ...]) -> int:
+    return sum(
+        sys.getsizeof(entry.message_content) + sys.getsizeof(entry.sender_type) + 64
+        for entry in entries
+    )
+
+
+class TranscriptCache:
+    """
+    Cache LRU das transcrições recentes dos briefings ativos.
+
+    Cada entrada guarda apenas a janela das últimas mensagens em tuplas imutáveis,
+    junto com a quantidade total de mensagens e o último id do briefing.
+    Esse par (quantidade, último id) é comparado com o banco a cada leitura, então
+    escritas feitas por outros workers (ou deleções) invalidam a entrada automaticamente.
+    """
+
+    def __init__(self, max_briefings: int, max_bytes: int, ttl_seconds: int):
+        self.max_briefings = max_briefings
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[int, _CachedTranscript]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _pop(self, briefing_id: int) -> None:
+        cached = self._data.pop(briefing_id, None)
+        if cached is not None:
+            self._total_bytes -= cached.size_bytes
+
+    def _store(self, briefing_id: int, entries: Tuple[TranscriptEntry, ...], message_count: int, last_message_id: int) -> None:
+        self._pop(briefing_id)
+        size_bytes = _estimate_size(entries)
+        if size_bytes > self.max_bytes:
+            return # Transcrição maior que o cache inteiro: não vale a pena guardar
+        self._data[briefing_id] = _CachedTranscript(
+            entries=entries,
+            message_count=message_count,
+            last_message_id=last_message_id,
+            size_bytes=size_bytes,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._total_bytes += size_bytes
+        while self._data and (len(self._data) > self.max_briefings or self._total_bytes > self.max_bytes):
+            evicted_id, evicted = self._data.popitem(last=False)
+            self._total_bytes -= evicted.size_bytes
+            logger.debug(f"Transcrição do briefing {evicted_id} removida do cache (LRU).")
+
+    def get(self, briefing_id: int, message_count: int, last_message_id: int) -> Optional[Tuple[TranscriptEntry, ...]]:
+        """
+        Retorna a transcrição em cache se ela ainda corresponde ao estado do banco.
+        """
+        with self._lock:
+            cached = self._data.get(briefing_id)
+            if cached is None:
+                return None
+            if cached.expires_at < time.monotonic():
+                self._pop(briefing_id)
+                return None
+            if cached.message_count != message_count or cached.last_message_id != last_message_id:
+                self._pop(briefing_id)
+                return None
+            self._data[briefing_id] = cached._replace(expires_at=time.monotonic() + self.ttl_seconds)
+            self._data.move_to_end(briefing_id)
+            return cached.entries
+
+    def put(self, briefing_id: int, entries: Tuple[TranscriptEntry, ...], message_count: int, window: int) -> None:
+        with self._lock:
+            last_message_id = entries[-1].id if entries else 0
+            self._store(briefing_id, entries[-window:], message_count, last_message_id)
+
+    def append(self, briefing_id: int, entry: TranscriptEntry, window: int) -> None:
+        """
+        Escrita direta (write-through): acrescenta uma mensagem recém-gravada.
+        Só é aplicada se a mensagem for posterior à última em cache; caso contrário
+        a entrada é descartada e será recarregada do banco na próxima leitura.
+        """
+        with self._lock:
+            cached = self._data.get(briefing_id)
+            if cached is None:
+                return
+            if entry.id <= cached.last_message_id:
+                self._pop(briefing_id)
+                return
+            entries = (cached.entries + (entry,))[-window:]
+            self._store(briefing_id, entries, cached.message_count + 1, entry.id)
+
+    def invalidate(self, briefing_id: int) -> None:
+        with self._lock:
+            self._pop(briefing_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+
+
+transcript_cache = TranscriptCache(
+    max_briefings=settings.TRANSCRIPT_CACHE_MAX_BRIEFINGS,
+    max_bytes=settings.TRANSCRIPT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.TRANSCRIPT_CACHE_TTL_SECONDS,
+)
+
+
+def get_recent_transcript(db: Session, briefing_id: int, limit: Optional[int] = None) -> Tuple[TranscriptEntry, ...]:
+    """
+    Retorna as últimas mensagens do briefing, usando o cache quando ele ainda é válido.
+    A validação custa uma única consulta agregada (COUNT/MAX) em vez de reler as mensagens.
+    """
+    window = limit or settings.CHAT_HISTORY_WINDOW
+    message_count, last_message_id = conversation_history_cruds.get_conversation_history_marker(db, briefing_id)
+
+    cached = transcript_cache.get(briefing_id, message_count, last_message_id)
+    if cached is not None and (len(cached) >= window or len(cached) == message_count):
+        logger.info(f"Transcrição do briefing {briefing_id} servida pelo cache.")
+        return cached[-window:]
+
+    rows = conversation_history_cruds.get_recent_transcript_rows(db, briefing_id, limit=window)
+    entries = tuple(TranscriptEntry(*row) for row in rows)
+    transcript_cache.put(briefing_id, entries, message_count, window)
+    return entries
+
+
+def append_to_transcript(entry, window: Optional[int] = None) -> None:
+    """Acrescenta ao cache uma mensagem (ConversationHistory) recém-persistida."""
+    transcript_cache.append(
+        entry.briefing_id,
+        TranscriptEntry(entry.id, entry.sender_type, entry.message_content),
+        window or settings.CHAT_HISTORY_WINDOW,
+    )
+
+
+def invalidate_transcript(briefing_id: int) -> None:
+    transcript_cache.invalidate(briefing_id)
@@ -2,8 +2,6 @@
 
 import os
 import sys
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
 
 # Adiciona o diretório raiz do backend ao sys.path para importações relativas
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,11 +10,11 @@ if backend_root not in sys.path:
     sys.path.insert(0, backend_root)
 
 # Importações dos modelos e utilitários
-from src.db.database import DATABASE_URL
+from src.db.database import SessionLocal # Mesmo engine (e pool) da aplicação
 from src.models.admin_user_models import AdminUser
 from src.models.employee_models import Employee # Mantenha esta
 from src.core.security import get_password_hash
-from src.utils.datetime_utils import get_current_datetime_str
+from src.utils.datetime_utils import get_current_datetime
 from src.core.config import settings
 from src.utils.employees_data import REQUIRED_EMPLOYEES_DATA # Mantenha esta
 
@@ -32,8 +30,6 @@ def populate_initial_data():
     """
     print("Iniciando a população de dados iniciais...")
 
-    engine = create_engine(DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     session = SessionLocal() # Use esta sessão para TUDO, admin e employees
 
     try:
@@ -46,7 +42,7 @@ def populate_initial_data():
         if not existing_admin:
             if default_admin_username and default_admin_password:
                 hashed_password = get_password_hash(default_admin_password)
-                current_datetime = get_current_datetime_str()
+                current_datetime = get_current_datetime()
 
                 new_admin = AdminUser(
                     username=default_admin_username,
@@ -83,7 +79,7 @@ def populate_initial_data():
                     headers_template=emp_data_raw.get("headers_template"),
                     body_template=emp_data_raw.get("body_template"),
                     # Adicione outros campos se o seu modelo Employee os tiver e não forem auto-gerados
-                    # Ex: creation_date=get_current_datetime_str(),
+                    # Ex: creation_date=get_current_datetime(),
                 )
                 session.add(new_employee)
                 print(f"Criando registro de funcionário mínimo: {employee_name}")
@@ -1,12 +1,72 @@
 # File: backend/src/utils/datetime_utils.py
 
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Annotated, Any, Optional
 from zoneinfo import ZoneInfo  # Python 3.9+
+from pydantic import BeforeValidator, PlainSerializer
+
+# Fuso usado na exibição das datas (a API mantém o formato 'DD/MM/YYYY HH:MM:SS' neste fuso)
+APP_TIMEZONE = ZoneInfo("America/Fortaleza")
+DISPLAY_DATETIME_FORMAT = "%d/%m/%Y %H:%M:%S"
+# Formato antigo gravado pelas rotas de login antes das colunas DATETIME
+LEGACY_ISO_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def get_current_datetime() -> datetime:
+    """
+    Retorna a data e hora atuais (com fuso), sem microssegundos.
+    As colunas DATETIME gravam o instante em UTC.
+    """
+    return datetime.now(APP_TIMEZONE).replace(microsecond=0)
 
 def get_current_datetime_str() -> str:
     """
     Retorna a data e hora atuais de Fortaleza-CE formatadas como 'DD/MM/YYYY HH:MM:SS'.
     """
-    fortaleza_tz = ZoneInfo("America/Fortaleza")
-    now = datetime.now(fortaleza_tz)
-    return now.strftime("%d/%m/%Y %H:%M:%S")
+    return format_datetime_str(get_current_datetime())
+
+def parse_datetime_str(value: str) -> Optional[datetime]:
+    """
+    Converte um texto 'DD/MM/YYYY HH:MM:SS' ou 'YYYY-MM-DD HH:MM:SS' (horário de Fortaleza)
+    em datetime com fuso. Retorna None se o texto não estiver em nenhum dos formatos.
+    """
+    text = (value or "").strip()
+    for date_format in (DISPLAY_DATETIME_FORMAT, LEGACY_ISO_DATETIME_FORMAT):
+        try:
+            return datetime.strptime(text, date_format).replace(tzinfo=APP_TIMEZONE)
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=APP_TIMEZONE)
+
+def to_utc(value: datetime) -> datetime:
+    """
+    Converte para UTC; datetimes sem fuso são considerados já em UTC (padrão do banco).
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def format_datetime_str(value: datetime) -> str:
+    """
+    Formata um datetime no padrão da API ('DD/MM/YYYY HH:MM:SS', horário de Fortaleza).
+    """
+    return to_utc(value).astimezone(APP_TIMEZONE).strftime(DISPLAY_DATETIME_FORMAT)
+
+def _coerce_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        parsed = parse_datetime_str(value)
+        if parsed is None:
+            raise ValueError(f"Data/hora inválida: '{value}'")
+        return parsed
+    return value
+
+# Tipo dos campos de data dos schemas de leitura: datetime internamente,
+# serializado no formato histórico da API ('DD/MM/YYYY HH:MM:SS')
+DateTimeStr = Annotated[
+    datetime,
+    BeforeValidator(_coerce_datetime),
+    PlainSerializer(format_datetime_str, return_type=str),
+]
@@ -0,0 +1,37 @@
+# File: backend/src/utils/history_archive_utils.py
+
+import json
+import zlib
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from src.utils.datetime_utils import to_utc
+
+# (id, sender_type, message_content, timestamp) de uma mensagem do histórico
+ArchivedMessage = Tuple[int, str, str, Optional[datetime]]
+
+COMPRESSION_LEVEL = 6
+
+
+def pack_history(messages: Sequence[ArchivedMessage]) -> Tuple[bytes, int]:
+    """
+    Serializa as mensagens em JSON compacto e comprime com zlib.
+    Retorna (blob comprimido, tamanho do JSON antes da compressão).
+    """
+    payload = [
+        [message_id, sender_type, content, to_utc(timestamp).isoformat() if timestamp else None]
+        for message_id, sender_type, content, timestamp in messages
+    ]
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, COMPRESSION_LEVEL), len(raw)
+
+
+def unpack_history(blob: bytes) -> List[ArchivedMessage]:
+    """
+    Inverso de 'pack_history': mensagens em ordem de id, com timestamps em UTC.
+    """
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    return [
+        (message_id, sender_type, content, datetime.fromisoformat(timestamp) if timestamp else None)
+        for message_id, sender_type, content, timestamp in payload
+    ]
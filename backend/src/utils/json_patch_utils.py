@@ -0,0 +1,267 @@
+# File: backend/src/utils/json_patch_utils.py
+#
+# JSON Patch (RFC 6902) sobre documentos JSON do banco (ex: briefings.content).
+# - 'apply_patch': aplicação em Python (validação e fallback para bancos sem funções JSON, como o SQLite).
+# - 'build_mysql_patch': a mesma sequência de operações como uma única expressão
+#   JSON_SET/JSON_REMOVE/JSON_ARRAY_INSERT para um UPDATE no servidor, com as pré-condições
+#   (caminho existente, operação 'test') no WHERE.
+#
+# Tokens numéricos (e '-') são tratados como índices de array, como no RFC 6901.
+
+import copy
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, and_, func, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+# Cada 'move'/'copy' referencia duas vezes a expressão anterior (valor + documento): acima disso
+# a expressão do MySQL cresce demais e o patch é aplicado em Python.
+MAX_SERVER_SIDE_MOVES = 3
+
+
+class JsonPatchError(ValueError):
+    """
+    Patch malformado (ponteiro inválido, operação sem 'value'/'from').
+    """
+
+
+class JsonPatchConflict(ValueError):
+    """
+    Patch bem formado que não se aplica ao documento atual (caminho inexistente, 'test' falhou).
+    """
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    Ponteiro JSON (RFC 6901) -> lista de tokens ('' é o documento inteiro).
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Ponteiro JSON inválido: '{pointer}'.")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def format_pointer(tokens: List[str]) -> str:
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def _is_index(token: str) -> bool:
+    return token.isdigit() and (token == "0" or not token.startswith("0"))
+
+
+def _check_operation(operation: Dict[str, Any]) -> Tuple[str, List[str], Optional[List[str]]]:
+    op = operation.get("op")
+    if op not in ("add", "remove", "replace", "move", "copy", "test"):
+        raise JsonPatchError(f"Operação desconhecida: '{op}'.")
+    if op in ("add", "replace", "test") and "value" not in operation:
+        raise JsonPatchError(f"A operação '{op}' exige 'value'.")
+    from_tokens = None
+    if op in ("move", "copy"):
+        if operation.get("from") is None:
+            raise JsonPatchError(f"A operação '{op}' exige 'from'.")
+        from_tokens = parse_pointer(operation["from"])
+    return op, parse_pointer(operation.get("path", "")), from_tokens
+
+
+# --- Aplicação em Python ---
+
+_MISSING = object()
+
+
+def _get(document: Any, tokens: List[str]) -> Any:
+    current = document
+    for token in tokens:
+        if isinstance(current, dict):
+            current = current.get(token, _MISSING)
+        elif isinstance(current, list) and _is_index(token) and int(token) < len(current):
+            current = current[int(token)]
+        else:
+            return _MISSING
+        if current is _MISSING:
+            return _MISSING
+    return current
+
+
+def _parent(document: Any, tokens: List[str], pointer: str) -> Any:
+    parent = _get(document, tokens[:-1])
+    if not isinstance(parent, (dict, list)):
+        raise JsonPatchConflict(f"O caminho '{pointer}' não existe no documento.")
+    return parent
+
+
+def _add(document: Any, tokens: List[str], value: Any, pointer: str) -> Any:
+    if not tokens:
+        return value
+    parent, last = _parent(document, tokens, pointer), tokens[-1]
+    if isinstance(parent, dict):
+        parent[last] = value
+    elif last == "-":
+        parent.append(value)
+    elif _is_index(last) and int(last) <= len(parent):
+        parent.insert(int(last), value)
+    else:
+        raise JsonPatchConflict(f"Índice fora do array em '{pointer}'.")
+    return document
+
+
+def _remove(document: Any, tokens: List[str], pointer: str) -> Any:
+    if not tokens or _get(document, tokens) is _MISSING:
+        raise JsonPatchConflict(f"O caminho '{pointer}' não existe no documento.")
+    parent, last = _parent(document, tokens, pointer), tokens[-1]
+    if isinstance(parent, dict):
+        del parent[last]
+    else:
+        del parent[int(last)]
+    return document
+
+
+def apply_patch(document: Optional[Any], operations: List[Dict[str, Any]]) -> Tuple[Any, List[List[str]]]:
+    """
+    Aplica o patch sobre uma cópia do documento (None vira {}).
+    Retorna (novo documento, caminhos alterados em tokens, na ordem da primeira alteração).
+    """
+    result = copy.deepcopy(document) if document is not None else {}
+    changed: List[List[str]] = []
+
+    def touch(tokens: List[str]) -> None:
+        # 'add' em '/lista/-' altera o array inteiro
+        tokens = tokens[:-1] if tokens and tokens[-1] == "-" else tokens
+        if tokens not in changed:
+            changed.append(tokens)
+
+    for operation in operations:
+        op, tokens, from_tokens = _check_operation(operation)
+        pointer = operation.get("path", "")
+        if op == "test":
+            if _get(result, tokens) != operation["value"]:
+                raise JsonPatchConflict(f"O teste do caminho '{pointer}' falhou.")
+            continue
+        if op == "add":
+            result = _add(result, tokens, copy.deepcopy(operation["value"]), pointer)
+        elif op == "remove":
+            result = _remove(result, tokens, pointer)
+        elif op == "replace":
+            if _get(result, tokens) is _MISSING:
+                raise JsonPatchConflict(f"O caminho '{pointer}' não existe no documento.")
+            result = _add(_remove(result, tokens, pointer), tokens, copy.deepcopy(operation["value"]), pointer) if tokens else copy.deepcopy(operation["value"])
+        else: # move / copy
+            value = _get(result, from_tokens)
+            if value is _MISSING:
+                raise JsonPatchConflict(f"O caminho '{operation['from']}' não existe no documento.")
+            if op == "move":
+                if tokens[:len(from_tokens)] == from_tokens and tokens != from_tokens:
+                    raise JsonPatchError("Não é possível mover um valor para dentro dele mesmo.")
+                result = _remove(result, from_tokens, operation["from"])
+                touch(from_tokens)
+            result = _add(result, tokens, copy.deepcopy(value), pointer)
+        touch(tokens)
+    return result, changed
+
+
+def describe_changes(document: Any, changed: List[List[str]]) -> List[Dict[str, Any]]:
+    """
+    Valor final de cada caminho alterado: {"path", "op": "set"|"remove", "value"}.
+    """
+    changes = []
+    for tokens in changed:
+        value = _get(document, tokens)
+        if value is _MISSING:
+            changes.append({"path": format_pointer(tokens), "op": "remove", "value": None})
+        else:
+            changes.append({"path": format_pointer(tokens), "op": "set", "value": value})
+    return changes
+
+
+# --- Expressão MySQL (UPDATE no servidor) ---
+
+def to_mysql_path(tokens: List[str]) -> str:
+    """
+    Tokens -> caminho JSON do MySQL ('$."chave"[0]').
+    """
+    path = "$"
+    for token in tokens:
+        if _is_index(token):
+            path += f"[{token}]"
+        else:
+            escaped = token.replace("\\", "\\\\").replace('"', '\\"')
+            path += f'."{escaped}"'
+    return path
+
+
+def _json_value(value: Any) -> ColumnElement:
+    # JSON_EXTRACT(<texto JSON>, '$') converte o parâmetro em valor JSON (objeto, lista ou escalar)
+    return func.JSON_EXTRACT(literal(json.dumps(value, ensure_ascii=False), String), "$")
+
+
+def _contains_path(expr: ColumnElement, tokens: List[str]) -> ColumnElement:
+    return func.JSON_CONTAINS_PATH(expr, "one", to_mysql_path(tokens)) == 1
+
+
+def supports_server_side(operations: List[Dict[str, Any]]) -> bool:
+    return sum(1 for operation in operations if operation.get("op") in ("move", "copy")) <= MAX_SERVER_SIDE_MOVES
+
+
+def build_mysql_patch(column: ColumnElement, operations: List[Dict[str, Any]]) -> Tuple[ColumnElement, List[ColumnElement], List[List[str]]]:
+    """
+    Converte o patch em (expressão do novo documento, condições para o WHERE, caminhos alterados).
+    Cada operação é aplicada sobre a expressão resultante da anterior, inclusive nas condições,
+    então a sequência tem a mesma semântica da aplicação em Python. Se alguma condição falhar,
+    o UPDATE não altera a linha.
+    """
+    expr: ColumnElement = func.COALESCE(column, func.JSON_OBJECT())
+    conditions: List[ColumnElement] = []
+    changed: List[List[str]] = []
+
+    def touch(tokens: List[str]) -> None:
+        tokens = tokens[:-1] if tokens and tokens[-1] == "-" else tokens
+        if tokens not in changed:
+            changed.append(tokens)
+
+    def add(current: ColumnElement, tokens: List[str], value: ColumnElement) -> ColumnElement:
+        if not tokens:
+            return value
+        parent = tokens[:-1]
+        if parent:
+            conditions.append(_contains_path(current, parent))
+        last = tokens[-1]
+        if last == "-":
+            return func.JSON_ARRAY_APPEND(current, to_mysql_path(parent), value)
+        if _is_index(last):
+            conditions.append(func.JSON_LENGTH(current, to_mysql_path(parent)) >= int(last))
+            return func.JSON_ARRAY_INSERT(current, to_mysql_path(tokens), value)
+        return func.JSON_SET(current, to_mysql_path(tokens), value)
+
+    def remove(current: ColumnElement, tokens: List[str]) -> ColumnElement:
+        if not tokens:
+            raise JsonPatchConflict("Não é possível remover o documento inteiro.")
+        conditions.append(_contains_path(current, tokens))
+        return func.JSON_REMOVE(current, to_mysql_path(tokens))
+
+    for operation in operations:
+        op, tokens, from_tokens = _check_operation(operation)
+        if op == "test":
+            conditions.append(func.JSON_EXTRACT(expr, to_mysql_path(tokens)) == _json_value(operation["value"]))
+            continue
+        if op == "add":
+            expr = add(expr, tokens, _json_value(operation["value"]))
+        elif op == "remove":
+            expr = remove(expr, tokens)
+        elif op == "replace":
+            if tokens:
+                conditions.append(_contains_path(expr, tokens))
+                expr = func.JSON_REPLACE(expr, to_mysql_path(tokens), _json_value(operation["value"]))
+            else:
+                expr = _json_value(operation["value"])
+        else: # move / copy
+            conditions.append(_contains_path(expr, from_tokens))
+            value = func.JSON_EXTRACT(expr, to_mysql_path(from_tokens))
+            if op == "move":
+                if tokens[:len(from_tokens)] == from_tokens and tokens != from_tokens:
+                    raise JsonPatchError("Não é possível mover um valor para dentro dele mesmo.")
+                expr = remove(expr, from_tokens)
+                touch(from_tokens)
+            expr = add(expr, tokens, value)
+        touch(tokens)
+    return expr, [and_(*conditions)] if conditions else [], changed
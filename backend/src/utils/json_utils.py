@@ -0,0 +1,155 @@
+# File: backend/src/utils/json_utils.py
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+class JsonObjectExtractor:
+    """
+    Extrator incremental do primeiro objeto JSON presente em um texto livre.
+    Aceita a resposta em pedaços (ex: streaming da IA) via 'feed' e devolve o objeto
+    assim que ele fecha, sem esperar o fim da resposta. Chaves dentro de strings são
+    ignoradas, e um trecho entre chaves que não é JSON (ex: prosa "{nome}") é descartado,
+    continuando a busca a partir do caractere seguinte.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0 # Próximo caractere a ser analisado
+        self._start: Optional[int] = None # Início do candidato atual ('{' de nível 0)
+        self._stack: List[str] = [] # Fechamentos esperados ('}' ou ']')
+        self._in_string = False
+        self._escape = False
+        self.result: Optional[Dict[str, Any]] = None
+
+    def feed(self, text: str) -> Optional[Dict[str, Any]]:
+        if self.result is not None:
+            return self.result
+        self._buffer += text
+        self._scan()
+        return self.result
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """
+        Indica o fim da resposta. Se um candidato ficou aberto (ex: aspas soltas na prosa),
+        a busca recomeça logo depois do seu início.
+        """
+        while self.result is None and self._start is not None:
+            self._restart(self._start + 1)
+            self._scan()
+        return self.result
+
+    @property
+    def unfinished(self) -> Optional[str]:
+        """
+        Trecho do candidato ainda aberto (ex: resposta truncada pelo limite de tokens).
+        """
+        if self._start is None:
+            return None
+        return self._buffer[self._start:]
+
+    def _restart(self, position: int) -> None:
+        self._pos = position
+        self._start = None
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def _scan(self) -> None:
+        buffer = self._buffer
+        while self.result is None and self._pos < len(buffer):
+            char = buffer[self._pos]
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos
+                    self._stack = ["}"]
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._stack.append("}")
+            elif char == "[":
+                self._stack.append("]")
+            elif char in "}]":
+                if char != self._stack[-1]:
+                    # Fechamento incoerente: não é JSON, tenta a partir do próximo '{'
+                    self._restart(self._start + 1)
+                    continue
+                self._stack.pop()
+                if not self._stack:
+                    candidate_start = self._start
+                    parsed = _loads_object(buffer[candidate_start:self._pos + 1])
+                    if parsed is not None:
+                        self.result = parsed
+                        self._pos += 1
+                        return
+                    self._restart(candidate_start + 1)
+                    continue
+            self._pos += 1
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Retorna o primeiro objeto JSON válido encontrado no texto, ou None.
+    """
+    extractor = JsonObjectExtractor()
+    extractor.feed(text or "")
+    return extractor.finish()
+
+
+def repair_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Reparo local e barato de JSON quase válido: remove vírgulas finais e fecha
+    chaves/colchetes/strings de uma resposta truncada. Retorna None se não resolver.
+    """
+    extractor = JsonObjectExtractor()
+    extractor.feed(_TRAILING_COMMA.sub(r"\1", text or ""))
+    if extractor.result is not None:
+        return extractor.result
+    candidate = extractor.unfinished
+    if candidate is None:
+        return None
+
+    closers: List[str] = []
+    in_string = False
+    escape = False
+    for char in candidate:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers and closers[-1] == char:
+            closers.pop()
+
+    if in_string:
+        candidate += '"'
+    candidate = candidate.rstrip().rstrip(",")
+    candidate = _TRAILING_COMMA.sub(r"\1", candidate + "".join(reversed(closers)))
+    return _loads_object(candidate)
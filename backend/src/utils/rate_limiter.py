@@ -0,0 +1,41 @@
+# File: backend/src/utils/rate_limiter.py
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class ProviderRateLimiter:
+    """
+    Limitador de chamadas por provedor de IA (ex: 'DeepSeek', 'Gemini').
+    Espaça as chamadas de um mesmo provedor em intervalos de 60/limite segundos,
+    compartilhando a cota entre todas as corrotinas do processo.
+    """
+
+    def __init__(self):
+        self._next_slot: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, provider: str, calls_per_minute: Optional[int]) -> float:
+        """
+        Aguarda a vez do provedor. Sem limite configurado (None ou <= 0) retorna na hora.
+        Retorna o tempo de espera, em segundos.
+        """
+        if not calls_per_minute or calls_per_minute <= 0:
+            return 0.0
+        interval = 60.0 / calls_per_minute
+        lock = self._locks.setdefault(provider, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_slot.get(provider, now) - now)
+            self._next_slot[provider] = max(now, self._next_slot.get(provider, now)) + interval
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def reset(self) -> None:
+        self._next_slot.clear()
+        self._locks.clear()
+
+
+provider_rate_limiter = ProviderRateLimiter()
@@ -0,0 +1,40 @@
+# File: backend/src/utils/token_utils.py
+
+from typing import List
+
+# Aproximação usada pelos provedores para textos em português/inglês: ~4 caracteres por token.
+# Não depende do tokenizer do modelo, então serve apenas para dimensionar prompts com folga.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estima a quantidade de tokens de um texto.
+    """
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def split_lines_into_chunks(lines: List[str], max_tokens: int) -> List[str]:
+    """
+    Agrupa linhas (ex: mensagens de uma transcrição) em blocos de até 'max_tokens'
+    tokens estimados, sem quebrar a ordem. Uma linha sozinha maior que o limite
+    é fatiada por caracteres.
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for line in lines:
+        pieces = [line[i:i + max_chars] for i in range(0, len(line), max_chars)] or [""]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -1,5 +1,6 @@
 import pytest
 import logging
+from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session, configure_mappers
 from fastapi.testclient import TestClient
@@ -7,6 +8,7 @@ from typing import Optional
 
 # --- Importações da Aplicação ---
 from src.main import app
+from src.db import query_budget
 from src.db.database import Base, get_db
 from src.core.security import get_password_hash
 from src.core.config import settings
@@ -84,6 +86,7 @@ def db_session_override():
     # --- LIMPEZA DE DADOS (ORDEM DE DEPENDÊNCIA CRÍTICA PARA FKs) ---
     # Deletar os filhos antes dos pais para evitar violações de chave estrangeira.
     # Agora você pode referenciar os modelos diretamente usando 'src.models.NomeDoModelo'
+    session.query(src.models.Job).delete()
     session.query(src.models.ConversationHistory).delete() # <--- MUDANÇA AQUI
     session.query(src.models.Briefing).delete()            # <--- MUDANÇA AQUI
     session.query(src.models.Employee).delete()            # <--- MUDANÇA AQUI
@@ -127,6 +130,48 @@ def client(db_session_override: Session):
     app.router.on_startup = original_startup_events
     logger.info("Cliente de teste FastAPI e dependências restauradas.")
 
+# --- Orçamento de SQL por requisição (ver src/db/query_budget.py) ---
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_statements, repeat_threshold=None): falha o teste se alguma requisição passar do orçamento de SQL",
+    )
+
+@contextmanager
+def _enforce_query_budget(max_statements: int, repeat_threshold: Optional[int] = None):
+    """
+    Falha o teste quando uma requisição feita dentro do bloco executa mais de 'max_statements'
+    comandos SQL ou repete um mesmo comando 'repeat_threshold' vezes (provável N+1).
+    O tempo de banco não entra: nos testes ele depende da máquina.
+    """
+    requests = []
+    query_budget.request_observers.append(requests.append)
+    try:
+        yield requests
+    finally:
+        query_budget.request_observers.remove(requests.append)
+    for stats in requests:
+        reasons = stats.over_budget(max_statements, max_db_ms=float("inf"), repeat_threshold=repeat_threshold)
+        if reasons:
+            pytest.fail(f"Orçamento de SQL excedido ({'; '.join(reasons)})\n{stats.describe()}", pytrace=False)
+
+@pytest.fixture
+def query_budget_limit():
+    """
+    Uso: with query_budget_limit(3): client.get(...)
+    """
+    return _enforce_query_budget
+
+@pytest.fixture(autouse=True)
+def _query_budget_marker(request):
+    # @pytest.mark.query_budget(5): o orçamento vale para todas as requisições do teste
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    with _enforce_query_budget(*marker.args, **marker.kwargs):
+        yield
+
 # --- Funções Auxiliares para Criação de Entidades de Teste ---
 # Essas funções criam e persistem entidades diretamente no DB de teste.
 
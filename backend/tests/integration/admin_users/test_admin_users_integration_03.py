@@ -0,0 +1,22 @@
+# File: backend/tests/integration/admin_users/test_admin_users_integration_03.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_admin_user, create_test_user
+
+from src.core.security import create_access_token
+
+
+# Teste: a rota de métricas do pool é exclusiva de administradores
+def test_db_pool_metrics_endpoint_admin_only(client: TestClient, db_session_override: Session):
+    admin = create_test_admin_user(db_session_override, "pool_admin")
+    admin_token = create_access_token({"id": admin.id, "username": admin.username, "email": None, "user_type": "admin"})
+    user = create_test_user(db_session_override, "Comum", "comum_pool@example.com", "ComumP@ss1")
+    user_token = create_access_token({"id": user.id, "username": user.nickname, "email": user.email, "user_type": "user"})
+
+    response = client.get("/monitoring/db_pool", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert {"checked_out", "overflow", "timeouts", "wait_avg_ms", "wait_max_ms"} <= set(response.json())
+
+    response = client.get("/monitoring/db_pool", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
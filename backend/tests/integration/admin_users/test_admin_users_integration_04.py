@@ -0,0 +1,76 @@
+# File: backend/tests/integration/admin_users/test_admin_users_integration_04.py
+
+import csv
+import io
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_admin_user, create_test_user
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds, conversation_history_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+
+
+def _admin_headers(db: Session):
+    admin = create_test_admin_user(db, "export_admin")
+    token = create_access_token({"id": admin.id, "username": admin.username, "email": None, "user_type": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+# Teste: exportação de usuários e briefings em NDJSON e CSV, com filtros, em vários lotes
+def test_export_users_and_briefings(client: TestClient, db_session_override: Session, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2) # Força vários lotes do keyset
+    headers = _admin_headers(db_session_override)
+    users = [create_test_user(db_session_override, f"Export {i}", f"export_{i}@example.com", "ExportP@ss1") for i in range(5)]
+    users[4].status = "blocked"
+    db_session_override.commit()
+    for user in users[:3]:
+        briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Site", content={"dono": user.nickname}), user_id=user.id)
+
+    response = client.get("/exports/users", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = _ndjson(response)
+    assert [row["email"] for row in rows] == [f"export_{i}@example.com" for i in range(5)]
+    assert "password_hash" not in rows[0] and "two_factor_secret" not in rows[0]
+
+    blocked = _ndjson(client.get("/exports/users", params={"status": "blocked"}, headers=headers))
+    assert [row["email"] for row in blocked] == ["export_4@example.com"]
+    assert _ndjson(client.get("/exports/users", params={"created_to": "2000-01-01T00:00:00"}, headers=headers)) == []
+
+    response = client.get("/exports/briefings", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    assert 'filename="briefings.csv"' in response.headers["content-disposition"]
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(records) == 3
+    assert json.loads(records[0]["content"]) == {"dono": "Export 0"}
+
+
+# Teste: históricos exportados incluem as mensagens arquivadas; rota exclusiva de administradores
+def test_export_conversation_histories(client: TestClient, db_session_override: Session):
+    headers = _admin_headers(db_session_override)
+    user = create_test_user(db_session_override, "Export Chat", "export_chat@example.com", "ExportP@ss1")
+    archived = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Antigo"), user_id=user.id)
+    active = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Atual"), user_id=user.id)
+    for briefing_id, text in ((archived.id, "velha 1"), (archived.id, "velha 2"), (active.id, "nova")):
+        conversation_history_cruds.create_conversation_entry(db_session_override, ConversationHistoryCreate(
+            briefing_id=briefing_id, sender_type="Export Chat", message_content=text
+        ))
+    conversation_history_cruds.archive_briefing_history(db_session_override, archived.id)
+
+    rows = _ndjson(client.get("/exports/conversation_histories", headers=headers))
+    assert sorted(row["message_content"] for row in rows) == ["nova", "velha 1", "velha 2"]
+    assert all(row["timestamp"].endswith("+00:00") for row in rows)
+
+    hot_only = _ndjson(client.get("/exports/conversation_histories", params={"include_archived": "false"}, headers=headers))
+    assert [row["message_content"] for row in hot_only] == ["nova"]
+
+    token = create_access_token({"id": user.id, "username": user.nickname, "email": user.email, "user_type": "user"})
+    assert client.get("/exports/conversation_histories", headers={"Authorization": f"Bearer {token}"}).status_code == 403
@@ -0,0 +1,21 @@
+# File: backend/tests/integration/admin_users/test_admin_users_integration_05.py
+
+from fastapi.testclient import TestClient
+
+from src.db import database
+
+
+# Teste: sondas de liveness/readiness sem autenticação; 503 enquanto o banco não respondeu
+def test_liveness_and_readiness_probes(client: TestClient, monkeypatch):
+    assert client.get("/monitoring/live").json() == {"status": "alive"}
+
+    monkeypatch.setattr(database.readiness, "ready", False)
+    monkeypatch.setattr(database.readiness, "attempts", 3)
+    monkeypatch.setattr(database.readiness, "last_error", "OperationalError")
+    response = client.get("/monitoring/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting", "attempts": 3, "last_error": "OperationalError"}
+
+    monkeypatch.setattr(database.readiness, "ready", True)
+    monkeypatch.setattr(database.readiness, "last_error", None)
+    assert client.get("/monitoring/ready").status_code == 200
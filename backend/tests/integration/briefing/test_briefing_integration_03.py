@@ -0,0 +1,147 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_03.py
+
+import asyncio
+from datetime import timedelta
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user, TestingSessionLocal
+
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds, job_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+from src.services import job_queue_service
+from src.services.job_queue_service import JobWorkerPool
+from src.utils.datetime_utils import get_current_datetime
+
+
+def _pool_session_factory(db: Session):
+    # Sessões próprias do pool, em SAVEPOINT dentro da transação do teste (o rollback do worker não apaga os dados do teste)
+    return lambda: TestingSessionLocal(bind=db.bind, join_transaction_mode="create_savepoint")
+
+
+def _user_headers(user) -> dict:
+    token = create_access_token({"id": user.id, "username": user.nickname, "email": user.email, "user_type": "user"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+# Teste: a compilação responde 202 com uma tarefa, e pedidos repetidos compartilham a mesma tarefa
+def test_compile_returns_job_and_deduplicates(client: TestClient, db_session_override: Session):
+    user = create_test_user(db_session_override, "Compile Job User", "compile_job@example.com", "CompileP@ss1")
+    briefing = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Briefing Job"), user_id=user.id)
+    headers = _user_headers(user)
+
+    first = client.post(f"/briefings/{briefing.id}/compile", headers=headers)
+    second = client.post(f"/briefings/{briefing.id}/compile", headers=headers)
+
+    assert first.status_code == 202
+    assert second.status_code == 202
+    assert first.json()["id"] == second.json()["id"]
+    assert first.json()["status"] == "pending"
+
+    status_response = client.get(f"/jobs/{first.json()['id']}", headers=headers)
+    assert status_response.status_code == 200
+    assert status_response.json()["payload"] == {"briefing_id": briefing.id, "user_id": user.id, "mode": "auto"}
+
+
+# Teste: uma recompilação completa pedida durante uma incremental ativa gera a sua própria tarefa
+def test_compile_dedup_is_per_mode(client: TestClient, db_session_override: Session):
+    user = create_test_user(db_session_override, "Compile Mode User", "compile_mode@example.com", "CompileP@ss1")
+    briefing = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Briefing Modos"), user_id=user.id)
+    headers = _user_headers(user)
+
+    incremental = client.post(f"/briefings/{briefing.id}/compile", params={"mode": "incremental"}, headers=headers).json()
+    full = client.post(f"/briefings/{briefing.id}/compile", params={"mode": "single"}, headers=headers).json()
+    full_again = client.post(f"/briefings/{briefing.id}/compile", params={"mode": "single"}, headers=headers).json()
+
+    assert incremental["id"] != full["id"]
+    assert full_again["id"] == full["id"]
+    assert full["payload"]["mode"] == "single"
+
+
+# Teste: outro usuário não consegue consultar a tarefa
+def test_job_status_forbidden_for_other_user(client: TestClient, db_session_override: Session):
+    owner = create_test_user(db_session_override, "Job Owner", "job_owner@example.com", "OwnerP@ss1")
+    intruder = create_test_user(db_session_override, "Job Intruder", "job_intruder@example.com", "IntruderP@ss1")
+    job = job_cruds.create_job(db_session_override, "compile_briefing", {"briefing_id": 1, "user_id": owner.id}, user_id=owner.id)
+
+    response = client.get(f"/jobs/{job.id}", headers=_user_headers(intruder))
+    assert response.status_code == 403
+
+
+# Teste: falhas de servidor são re-tentadas até o limite; sucesso libera a chave de deduplicação
+def test_job_pool_retries_then_succeeds(db_session_override: Session, monkeypatch):
+    calls = []
+
+    async def flaky_handler(db, payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise HTTPException(status_code=503, detail="IA indisponível")
+        return {"ok": True}
+
+    monkeypatch.setitem(job_queue_service.JOB_HANDLERS, "flaky", flaky_handler)
+    pool = JobWorkerPool(concurrency=1, session_factory=_pool_session_factory(db_session_override))
+    job = job_cruds.create_job(db_session_override, "flaky", {"x": 1}, dedup_key="flaky:1", max_attempts=2)
+
+    first_run = asyncio.run(pool.run_job(job.id))
+    assert first_run.status == "pending"
+    assert first_run.attempts == 1
+
+    second_run = asyncio.run(pool.run_job(job.id))
+    assert second_run.status == "succeeded"
+    assert second_run.result == {"ok": True}
+    assert second_run.dedup_key is None
+
+
+# Teste: erros do cliente (4xx) não são re-tentados
+def test_job_pool_does_not_retry_client_errors(db_session_override: Session, monkeypatch):
+    async def not_found_handler(db, payload):
+        raise HTTPException(status_code=404, detail="Sem histórico para compilar.")
+
+    monkeypatch.setitem(job_queue_service.JOB_HANDLERS, "not_found", not_found_handler)
+    pool = JobWorkerPool(concurrency=1, session_factory=_pool_session_factory(db_session_override))
+    job = job_cruds.create_job(db_session_override, "not_found", {}, max_attempts=3)
+
+    final = asyncio.run(pool.run_job(job.id))
+    assert final.status == "failed"
+    assert final.attempts == 1
+    assert "404" in final.error
+
+
+# Teste: a tarefa é tomada por um UPDATE condicional; um segundo worker não a executa de novo
+def test_job_claim_is_atomic(db_session_override: Session, monkeypatch):
+    calls = []
+
+    async def counting_handler(db, payload):
+        calls.append(payload)
+        return {"ok": True}
+
+    monkeypatch.setitem(job_queue_service.JOB_HANDLERS, "counting", counting_handler)
+    job = job_cruds.create_job(db_session_override, "counting", {}, max_attempts=3)
+
+    assert job_cruds.claim_job(db_session_override, job.id) is True
+    assert job_cruds.claim_job(db_session_override, job.id) is False # outro worker/processo
+    db_session_override.refresh(job)
+    assert (job.status, job.attempts) == ("running", 1)
+
+    pool = JobWorkerPool(concurrency=1, session_factory=_pool_session_factory(db_session_override))
+    assert asyncio.run(pool.run_job(job.id)).status == "running"
+    assert calls == []
+
+
+# Teste: no startup só voltam para a fila as tarefas 'running' com a concessão expirada
+def test_only_stale_running_jobs_are_requeued(db_session_override: Session):
+    abandoned = job_cruds.create_job(db_session_override, "counting", {}, dedup_key="lease:abandoned")
+    alive = job_cruds.create_job(db_session_override, "counting", {}, dedup_key="lease:alive")
+    for job in (abandoned, alive):
+        assert job_cruds.claim_job(db_session_override, job.id)
+    abandoned.update_date = get_current_datetime() - timedelta(minutes=10)
+    db_session_override.commit()
+
+    assert job_cruds.requeue_stale_jobs(db_session_override, lease_seconds=300) == [abandoned.id]
+    db_session_override.refresh(abandoned)
+    db_session_override.refresh(alive)
+    assert abandoned.status == "pending"
+    assert alive.status == "running"
+    assert job_cruds.touch_job(db_session_override, alive.id) is True
+    assert job_cruds.get_pending_job_ids(db_session_override) == [abandoned.id]
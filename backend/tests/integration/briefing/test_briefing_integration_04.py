@@ -0,0 +1,151 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_04.py
+
+import asyncio
+import json
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.config import settings
+from src.cruds import briefing_cruds, conversation_history_cruds, employee_cruds
+from src.schemas.briefing_schemas import BriefingCreate, BriefingUpdate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+from src.schemas.employee_schemas import EmployeeCreateInternal
+from src.services import compila_briefing_service, job_queue_service
+from src.utils.token_utils import split_lines_into_chunks, estimate_tokens
+
+
+def _setup_long_interview(db: Session, email: str, total_messages: int):
+    user = create_test_user(db, "Long Interview", email, "LongP@ss1")
+    employee_cruds.create_employee_initial(db, EmployeeCreateInternal(
+        employee_name="Assistente de Palco",
+        employee_script={"context": "Compile o briefing."},
+        ia_name="ChatGPT",
+        endpoint_url="http://test.com",
+        endpoint_key="key",
+        headers_template={},
+        body_template={"messages": []},
+    ))
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Entrevista longa"), user_id=user.id)
+    for i in range(total_messages):
+        conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+            briefing_id=briefing.id, sender_type="Long Interview", message_content=f"resposta {i} " + "x" * 200
+        ))
+    return user, briefing
+
+
+# Teste: os blocos respeitam o limite de tokens e preservam a ordem das linhas
+def test_split_lines_into_chunks_respects_budget():
+    lines = [f"linha {i} " + "y" * 100 for i in range(50)]
+    chunks = split_lines_into_chunks(lines, max_tokens=200)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 200 + 2 for chunk in chunks)
+    assert "\n".join(chunks) == "\n".join(lines)
+
+
+# Teste: o modo em blocos extrai parciais com concorrência limitada e une tudo no content
+def test_chunked_compile_map_reduce(db_session_override: Session, monkeypatch):
+    user, briefing = _setup_long_interview(db_session_override, "long_interview@example.com", 40)
+    monkeypatch.setattr(settings, "COMPILE_CHUNK_MAX_TOKENS", 600)
+    monkeypatch.setattr(settings, "COMPILE_MAP_CONCURRENCY", 2)
+
+    in_flight = {"now": 0, "max": 0}
+    map_calls = []
+
+    async def fake_ai(**kwargs):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if "trecho" in kwargs["system_prompt"] and "lista JSON" not in kwargs["system_prompt"]:
+            map_calls.append(kwargs["user_prompt"])
+            return json.dumps({"trechos": [len(map_calls)]})
+        merged = []
+        for partial in json.loads(kwargs["user_prompt"]):
+            merged.extend(partial["trechos"])
+        return "Aqui está: " + json.dumps({"trechos": sorted(merged)})
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+
+    result = asyncio.run(compila_briefing_service.compile_briefing_content(
+        db_session_override, briefing.id, user.id, mode="auto"
+    ))
+
+    assert result["mode"] == "chunked"
+    assert result["chunks"] == len(map_calls) > 1
+    assert in_flight["max"] <= 2
+    assert result["content"] == {"trechos": list(range(1, len(map_calls) + 1))}
+    db_session_override.refresh(briefing)
+    assert briefing.content == result["content"]
+    assert briefing.status == "Compilado"
+
+
+# Teste: após uma compilação completa, só as mensagens novas são enviadas; roteiro alterado força compilação completa
+def test_incremental_compile_from_watermark(db_session_override: Session, monkeypatch):
+    user, briefing = _setup_long_interview(db_session_override, "incremental@example.com", 3)
+    prompts = []
+
+    async def fake_ai(**kwargs):
+        prompts.append(kwargs)
+        return json.dumps({"versao": len(prompts)})
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+
+    def compile_now():
+        return asyncio.run(compila_briefing_service.compile_briefing_content(db_session_override, briefing.id, user.id))
+
+    first = compile_now()
+    assert first["mode"] == "single"
+    db_session_override.refresh(briefing)
+    watermark = briefing.compiled_until_message_id
+    assert watermark is not None
+
+    for text in ("nova 1", "nova 2", "nova 3"):
+        conversation_history_cruds.create_conversation_entry(db_session_override, ConversationHistoryCreate(
+            briefing_id=briefing.id, sender_type="Long Interview", message_content=text
+        ))
+
+    second = compile_now()
+    assert second["mode"] == "incremental"
+    assert second["new_messages"] == 3
+    assert "resposta 0" not in prompts[-1]["user_prompt"]
+    assert "nova 3" in prompts[-1]["user_prompt"]
+    assert '{"versao": 1}' in prompts[-1]["user_prompt"]
+
+    calls_before = len(prompts)
+    third = compile_now()
+    assert third["new_messages"] == 0
+    assert len(prompts) == calls_before
+
+    assistant = employee_cruds.get_employee_by_name(db_session_override, "Assistente de Palco")
+    assistant.employee_script = {"context": "Roteiro novo."}
+    db_session_override.commit()
+
+    fourth = compile_now()
+    assert fourth["mode"] == "single"
+    assert "resposta 0" in prompts[-1]["user_prompt"]
+
+
+# Teste: edição do usuário feita enquanto a IA compila não é sobrescrita; a compilação termina em 409
+def test_compile_does_not_overwrite_concurrent_edit(db_session_override: Session, monkeypatch):
+    user, briefing = _setup_long_interview(db_session_override, "compile_race@example.com", 3)
+
+    async def fake_ai(**kwargs):
+        # O usuário salva o briefing no meio da chamada à IA
+        briefing_cruds.update_briefing(db_session_override, briefing.id, BriefingUpdate(content={"editado": "pelo usuário"}))
+        return json.dumps({"compilado": True})
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+
+    with pytest.raises(HTTPException) as conflict:
+        asyncio.run(compila_briefing_service.compile_briefing_content(db_session_override, briefing.id, user.id))
+
+    assert conflict.value.status_code == 409
+    assert job_queue_service._is_retryable(conflict.value) # a nova tentativa parte do conteúdo editado
+    db_session_override.expire_all()
+    stored = briefing_cruds.get_briefing(db_session_override, briefing.id)
+    assert stored.content == {"editado": "pelo usuário"}
+    assert stored.last_edited_by == "user"
+    assert stored.compiled_until_message_id is None
@@ -0,0 +1,86 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_05.py
+
+import asyncio
+import json
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.cruds import briefing_cruds, conversation_history_cruds, employee_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+from src.schemas.employee_schemas import EmployeeCreateInternal
+from src.services import compila_briefing_service
+from src.utils.json_utils import JsonObjectExtractor, extract_json_object, repair_json_object
+
+
+def _setup_briefing(db: Session, email: str, employee_script: dict):
+    user = create_test_user(db, "Structured Output", email, "StructP@ss1")
+    employee_cruds.create_employee_initial(db, EmployeeCreateInternal(
+        employee_name="Assistente de Palco",
+        employee_script=employee_script,
+        ia_name="ChatGPT",
+        endpoint_url="http://test.com",
+        endpoint_key="key",
+        headers_template={},
+        body_template={"messages": []},
+    ))
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Briefing estruturado"), user_id=user.id)
+    conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+        briefing_id=briefing.id, sender_type="Structured Output", message_content="Minha empresa vende {bolos}."
+    ))
+    return user, briefing
+
+
+# Teste: o extrator ignora chaves na prosa e dentro de strings, e entrega o objeto em streaming
+def test_json_extractor_handles_prose_and_stream():
+    text = 'Use o campo {nome} assim: {"titulo": "Loja {centro}", "itens": [1, {"a": "}"}]} e pronto {"outro": 1}'
+    assert extract_json_object(text) == {"titulo": "Loja {centro}", "itens": [1, {"a": "}"}]}
+
+    extractor = JsonObjectExtractor()
+    pieces = ['Claro! {"empresa"', ': "Bolos", "servicos": ["enc', 'omendas"]', '} Mais algum texto']
+    results = [extractor.feed(piece) for piece in pieces]
+    assert results[:3] == [None, None, None]
+    assert results[3] == {"empresa": "Bolos", "servicos": ["encomendas"]}
+
+    assert repair_json_object('{"empresa": "Bolos", "servicos": ["a", "b",], "obs": "trunc') == {
+        "empresa": "Bolos", "servicos": ["a", "b"], "obs": "trunc"
+    }
+
+
+# Teste: a compilação pede JSON mode e aceita a resposta com prosa ao redor sem reparo
+def test_compile_requests_json_mode(db_session_override: Session, monkeypatch):
+    user, briefing = _setup_briefing(db_session_override, "json_mode@example.com", {"context": "Compile."})
+    calls = []
+
+    async def fake_ai(**kwargs):
+        calls.append(kwargs)
+        return 'Segue o briefing {com chaves na prosa}: {"empresa": "Bolos"}'
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+    result = asyncio.run(compila_briefing_service.compile_briefing_content(db_session_override, briefing.id, user.id))
+
+    assert result["content"] == {"empresa": "Bolos"}
+    assert len(calls) == 1
+    assert calls[0]["json_mode"] is True
+    assert "JSON" in calls[0]["system_prompt"]
+
+
+# Teste: resposta sem os campos obrigatórios passa por uma chamada curta de reparo, sem reenviar a transcrição
+def test_compile_repairs_invalid_output(db_session_override: Session, monkeypatch):
+    script = {"context": "Compile.", "required_fields": ["empresa", "publico_alvo"]}
+    user, briefing = _setup_briefing(db_session_override, "repair@example.com", script)
+    calls = []
+
+    async def fake_ai(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            return '{"empresa": "Bolos"'
+        return json.dumps({"empresa": "Bolos", "publico_alvo": "festas"})
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+    result = asyncio.run(compila_briefing_service.compile_briefing_content(db_session_override, briefing.id, user.id))
+
+    assert result["content"] == {"empresa": "Bolos", "publico_alvo": "festas"}
+    assert len(calls) == 2
+    assert "publico_alvo" in calls[1]["system_prompt"]
+    assert "Minha empresa vende" not in calls[1]["user_prompt"]
@@ -0,0 +1,53 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_06.py
+
+import re
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds
+from src.models.briefing_models import Briefing
+from src.schemas.briefing_schemas import BriefingCreate
+from src.utils.datetime_utils import format_datetime_str, parse_datetime_str
+
+DISPLAY_PATTERN = re.compile(r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}$")
+
+
+# Teste: as datas ficam em DATETIME (UTC) no banco e saem na API no formato 'DD/MM/YYYY HH:MM:SS'
+def test_briefing_dates_are_datetime_with_compatible_output(client: TestClient, db_session_override: Session):
+    user = create_test_user(db_session_override, "Date User", "date_user@example.com", "DateP@ss1")
+    briefing = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Datas"), user_id=user.id)
+
+    assert isinstance(briefing.creation_date, datetime)
+    assert briefing.creation_date.tzinfo is not None
+
+    token = create_access_token({"id": user.id, "username": user.nickname, "email": user.email, "user_type": "user"})
+    response = client.get("/briefings/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    item = response.json()[0]
+    assert DISPLAY_PATTERN.match(item["creation_date"])
+    assert item["creation_date"] == format_datetime_str(briefing.creation_date)
+
+
+# Teste: textos nos formatos antigos são convertidos (horário de Fortaleza -> UTC) e permitem filtros por janela de tempo
+def test_legacy_strings_are_converted_and_range_queries_work(db_session_override: Session):
+    user = create_test_user(db_session_override, "Range User", "range_user@example.com", "RangeP@ss1")
+    old = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Antigo"), user_id=user.id)
+    recent = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Recente"), user_id=user.id)
+    old.update_date = "01/02/2024 08:30:00"
+    recent.update_date = "2026-10-19 08:30:00"
+    db_session_override.commit()
+    db_session_override.refresh(old)
+
+    assert old.update_date == datetime(2024, 2, 1, 11, 30, tzinfo=timezone.utc)
+    assert parse_datetime_str("01/02/2024 08:30:00") == old.update_date
+
+    window_start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    in_window = (
+        db_session_override.query(Briefing.id)
+        .filter(Briefing.user_id == user.id, Briefing.update_date >= window_start, Briefing.update_date < window_start + timedelta(days=365))
+        .all()
+    )
+    assert [row.id for row in in_window] == [recent.id]
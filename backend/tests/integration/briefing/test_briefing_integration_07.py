@@ -0,0 +1,71 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_07.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user, create_test_admin_user
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+
+
+def _headers(user_id: int, username: str, user_type: str) -> dict:
+    token = create_access_token({"id": user_id, "username": username, "email": None, "user_type": user_type})
+    return {"Authorization": f"Bearer {token}"}
+
+
+# Teste: a listagem de briefings é percorrida por cursor, sem OFFSET nas páginas seguintes
+def test_briefings_keyset_pagination(client: TestClient, db_session_override: Session):
+    user = create_test_user(db_session_override, "Pager", "pager@example.com", "PagerP@ss1")
+    created = [
+        briefing_cruds.create_briefing(db_session_override, BriefingCreate(title=f"Página {i}"), user_id=user.id).id
+        for i in range(5)
+    ]
+    headers = _headers(user.id, user.nickname, "user")
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.upper())
+    event.listen(db_session_override.bind, "before_cursor_execute", capture)
+    try:
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            response = client.get("/briefings/", params=params, headers=headers)
+            assert response.status_code == 200
+            seen.extend(item["id"] for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+    finally:
+        event.remove(db_session_override.bind, "before_cursor_execute", capture)
+
+    assert seen == created
+    listing_statements = [s for s in statements if "FROM BRIEFINGS" in s and "LIMIT" in s]
+    assert len(listing_statements) == 3
+    # Páginas seguintes filtram pelo id do cursor em vez de descartar linhas
+    assert all("BRIEFINGS.ID > ?" in s for s in listing_statements[1:])
+
+
+# Teste: 'skip' continua funcionando (obsoleto), cursor inválido gera 400 e 'limit' respeita o teto
+def test_pagination_fallback_and_limits(client: TestClient, db_session_override: Session, monkeypatch):
+    admin = create_test_admin_user(db_session_override, "pager_admin")
+    for i in range(3):
+        create_test_user(db_session_override, f"Listed {i}", f"listed{i}@example.com", "ListedP@ss1")
+    headers = _headers(admin.id, admin.username, "admin")
+    monkeypatch.setattr(settings, "PAGE_SIZE_MAX", 2)
+
+    capped = client.get("/users/", params={"limit": 50}, headers=headers)
+    assert capped.status_code == 200
+    assert len(capped.json()) == 2
+    assert "X-Next-Cursor" in capped.headers
+
+    legacy = client.get("/users/", params={"skip": 1, "limit": 1}, headers=headers)
+    assert legacy.status_code == 200
+    assert legacy.json()[0]["id"] == capped.json()[1]["id"]
+    assert legacy.headers.get("Deprecation") == "true"
+
+    invalid = client.get("/users/", params={"cursor": "não-é-cursor"}, headers=headers)
+    assert invalid.status_code == 400
@@ -0,0 +1,65 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_08.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds, conversation_history_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+
+
+def _setup(db: Session, total_messages: int):
+    user = create_test_user(db, "History Reader", "history_reader@example.com", "ReaderP@ss1")
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Com histórico"), user_id=user.id)
+    for i in range(total_messages):
+        conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+            briefing_id=briefing.id, sender_type="History Reader", message_content=f"mensagem {i}"
+        ))
+    token = create_access_token({"id": user.id, "username": user.nickname, "email": user.email, "user_type": "user"})
+    briefing_id = briefing.id
+    db.expire_all() # Garante que nada do histórico fica em memória antes da requisição
+    return briefing_id, {"Authorization": f"Bearer {token}"}
+
+
+def _count_selects(db: Session, call):
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        # Conta só as consultas do briefing/histórico (a autenticação faz a sua própria busca do usuário)
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" not in statement:
+            statements.append(statement)
+    event.listen(db.bind, "before_cursor_execute", capture)
+    try:
+        response = call()
+    finally:
+        event.remove(db.bind, "before_cursor_execute", capture)
+    return response, statements
+
+
+# Teste: o briefing e todo o histórico são carregados em duas consultas, independentemente do número de mensagens
+def test_get_briefing_with_history_query_count(client: TestClient, db_session_override: Session):
+    briefing_id, headers = _setup(db_session_override, 25)
+
+    response, selects = _count_selects(db_session_override, lambda: client.get(f"/briefings/{briefing_id}", headers=headers))
+
+    assert response.status_code == 200
+    history = response.json()["conversation_history"]
+    assert [m["message_content"] for m in history] == [f"mensagem {i}" for i in range(25)]
+    assert len(selects) == 2
+
+
+# Teste: 'message_limit' devolve só as últimas mensagens, em ordem cronológica, também em duas consultas
+def test_get_briefing_with_bounded_history(client: TestClient, db_session_override: Session):
+    briefing_id, headers = _setup(db_session_override, 25)
+
+    response, selects = _count_selects(
+        db_session_override,
+        lambda: client.get(f"/briefings/{briefing_id}", params={"message_limit": 5}, headers=headers)
+    )
+
+    assert response.status_code == 200
+    history = response.json()["conversation_history"]
+    assert [m["message_content"] for m in history] == [f"mensagem {i}" for i in range(20, 25)]
+    assert len(selects) == 2
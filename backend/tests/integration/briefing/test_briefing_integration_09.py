@@ -0,0 +1,84 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_09.py
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from tests.conftest import create_test_user
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds
+from src.db.database import Base
+from src.db.replica_routing import replica_router
+from src.models.briefing_models import Briefing
+from src.models.user_models import User
+from src.schemas.briefing_schemas import BriefingCreate
+from src.utils.datetime_utils import get_current_datetime
+
+
+@pytest.fixture
+def replica_url(tmp_path, monkeypatch):
+    """
+    Banco SQLite separado fazendo o papel de réplica de leitura.
+    """
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(url)
+    Base.metadata.create_all(bind=replica_engine)
+    replica_engine.dispose()
+    replica_router.reset()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [url])
+    yield url
+    replica_router.reset()
+
+
+def _setup(db: Session, replica_url: str):
+    user = create_test_user(db, "Replica Reader", "replica_reader@example.com", "ReplicaP@ss1")
+    primary_briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Do primário"), user_id=user.id)
+
+    # A réplica ainda não "recebeu" o briefing do primário e tem um só dela, para distinguir a origem
+    replica_engine = create_engine(replica_url)
+    now = get_current_datetime()
+    with sessionmaker(bind=replica_engine)() as replica_db:
+        replica_db.add(User(
+            id=user.id, email=user.email, password_hash=user.password_hash, nickname=user.nickname,
+            status=user.status, creation_date=now
+        ))
+        replica_db.add(Briefing(user_id=user.id, title="Da réplica", status="Em Andamento", creation_date=now, update_date=now))
+        replica_db.commit()
+    replica_engine.dispose()
+
+    token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    return primary_briefing, {"Authorization": f"Bearer {token}"}
+
+
+# Teste: leituras vão para a réplica; após uma escrita do mesmo usuário, as leituras voltam ao primário
+def test_reads_use_replica_until_own_write(client: TestClient, db_session_override: Session, replica_url):
+    primary_briefing, headers = _setup(db_session_override, replica_url)
+
+    response = client.get("/briefings/", headers=headers)
+    assert response.status_code == 200
+    assert [b["title"] for b in response.json()] == ["Da réplica"]
+
+    assert client.delete(f"/briefings/{primary_briefing.id}", headers=headers).status_code == 204
+
+    response = client.get("/briefings/", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [] # Lido do primário, onde o briefing acabou de ser removido
+
+
+# Teste: réplica indisponível sai do rodízio e a leitura cai no primário automaticamente
+def test_unavailable_replica_fails_over_to_primary(client: TestClient, db_session_override: Session, monkeypatch):
+    replica_router.reset()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", ["sqlite:////diretorio/inexistente/replica.db"])
+    try:
+        user = create_test_user(db_session_override, "Failover", "failover@example.com", "FailoverP@ss1")
+        briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Do primário"), user_id=user.id)
+        token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+
+        response = client.get("/briefings/", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert [b["title"] for b in response.json()] == ["Do primário"]
+        assert replica_router.status()[0]["available"] is False
+    finally:
+        replica_router.reset()
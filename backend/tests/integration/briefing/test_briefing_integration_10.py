@@ -0,0 +1,96 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_10.py
+
+import asyncio
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds, conversation_history_cruds, employee_cruds, job_cruds
+from src.models.conversation_history_models import ConversationHistory
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+from src.schemas.employee_schemas import EmployeeCreateInternal
+from src.services import chat_service, history_archive_service, transcript_cache_service
+from src.utils.datetime_utils import get_current_datetime
+
+
+def _briefing_with_messages(db: Session, user_id: int, title: str, total: int, days_ago: int):
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title=title), user_id=user_id)
+    for i in range(total):
+        entry = conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+            briefing_id=briefing.id, sender_type="Arquivo", message_content=f"{title} {i} " + "texto repetido " * 20
+        ))
+        entry.timestamp = get_current_datetime() - timedelta(days=days_ago)
+    briefing.update_date = get_current_datetime() - timedelta(days=days_ago)
+    db.commit()
+    return briefing
+
+
+def _run_archive_job(db: Session):
+    job = job_cruds.create_job(db, job_type="archive_idle_histories", payload={})
+    return asyncio.run(history_archive_service.run_history_archive(db, {"job_id": job.id}))
+
+
+# Teste: o histórico de briefings ociosos vai para o arquivo comprimido e continua legível pelas mesmas rotas/CRUDs
+def test_archive_idle_histories_with_transparent_reads(client: TestClient, db_session_override: Session):
+    db = db_session_override
+    user = create_test_user(db, "Arquivo", "arquivo@example.com", "ArquivoP@ss1")
+    idle = _briefing_with_messages(db, user.id, "Ocioso", 6, days_ago=60)
+    active = _briefing_with_messages(db, user.id, "Ativo", 2, days_ago=1)
+    transcript_before = conversation_history_cruds.get_transcript_rows(db, idle.id)
+    marker_before = conversation_history_cruds.get_conversation_history_marker(db, idle.id)
+
+    result = _run_archive_job(db)
+
+    assert (result["briefings"], result["messages"]) == (1, 6)
+    assert result["compressed_bytes"] < result["raw_bytes"]
+    assert db.query(ConversationHistory).filter(ConversationHistory.briefing_id == idle.id).count() == 0
+    assert db.query(ConversationHistory).filter(ConversationHistory.briefing_id == active.id).count() == 2
+
+    assert conversation_history_cruds.get_transcript_rows(db, idle.id) == transcript_before
+    assert conversation_history_cruds.get_transcript_rows(db, idle.id, after_id=transcript_before[3][0]) == transcript_before[4:]
+    assert conversation_history_cruds.get_recent_transcript_rows(db, idle.id, limit=2) == transcript_before[-2:]
+    assert conversation_history_cruds.get_conversation_history_marker(db, idle.id) == marker_before
+
+    token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    response = client.get(f"/briefings/{idle.id}", params={"message_limit": 4}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()["conversation_history"]] == [row[0] for row in transcript_before[-4:]]
+
+    assert _run_archive_job(db)["briefings"] == 0 # Nada mais a arquivar
+
+
+# Teste: o próximo turno de chat traz o histórico arquivado de volta para a tabela, com os ids originais
+def test_chat_turn_restores_archived_history(db_session_override: Session, monkeypatch):
+    db = db_session_override
+    user = create_test_user(db, "Retorno", "retorno@example.com", "RetornoP@ss1")
+    employee_cruds.create_employee_initial(db, EmployeeCreateInternal(
+        employee_name="Entrevistador",
+        employee_script={"system_prompt": "Entreviste o cliente."},
+        ia_name="ChatGPT",
+        endpoint_url="http://test.com",
+        endpoint_key="key",
+        headers_template={},
+        body_template={"messages": []},
+    ))
+    briefing = _briefing_with_messages(db, user.id, "Retomado", 3, days_ago=90)
+    original_ids = [row[0] for row in conversation_history_cruds.get_transcript_rows(db, briefing.id)]
+    conversation_history_cruds.archive_briefing_history(db, briefing.id)
+    transcript_cache_service.invalidate_transcript(briefing.id)
+
+    prompts = []
+
+    async def fake_ai(**kwargs):
+        prompts.append(kwargs["user_prompt"])
+        return "Vamos continuar."
+
+    monkeypatch.setattr(chat_service, "call_external_ai_api", fake_ai)
+    asyncio.run(chat_service.start_or_continue_chat(db, briefing.id, "Voltei!", "Entrevistador", user.id))
+
+    assert conversation_history_cruds.get_history_archive(db, briefing.id) is None
+    hot_ids = [row.id for row in db.query(ConversationHistory).filter(ConversationHistory.briefing_id == briefing.id).order_by(ConversationHistory.id)]
+    assert hot_ids[:3] == original_ids
+    assert len(hot_ids) == 5
+    assert "Retomado 0" in prompts[0] and "Voltei!" in prompts[0]
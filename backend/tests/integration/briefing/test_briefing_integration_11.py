@@ -0,0 +1,28 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_11.py
+
+from datetime import date
+
+import pytest
+
+from src.db import partitioning
+
+
+# Teste: o esquema por hash do briefing_id (poda na consulta do histórico de um briefing)
+def test_briefing_hash_partition_clause():
+    assert partitioning.build_partition_clause("briefing_hash", 16) == "PARTITION BY HASH(briefing_id) PARTITIONS 16"
+    assert partitioning.partition_primary_key("briefing_hash") == ["id", "briefing_id"]
+    with pytest.raises(ValueError):
+        partitioning.build_partition_clause("por_usuario", 4)
+
+
+# Teste: o esquema mensal cobre do primeiro dado até os meses à frente, com subpartições por briefing_id
+def test_month_partition_clause_and_coverage():
+    months = partitioning.months_to_cover(date(2026, 11, 20), date(2027, 1, 5), months_ahead=1)
+    assert months == [date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1), date(2027, 2, 1)]
+
+    clause = partitioning.build_partition_clause("month", 4, months[:2])
+    assert clause.startswith("PARTITION BY RANGE (TO_DAYS(`timestamp`)) SUBPARTITION BY HASH(briefing_id) SUBPARTITIONS 4 ")
+    assert "PARTITION p202611 VALUES LESS THAN (TO_DAYS('2026-12-01'))" in clause
+    assert "PARTITION p202612 VALUES LESS THAN (TO_DAYS('2027-01-01'))" in clause
+    assert clause.endswith("PARTITION pmax VALUES LESS THAN MAXVALUE)")
+    assert partitioning.partition_primary_key("month") == ["id", "briefing_id", "`timestamp`"]
@@ -0,0 +1,90 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_12.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds
+from src.models.briefing_models import Briefing
+from src.schemas.briefing_schemas import BriefingCreate
+from src.utils.json_patch_utils import build_mysql_patch
+
+CONTENT = {
+    "cliente": {"nome": "Ana", "cidade": "Fortaleza"},
+    "paginas": ["Home", "Contato"],
+    "observacoes": "rascunho",
+}
+
+
+def _setup(db: Session):
+    user = create_test_user(db, "Patch User", "patch_user@example.com", "PatchP@ss1")
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Com conteúdo", content=CONTENT), user_id=user.id)
+    token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    return briefing, {"Authorization": f"Bearer {token}", "Content-Type": "application/json-patch+json"}
+
+
+# Teste: o patch altera só os caminhos pedidos e a resposta traz apenas esses caminhos
+def test_patch_content_returns_only_changed_paths(client: TestClient, db_session_override: Session):
+    briefing, headers = _setup(db_session_override)
+    patch = [
+        {"op": "test", "path": "/cliente/nome", "value": "Ana"},
+        {"op": "replace", "path": "/cliente/cidade", "value": "Recife"},
+        {"op": "add", "path": "/paginas/1", "value": "Sobre"},
+        {"op": "add", "path": "/paginas/-", "value": "Blog"},
+        {"op": "move", "from": "/observacoes", "path": "/notas"},
+    ]
+
+    response = client.patch(f"/briefings/{briefing.id}/content", json=patch, headers=headers)
+
+    assert response.status_code == 200
+    changes = {change["path"]: change for change in response.json()["changes"]}
+    assert changes == {
+        "/cliente/cidade": {"path": "/cliente/cidade", "op": "set", "value": "Recife"},
+        "/paginas/1": {"path": "/paginas/1", "op": "set", "value": "Sobre"},
+        "/paginas": {"path": "/paginas", "op": "set", "value": ["Home", "Sobre", "Contato", "Blog"]},
+        "/observacoes": {"path": "/observacoes", "op": "remove", "value": None},
+        "/notas": {"path": "/notas", "op": "set", "value": "rascunho"},
+    }
+    db_session_override.expire_all()
+    stored = db_session_override.get(Briefing, briefing.id)
+    assert stored.content == {
+        "cliente": {"nome": "Ana", "cidade": "Recife"},
+        "paginas": ["Home", "Sobre", "Contato", "Blog"],
+        "notas": "rascunho",
+    }
+    assert stored.last_edited_by == "user"
+
+
+# Teste: 'test' que falha ou caminho inexistente -> 409, sem gravar nada; patch malformado -> 400
+def test_patch_content_conflicts_leave_document_untouched(client: TestClient, db_session_override: Session):
+    briefing, headers = _setup(db_session_override)
+    url = f"/briefings/{briefing.id}/content"
+
+    failed_test = [{"op": "replace", "path": "/cliente/nome", "value": "Bia"}, {"op": "test", "path": "/cliente/nome", "value": "Ana"}]
+    assert client.patch(url, json=failed_test, headers=headers).status_code == 409
+    assert client.patch(url, json=[{"op": "remove", "path": "/nao/existe"}], headers=headers).status_code == 409
+    assert client.patch(url, json=[{"op": "replace", "path": "sem-barra", "value": 1}], headers=headers).status_code == 400
+
+    db_session_override.expire_all()
+    assert db_session_override.get(Briefing, briefing.id).content == CONTENT
+
+
+# Teste: no MySQL o patch vira um UPDATE com funções JSON e pré-condições no WHERE
+def test_mysql_patch_expression():
+    patch = [
+        {"op": "test", "path": "/cliente/nome", "value": "Ana"},
+        {"op": "replace", "path": "/cliente/cidade", "value": "Recife"},
+        {"op": "remove", "path": "/observacoes"},
+        {"op": "add", "path": "/paginas/-", "value": "Blog"},
+    ]
+    expression, conditions, changed = build_mysql_patch(Briefing.content, patch)
+    sql = str(expression.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+    where = str(conditions[0].compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert sql.startswith("JSON_ARRAY_APPEND(JSON_REMOVE(JSON_REPLACE(coalesce(briefings.content, JSON_OBJECT())")
+    assert '$."cliente"."cidade"' in sql and '$."observacoes"' in sql
+    assert "JSON_EXTRACT(coalesce(briefings.content, JSON_OBJECT()), '$.\"cliente\".\"nome\"')" in where
+    assert "JSON_CONTAINS_PATH" in where
+    assert changed == [["cliente", "cidade"], ["observacoes"], ["paginas"]]
@@ -0,0 +1,107 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_13.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds
+from src.models.briefing_models import Briefing
+from src.schemas.briefing_schemas import BriefingCreate
+
+
+def _setup(db: Session):
+    user = create_test_user(db, "Versioned User", "versioned_user@example.com", "VersionP@ss1")
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Versionado", content={"a": 1}), user_id=user.id)
+    token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    return briefing.id, {"Authorization": f"Bearer {token}"}
+
+
+def _capture_statements(db: Session, call):
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        # Ignora a busca do usuário feita pela autenticação
+        if "FROM users" not in statement:
+            statements.append(statement.lstrip().split()[0].upper())
+    event.listen(db.bind, "before_cursor_execute", capture)
+    try:
+        response = call()
+    finally:
+        event.remove(db.bind, "before_cursor_execute", capture)
+    return response, statements
+
+
+# Teste: ETag na leitura, If-Match na escrita; uma versão antiga resulta em 409 sem sobrescrever
+def test_briefing_update_with_if_match(client: TestClient, db_session_override: Session):
+    briefing_id, headers = _setup(db_session_override)
+
+    read = client.get(f"/briefings/{briefing_id}", headers=headers)
+    assert read.status_code == 200
+    etag = read.headers["ETag"]
+    assert etag == '"1"'
+
+    first = client.put(f"/briefings/{briefing_id}", json={"status": "Revisado"}, headers={**headers, "If-Match": etag})
+    assert first.status_code == 200
+    assert first.headers["ETag"] == '"2"'
+    assert first.json()["status"] == "Revisado"
+    assert first.json()["last_edited_by"] == "user"
+
+    # Segunda edição feita a partir da mesma leitura: perdeu a corrida
+    stale = client.put(f"/briefings/{briefing_id}", json={"status": "Outro"}, headers={**headers, "If-Match": etag})
+    assert stale.status_code == 409
+
+    # A compilação também conta como escrita
+    briefing_cruds.save_compiled_content(db_session_override, briefing_id, {"b": 2}, 0, "v1")
+    patch = client.patch(
+        f"/briefings/{briefing_id}/content", json=[{"op": "add", "path": "/c", "value": 3}],
+        headers={**headers, "If-Match": '"2"'}
+    )
+    assert patch.status_code == 409
+
+    db_session_override.expire_all()
+    stored = db_session_override.get(Briefing, briefing_id)
+    assert stored.status == "Compilado"
+    assert stored.content == {"b": 2}
+    assert stored.version == 3
+
+    assert client.put(f"/briefings/{briefing_id}", json={"status": "x"}, headers={**headers, "If-Match": "abc"}).status_code == 400
+
+
+# Teste: a atualização é um único UPDATE (com RETURNING); no conflito não há SELECT depois dele
+def test_briefing_update_round_trips(client: TestClient, db_session_override: Session):
+    briefing_id, headers = _setup(db_session_override)
+
+    ok, statements = _capture_statements(db_session_override, lambda: client.put(
+        f"/briefings/{briefing_id}", json={"title": "Novo título"}, headers={**headers, "If-Match": '"1"'}
+    ))
+    assert ok.status_code == 200
+    assert ok.json()["title"] == "Novo título"
+    # Busca do dono + UPDATE ... RETURNING
+    assert statements == ["SELECT", "UPDATE"]
+
+    conflict, statements = _capture_statements(db_session_override, lambda: client.put(
+        f"/briefings/{briefing_id}", json={"title": "Outro título"}, headers={**headers, "If-Match": '"1"'}
+    ))
+    assert conflict.status_code == 409
+    assert statements == ["SELECT", "UPDATE"]
+
+
+# Teste: o perfil do usuário segue a mesma regra
+def test_user_profile_update_with_if_match(client: TestClient, db_session_override: Session):
+    _, headers = _setup(db_session_override)
+
+    read = client.get("/users/me", headers=headers)
+    assert read.status_code == 200
+    etag = read.headers["ETag"]
+
+    updated = client.put("/users/me", json={"nickname": "Novo Apelido"}, headers={**headers, "If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["nickname"] == "Novo Apelido"
+    assert updated.headers["ETag"] != etag
+
+    stale = client.put("/users/me", json={"nickname": "Perdido"}, headers={**headers, "If-Match": etag})
+    assert stale.status_code == 409
+
+    unconditional = client.put("/users/me", json={"nickname": "Sem Condição"}, headers=headers)
+    assert unconditional.status_code == 200
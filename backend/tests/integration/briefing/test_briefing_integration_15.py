@@ -0,0 +1,132 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_15.py
+
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user, create_test_admin_user, TestingSessionLocal
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds
+from src.models.briefing_models import Briefing
+from src.models.conversation_history_models import ConversationHistory
+from src.models.job_models import Job
+from src.models.user_models import User
+from src.schemas.briefing_schemas import BriefingCreate
+from src.services import job_queue_service
+from src.services.job_queue_service import JobWorkerPool
+from src.utils.datetime_utils import get_current_datetime
+
+
+def _user_headers(user):
+    token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _briefing_with_messages(db: Session, user_id: int, title: str, count: int) -> int:
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title=title), user_id=user_id)
+    now = get_current_datetime()
+    db.add_all([
+        ConversationHistory(briefing_id=briefing.id, sender_type="Purge User", message_content=f"m{i}", timestamp=now)
+        for i in range(count)
+    ])
+    db.query(Briefing).filter(Briefing.id == briefing.id).update({"message_count": count})
+    db.commit()
+    return briefing.id
+
+
+def _history_count(db: Session, briefing_id: int) -> int:
+    return db.query(func.count(ConversationHistory.id)).filter(ConversationHistory.briefing_id == briefing_id).scalar()
+
+
+def _missing(db: Session, model, object_id: int) -> bool:
+    return db.query(model.id).filter(model.id == object_id).first() is None
+
+
+def _run_job(db: Session, job_id: int):
+    pool = JobWorkerPool(
+        concurrency=1,
+        session_factory=lambda: TestingSessionLocal(bind=db.bind, join_transaction_mode="create_savepoint")
+    )
+    return asyncio.run(pool.run_job(job_id))
+
+
+# Teste: briefing pequeno sai na hora, sem carregar as mensagens no ORM
+def test_delete_small_briefing_without_loading_history(client: TestClient, db_session_override: Session):
+    user = create_test_user(db_session_override, "Purge User", "purge_small@example.com", "PurgeP@ss1")
+    briefing_id = _briefing_with_messages(db_session_override, user.id, "Pequeno", 20)
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db_session_override.bind, "before_cursor_execute", capture)
+    try:
+        response = client.delete(f"/briefings/{briefing_id}", headers=_user_headers(user))
+    finally:
+        event.remove(db_session_override.bind, "before_cursor_execute", capture)
+
+    assert response.status_code == 204
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM conversation_histories" in s]
+    assert _history_count(db_session_override, briefing_id) == 0
+    assert _missing(db_session_override, Briefing, briefing_id)
+
+
+# Teste: briefing grande é excluído logicamente e o histórico sai em lotes pela tarefa
+def test_delete_large_briefing_soft_delete_then_purge(client: TestClient, db_session_override: Session, monkeypatch):
+    monkeypatch.setattr(settings, "PURGE_SOFT_DELETE_MIN_MESSAGES", 10)
+    monkeypatch.setattr(settings, "PURGE_BATCH_SIZE", 7)
+    monkeypatch.setattr(job_queue_service.job_pool, "enqueue", lambda job_id: None)
+    user = create_test_user(db_session_override, "Purge User", "purge_large@example.com", "PurgeP@ss1")
+    headers = _user_headers(user)
+    briefing_id = _briefing_with_messages(db_session_override, user.id, "Grande", 30)
+
+    response = client.delete(f"/briefings/{briefing_id}", headers=headers)
+
+    assert response.status_code == 204
+    assert client.get(f"/briefings/{briefing_id}", headers=headers).status_code == 404
+    assert _history_count(db_session_override, briefing_id) == 30 # Ainda não removido
+    # O título fica livre imediatamente
+    assert briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Grande"), user_id=user.id).id != briefing_id
+
+    job = db_session_override.query(Job).filter(Job.job_type == job_queue_service.PURGE_JOB).one()
+    assert job.payload == {"briefing_id": briefing_id}
+    finished = _run_job(db_session_override, job.id)
+
+    assert finished.status == "succeeded"
+    assert finished.result == {"briefings": 1, "messages": 30}
+    db_session_override.expire_all()
+    assert _history_count(db_session_override, briefing_id) == 0
+    assert _missing(db_session_override, Briefing, briefing_id)
+
+
+# Teste: exclusão de usuário leva briefings e históricos (direta ou em segundo plano)
+def test_delete_user_removes_briefings(client: TestClient, db_session_override: Session, monkeypatch):
+    monkeypatch.setattr(settings, "PURGE_SOFT_DELETE_MIN_MESSAGES", 10)
+    monkeypatch.setattr(job_queue_service.job_pool, "enqueue", lambda job_id: None)
+    admin = create_test_admin_user(db_session_override, "purge_admin")
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'id': admin.id, 'username': admin.username, 'email': None, 'user_type': 'admin'})}"}
+    small = create_test_user(db_session_override, "Purge Small", "purge_user_small@example.com", "PurgeP@ss1")
+    large = create_test_user(db_session_override, "Purge Large", "purge_user_large@example.com", "PurgeP@ss1")
+    small_briefing = _briefing_with_messages(db_session_override, small.id, "Do pequeno", 3)
+    large_briefings = [_briefing_with_messages(db_session_override, large.id, f"Do grande {i}", 8) for i in range(2)]
+    large_headers = _user_headers(large)
+    small_id, large_id = small.id, large.id
+
+    assert client.delete(f"/users/{small_id}", headers=admin_headers).status_code == 204
+    assert _missing(db_session_override, User, small_id)
+    assert _missing(db_session_override, Briefing, small_briefing)
+    assert _history_count(db_session_override, small_briefing) == 0
+
+    assert client.delete(f"/users/{large_id}", headers=admin_headers).status_code == 204
+    # Exclusão lógica: o token deixa de valer, os dados saem na tarefa
+    assert client.get("/briefings/", headers=large_headers).status_code == 404
+    job = db_session_override.query(Job).filter(Job.job_type == job_queue_service.PURGE_JOB).one()
+    finished = _run_job(db_session_override, job.id)
+
+    assert finished.status == "succeeded"
+    assert finished.result["user_deleted"] is True
+    assert (finished.result["briefings"], finished.result["messages"]) == (2, 16)
+    db_session_override.expire_all()
+    assert _missing(db_session_override, User, large_id)
+    assert all(_history_count(db_session_override, b) == 0 for b in large_briefings)
@@ -0,0 +1,156 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_16.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user, create_test_admin_user
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds, conversation_history_cruds, user_cruds
+from src.db import search_index
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+
+
+def _admin_headers(db: Session):
+    admin = create_test_admin_user(db, "search_admin")
+    token = create_access_token({"id": admin.id, "username": admin.username, "email": None, "user_type": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _say(db: Session, briefing_id: int, text: str):
+    return conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+        briefing_id=briefing_id, sender_type="Search User", message_content=text
+    ))
+
+
+# Teste: mensagens gravadas entram no índice na hora; busca sem acento, com destaque e HTML escapado
+def test_search_messages_with_highlight(client: TestClient, db_session_override: Session):
+    headers = _admin_headers(db_session_override)
+    user = create_test_user(db_session_override, "Search User", "search_user@example.com", "SearchP@ss1")
+    briefing = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Loja virtual"), user_id=user.id)
+    entry = _say(db_session_override, briefing.id, "O orçamento da <loja> é de 20 mil reais.")
+    _say(db_session_override, briefing.id, "Quero pagamento por Pix.")
+
+    response = client.get("/search/", params={"q": "orcamento"}, headers=headers)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 1
+    assert (items[0]["source_type"], items[0]["source_id"], items[0]["briefing_id"]) == ("message", entry.id, briefing.id)
+    assert items[0]["briefing_title"] == "Loja virtual"
+    assert "<mark>orçamento</mark>" in items[0]["snippet"]
+    assert "&lt;loja&gt;" in items[0]["snippet"]
+
+    user_token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    assert client.get("/search/", params={"q": "pix"}, headers={"Authorization": f"Bearer {user_token}"}).status_code in (401, 403)
+    assert client.get("/search/", params={"q": "!!!"}, headers=headers).status_code == 400
+
+
+# Teste: conteúdo compilado, escopo e paginação por keyset sem repetir resultados
+def test_search_briefing_content_and_keyset_paging(client: TestClient, db_session_override: Session):
+    headers = _admin_headers(db_session_override)
+    user = create_test_user(db_session_override, "Search User", "search_paging@example.com", "SearchP@ss1")
+    briefing = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Aplicativo"), user_id=user.id)
+    for i in range(5):
+        _say(db_session_override, briefing.id, f"Mensagem {i} sobre o aplicativo de delivery" + " delivery" * i)
+    briefing_cruds.save_compiled_content(
+        db_session_override, briefing.id, {"resumo": "Aplicativo de delivery para restaurantes", "itens": ["cardápio"]}, 0, "v1"
+    )
+
+    only_briefings = client.get("/search/", params={"q": "cardapio", "scope": "briefings"}, headers=headers).json()["items"]
+    assert [(hit["source_type"], hit["source_id"]) for hit in only_briefings] == [("briefing", briefing.id)]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"q": "delivery", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/search/", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend((hit["source_type"], hit["source_id"]) for hit in body["items"])
+        scores = [hit["score"] for hit in body["items"]]
+        assert scores == sorted(scores, reverse=True)
+        pages += 1
+        cursor = body["next_cursor"]
+        assert response.headers.get("X-Next-Cursor") == cursor
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 6
+
+
+# Teste: mensagens arquivadas continuam encontráveis; briefing excluído some da busca
+def test_search_archived_and_deleted(client: TestClient, db_session_override: Session):
+    headers = _admin_headers(db_session_override)
+    user = create_test_user(db_session_override, "Search User", "search_archive@example.com", "SearchP@ss1")
+    kept = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Arquivado"), user_id=user.id)
+    removed = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Removido"), user_id=user.id)
+    _say(db_session_override, kept.id, "Identidade visual em tons de verde")
+    _say(db_session_override, removed.id, "Identidade visual minimalista")
+    kept_id, removed_id = kept.id, removed.id
+    conversation_history_cruds.archive_briefing_history(db_session_override, kept_id)
+    briefing_cruds.delete_briefing(db_session_override, removed_id)
+
+    items = client.get("/search/", params={"q": "identidade visual"}, headers=headers).json()["items"]
+
+    assert [hit["briefing_id"] for hit in items] == [kept_id]
+
+
+# Teste: termo presente em mais documentos que o teto de relevância vem do mais recente ao mais antigo
+def test_search_common_term_by_recency(client: TestClient, db_session_override: Session, monkeypatch):
+    headers = _admin_headers(db_session_override)
+    user = create_test_user(db_session_override, "Search User", "search_recency@example.com", "SearchP@ss1")
+    briefing = briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Portfólio"), user_id=user.id)
+    entries = [_say(db_session_override, briefing.id, f"Fotografia {'portfólio ' * (i % 3 + 1)}").id for i in range(5)]
+    monkeypatch.setattr(settings, "SEARCH_RANK_MAX_MATCHES", 3)
+
+    seen, cursor = [], None
+    while True:
+        body = client.get("/search/", params={"q": "fotografia", "limit": 2, **({"cursor": cursor} if cursor else {})}, headers=headers).json()
+        assert all(hit["score"] == 0 for hit in body["items"])
+        seen.extend(hit["source_id"] for hit in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted(entries, reverse=True)
+
+
+# Teste: excluir briefing/usuário tira do índice as mensagens (inclusive arquivadas) e o conteúdo,
+# pelo rowid, sem DELETE por briefing_id (não indexado no FTS5)
+def test_delete_removes_documents_by_rowid(db_session_override: Session):
+    db = db_session_override
+    user = create_test_user(db, "Search User", "search_delete@example.com", "SearchP@ss1")
+    other = create_test_user(db, "Search Other", "search_delete_other@example.com", "SearchP@ss1")
+    archived = briefing_cruds.create_briefing(db, BriefingCreate(title="Com arquivo"), user_id=user.id)
+    hot = briefing_cruds.create_briefing(db, BriefingCreate(title="Sem arquivo"), user_id=user.id)
+    kept = briefing_cruds.create_briefing(db, BriefingCreate(title="Mantido"), user_id=other.id)
+    for briefing in (archived, hot, kept):
+        _say(db, briefing.id, "Logotipo com mascote")
+        briefing_cruds.save_compiled_content(db, briefing.id, {"resumo": "Logotipo"}, 0, "v1")
+    archived_id, hot_id, kept_id, user_id = archived.id, hot.id, kept.id, user.id
+    conversation_history_cruds.archive_briefing_history(db, archived_id)
+    table = search_index.search_table(db.get_bind())
+
+    def indexed_briefings():
+        return sorted(set(db.execute(select(table.c.briefing_id)).scalars()))
+
+    deletes = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(f"DELETE FROM {search_index.SEARCH_TABLE.upper()}"):
+            deletes.append(statement)
+
+    event.listen(db.bind, "before_cursor_execute", capture)
+    try:
+        briefing_cruds.delete_briefing(db, archived_id)
+        assert indexed_briefings() == sorted([hot_id, kept_id])
+        user_cruds.delete_user(db, user_id)
+        assert indexed_briefings() == [kept_id]
+    finally:
+        event.remove(db.bind, "before_cursor_execute", capture)
+
+    assert deletes
+    assert all(" ".join(statement.split()).startswith("DELETE FROM search_documents WHERE search_documents.rowid IN (") for statement in deletes)
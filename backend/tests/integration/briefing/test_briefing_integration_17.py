@@ -0,0 +1,49 @@
+# File: backend/tests/integration/briefing/test_briefing_integration_17.py
+
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.cruds import briefing_cruds, conversation_history_cruds, employee_cruds, user_cruds
+from src.models import Employee
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+from src.utils.datetime_utils import get_current_datetime
+
+
+# Teste: as consultas quentes (lambda_stmt, compiladas uma vez) usam os parâmetros de cada chamada
+def test_cached_lookups_bind_each_call(db_session_override: Session):
+    db = db_session_override
+    first = create_test_user(db, "Cache One", "cache_one@example.com", "CacheP@ss1")
+    second = create_test_user(db, "Cache Two", "cache_two@example.com", "CacheP@ss1")
+    db.add_all([
+        Employee(employee_name=name, employee_script={"system_prompt": "Teste"}, ia_name="TestIA",
+                 endpoint_url="http://test.com", endpoint_key="key", headers_template={}, body_template={})
+        for name in ("Entrevistador Cache", "Designer Cache")
+    ])
+    active = briefing_cruds.create_briefing(db, BriefingCreate(title="Ativo"), user_id=first.id)
+    removed = briefing_cruds.create_briefing(db, BriefingCreate(title="Removido"), user_id=second.id)
+    removed.deleted_at = get_current_datetime()
+    db.commit()
+    for number in range(5):
+        conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+            briefing_id=active.id, sender_type="User", message_content=f"Mensagem {number}"
+        ))
+    first_id, second_id, active_id, removed_id = first.id, second.id, active.id, removed.id
+    db.expunge_all()
+
+    for _ in range(2): # a segunda volta sai do cache de compilação
+        assert user_cruds.get_user(db, first_id).nickname == "Cache One"
+        assert user_cruds.get_user(db, second_id).nickname == "Cache Two"
+        assert user_cruds.get_user(db, 999999) is None
+        assert briefing_cruds.get_briefing(db, active_id).title == "Ativo"
+        assert briefing_cruds.get_briefing(db, removed_id) is None # exclusão lógica
+        assert employee_cruds.get_employee_by_name(db, "Designer Cache").employee_name == "Designer Cache"
+        assert employee_cruds.get_employee_by_name(db, "Entrevistador Cache").employee_name == "Entrevistador Cache"
+
+        assert [row[2] for row in conversation_history_cruds.get_recent_transcript_rows(db, active_id, 2)] == ["Mensagem 3", "Mensagem 4"]
+        assert [row[2] for row in conversation_history_cruds.get_recent_transcript_rows(db, active_id, 3)] == ["Mensagem 2", "Mensagem 3", "Mensagem 4"]
+        assert conversation_history_cruds.get_recent_transcript_rows(db, removed_id, 3) == []
+        assert [entry.message_content for entry in conversation_history_cruds.get_conversation_history_by_briefing_id(db, active_id, 2)] == ["Mensagem 0", "Mensagem 1"]
+        count, last_id = conversation_history_cruds.get_conversation_history_marker(db, active_id)
+        assert count == 5 and last_id > 0
+        assert conversation_history_cruds.get_conversation_history_marker(db, removed_id) == (0, 0)
@@ -0,0 +1,73 @@
+# File: backend/tests/integration/chat/test_chat_integration_03.py
+
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.cruds import briefing_cruds, conversation_history_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+from src.services import transcript_cache_service
+from src.services.transcript_cache_service import TranscriptCache, TranscriptEntry
+
+
+def _create_briefing_with_messages(db: Session, email: str, total: int):
+    user = create_test_user(db, "Cache User", email, "CacheP@ss1")
+    briefing = briefing_cruds.create_briefing(db, BriefingCreate(title="Briefing Cache"), user_id=user.id)
+    for i in range(total):
+        conversation_history_cruds.create_conversation_entry(
+            db, ConversationHistoryCreate(briefing_id=briefing.id, sender_type="Cache User", message_content=f"msg {i}")
+        )
+    return briefing
+
+
+# Teste: a transcrição é montada com as mensagens mais recentes e servida do cache na leitura seguinte
+def test_recent_transcript_is_cached_and_write_through(db_session_override: Session):
+    transcript_cache_service.transcript_cache.clear()
+    briefing = _create_briefing_with_messages(db_session_override, "cache_wt@example.com", 5)
+
+    entries = transcript_cache_service.get_recent_transcript(db_session_override, briefing.id, limit=3)
+    assert [e.message_content for e in entries] == ["msg 2", "msg 3", "msg 4"]
+    assert all(isinstance(e, TranscriptEntry) for e in entries)
+
+    new_entry = conversation_history_cruds.create_conversation_entry(
+        db_session_override, ConversationHistoryCreate(briefing_id=briefing.id, sender_type="IA", message_content="msg 5")
+    )
+    transcript_cache_service.append_to_transcript(new_entry, window=3)
+
+    cached = transcript_cache_service.transcript_cache.get(briefing.id, 6, new_entry.id)
+    assert cached is not None
+    assert [e.message_content for e in cached] == ["msg 3", "msg 4", "msg 5"]
+
+
+# Teste: uma escrita feita por outro worker (sem passar pelo cache) invalida a entrada
+def test_transcript_cache_detects_foreign_writes(db_session_override: Session):
+    transcript_cache_service.transcript_cache.clear()
+    briefing = _create_briefing_with_messages(db_session_override, "cache_foreign@example.com", 2)
+
+    transcript_cache_service.get_recent_transcript(db_session_override, briefing.id, limit=10)
+    conversation_history_cruds.create_conversation_entry(
+        db_session_override, ConversationHistoryCreate(briefing_id=briefing.id, sender_type="IA", message_content="externa")
+    )
+
+    entries = transcript_cache_service.get_recent_transcript(db_session_override, briefing.id, limit=10)
+    assert [e.message_content for e in entries] == ["msg 0", "msg 1", "externa"]
+
+
+# Teste: o cache respeita o limite de briefings (LRU), o teto de memória e o TTL
+def test_transcript_cache_eviction():
+    cache = TranscriptCache(max_briefings=2, max_bytes=10_000, ttl_seconds=60)
+    for briefing_id in (1, 2, 3):
+        cache.put(briefing_id, (TranscriptEntry(briefing_id, "User", "oi"),), 1, window=10)
+    assert len(cache) == 2
+    assert cache.get(1, 1, 1) is None
+    assert cache.get(3, 1, 3) is not None
+
+    small_cache = TranscriptCache(max_briefings=10, max_bytes=400, ttl_seconds=60)
+    small_cache.put(1, (TranscriptEntry(1, "User", "a" * 200),), 1, window=10)
+    small_cache.put(2, (TranscriptEntry(2, "User", "b" * 200),), 1, window=10)
+    assert small_cache.total_bytes <= 400
+    assert small_cache.get(1, 1, 1) is None
+
+    expired_cache = TranscriptCache(max_briefings=10, max_bytes=10_000, ttl_seconds=-1)
+    expired_cache.put(1, (TranscriptEntry(1, "User", "oi"),), 1, window=10)
+    assert expired_cache.get(1, 1, 1) is None
@@ -0,0 +1,51 @@
+# File: backend/tests/integration/db/test_db_integration_01.py
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.core.config import settings
+from src.db import database
+from src.db.pool_metrics import InstrumentedQueuePool, PoolMetrics
+
+
+# Teste: as opções do pool vêm de Settings (exceto no SQLite, que mantém o pool do dialeto)
+def test_build_engine_options_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 12)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 600)
+    monkeypatch.setattr(settings, "DB_ISOLATION_LEVEL", "READ COMMITTED")
+
+    options = database.build_engine_options("mysql+pymysql://u:p@db/app")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"], options["pool_recycle"]) == (12, 3, 600)
+    assert options["isolation_level"] == "READ COMMITTED"
+
+    sqlite_options = database.build_engine_options("sqlite:///./app.db")
+    assert "pool_size" not in sqlite_options
+    assert sqlite_options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+
+
+# Teste: as métricas registram conexões em uso, espera e timeout quando o pool esgota
+def test_pool_metrics_checked_out_wait_and_timeout(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+    try:
+        held = engine.connect()
+        assert metrics.snapshot(engine)["checked_out"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        held.close()
+
+        data = metrics.snapshot(engine)
+        assert data["checked_out"] == 0
+        assert data["checkouts"] == 1 and data["checkins"] == 1
+        assert data["timeouts"] == 1
+        assert data["wait_count"] == 2
+        assert data["wait_max_ms"] >= 40
+    finally:
+        engine.dispose()
@@ -0,0 +1,56 @@
+# File: backend/tests/integration/db/test_db_integration_02.py
+
+import asyncio
+import os
+import subprocess
+import sys
+
+from src.core.config import settings
+from src.db import database
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+COLD_IMPORT = """
+import time
+started = time.perf_counter()
+import src.main
+from src.db import database
+print(time.perf_counter() - started, database._engine is None)
+"""
+
+
+# Teste: importar a aplicação com o banco inacessível é rápido e não conecta (nem cria o engine)
+def test_cold_import_does_not_touch_the_database():
+    env = {**os.environ, "DATABASE_URL": "sqlite:////nonexistent-dir/app.db", "SECRET_KEY": "cold-start"}
+    result = subprocess.run([sys.executable, "-c", COLD_IMPORT], cwd=BACKEND_ROOT, env=env, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    elapsed, engine_missing = result.stdout.split()[-2:]
+    print(f"Importação a frio de src.main: {float(elapsed) * 1000:.0f} ms")
+    assert engine_missing == "True"
+    # Antes: 10 tentativas de conexão de 5s na importação (~45s com o banco fora do ar)
+    assert float(elapsed) < 10
+
+
+# Teste: a espera pelo banco dobra o intervalo até o teto e registra tentativas e o tipo do erro
+def test_wait_for_database_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "DB_CONNECT_RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "DB_CONNECT_RETRY_MAX_SECONDS", 0.03)
+    delays, failures = [], iter([ConnectionRefusedError("db:3306"), TimeoutError(), OSError(), None])
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    def ping():
+        error = next(failures)
+        if error is not None:
+            raise error
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    state = database.DatabaseReadiness()
+    asyncio.run(database.wait_for_database(state, ping=ping))
+
+    assert delays == [0.01, 0.02, 0.03]
+    assert state.ready and state.attempts == 4 and state.last_error is None
@@ -0,0 +1,88 @@
+# File: backend/tests/integration/db/test_db_integration_03.py
+
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as WriteQueueTimeoutError
+
+from src.db import database, sqlite_profile
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = database.create_app_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+# Teste: PRAGMAs do perfil em cada conexão nova (apenas para SQLite em arquivo)
+def test_sqlite_profile_pragmas(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1 # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA mmap_size").scalar() > 0
+
+    assert not sqlite_profile.is_file_database("sqlite:///:memory:")
+    assert not sqlite_profile.is_file_database("mysql+pymysql://u:p@db/app")
+
+
+# Teste: com uma escrita em aberto, a leitura segue (WAL) e a próxima escrita espera a vez na fila
+def test_sqlite_writes_wait_their_turn(sqlite_engine):
+    writer = sqlite_engine.connect()
+    writer.execute(text("INSERT INTO notes (body) VALUES ('primeira')"))
+
+    with sqlite_engine.connect() as reader:
+        assert reader.execute(text("SELECT count(*) FROM notes")).scalar() == 0
+
+    order = []
+
+    def second_writer():
+        with sqlite_engine.begin() as conn:
+            conn.execute(text("INSERT INTO notes (body) VALUES ('segunda')"))
+        order.append("segunda")
+
+    thread = threading.Thread(target=second_writer)
+    thread.start()
+    thread.join(timeout=0.3)
+    assert thread.is_alive() and sqlite_profile.write_queue.snapshot()["waiting"] == 1
+
+    writer.commit()
+    order.append("primeira")
+    writer.close() # devolve a vez na fila
+    thread.join(timeout=5)
+
+    assert order == ["primeira", "segunda"]
+    with sqlite_engine.connect() as conn:
+        assert conn.execute(text("SELECT body FROM notes ORDER BY id")).scalars().all() == ["primeira", "segunda"]
+
+
+# Teste: a fila atende por ordem de chegada e desiste após o timeout
+def test_write_queue_fifo_and_timeout():
+    queue = sqlite_profile.SQLiteWriteQueue()
+    queue.acquire(timeout=1)
+    served = []
+
+    def wait(name):
+        queue.acquire(timeout=5)
+        served.append(name)
+        queue.release()
+
+    threads = []
+    for name in ("a", "b", "c"):
+        threads.append(threading.Thread(target=wait, args=(name,)))
+        threads[-1].start()
+        while queue.snapshot()["waiting"] < len(threads):
+            threading.Event().wait(0.005)
+
+    with pytest.raises(WriteQueueTimeoutError):
+        queue.acquire(timeout=0.05)
+    queue.release()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert served == ["a", "b", "c"]
+    assert queue.snapshot()["timeouts"] == 1 and queue.snapshot()["writes"] == 4
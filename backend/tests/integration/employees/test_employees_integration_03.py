@@ -0,0 +1,153 @@
+# File: backend/tests/integration/employees/test_employees_integration_03.py
+
+import asyncio
+import json
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user, create_test_admin_user, TestingSessionLocal
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.cruds import briefing_cruds, conversation_history_cruds, employee_cruds, job_cruds
+from src.schemas.briefing_schemas import BriefingCreate
+from src.schemas.conversation_history_schemas import ConversationHistoryCreate
+from src.schemas.employee_schemas import EmployeeCreateInternal
+from src.services import compila_briefing_service, job_queue_service
+from src.services.job_queue_service import JobWorkerPool
+from src.utils.rate_limiter import ProviderRateLimiter
+
+
+def _create_assistant(db: Session, name: str = "Assistente de Palco"):
+    return employee_cruds.create_employee_initial(db, EmployeeCreateInternal(
+        employee_name=name,
+        employee_script={"context": "Roteiro antigo."},
+        ia_name="ChatGPT",
+        endpoint_url="http://test.com",
+        endpoint_key="key",
+        headers_template={},
+        body_template={"messages": []},
+    ))
+
+
+def _create_compiled_briefings(db: Session, assistant, count: int):
+    user = create_test_user(db, "Bulk Owner", "bulk_owner@example.com", "BulkP@ss1")
+    old_version = compila_briefing_service.get_script_version(assistant.employee_script)
+    briefings = []
+    for i in range(count):
+        briefing = briefing_cruds.create_briefing(db, BriefingCreate(title=f"Briefing {i}"), user_id=user.id)
+        entry = conversation_history_cruds.create_conversation_entry(db, ConversationHistoryCreate(
+            briefing_id=briefing.id, sender_type="Bulk Owner", message_content=f"mensagem {i}"
+        ))
+        briefing_cruds.save_compiled_content(db, briefing.id, {"antigo": i}, entry.id, old_version)
+        briefings.append(briefing)
+    # Briefing nunca compilado: não entra na recompilação
+    briefing_cruds.create_briefing(db, BriefingCreate(title="Rascunho"), user_id=user.id)
+    return briefings
+
+
+def _run_bulk_job(db: Session, job_id: int):
+    pool = JobWorkerPool(
+        concurrency=1,
+        session_factory=lambda: TestingSessionLocal(bind=db.bind, join_transaction_mode="create_savepoint")
+    )
+    return asyncio.run(pool.run_job(job_id))
+
+
+# Teste: só o 'Assistente de Palco' dispara a recompilação, e pedidos repetidos reaproveitam a tarefa
+def test_recompile_endpoint_requires_assistant(client: TestClient, db_session_override: Session):
+    admin = create_test_admin_user(db_session_override, "bulk_admin")
+    token = create_access_token({"id": admin.id, "username": admin.username, "email": None, "user_type": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+    assistant = _create_assistant(db_session_override)
+    other = _create_assistant(db_session_override, "Entrevistador Pessoal")
+
+    first = client.post(f"/employees/{assistant.id}/recompile_briefings", headers=headers)
+    second = client.post(f"/employees/{assistant.id}/recompile_briefings", headers=headers)
+    assert first.status_code == 202
+    assert first.json()["job_type"] == "bulk_recompile_briefings"
+    assert second.json()["id"] == first.json()["id"]
+
+    response = client.post(f"/employees/{other.id}/recompile_briefings", headers=headers)
+    assert response.status_code == 400
+
+
+# Teste: recompila em páginas os briefings desatualizados, registrando vazão, ETA e falhas
+def test_bulk_recompile_processes_stale_briefings(db_session_override: Session, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_RECOMPILE_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "BULK_RECOMPILE_PAGE_SIZE", 2)
+    assistant = _create_assistant(db_session_override)
+    briefings = _create_compiled_briefings(db_session_override, assistant, 3)
+    compiled_ids = []
+
+    async def fake_ai(**kwargs):
+        compiled_ids.append(kwargs["user_prompt"])
+        return json.dumps({"novo": True})
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+    assistant.employee_script = {"context": "Roteiro novo."}
+    db_session_override.commit()
+
+    job = job_queue_service.submit_bulk_recompile_job(db_session_override)
+    final = _run_bulk_job(db_session_override, job.id)
+
+    assert final.status == "succeeded"
+    assert final.result["total"] == 3
+    assert final.result["succeeded"] == 3
+    assert final.result["failed"] == 0
+    assert final.result["briefings_per_minute"] > 0
+    assert len(compiled_ids) == 3
+
+    new_version = compila_briefing_service.get_script_version(assistant.employee_script)
+    for briefing in briefings:
+        db_session_override.refresh(briefing)
+        assert briefing.content == {"novo": True}
+        assert briefing.compiled_script_version == new_version
+
+
+# Teste: a execução retoma do checkpoint gravado, sem reprocessar briefings anteriores
+def test_bulk_recompile_resumes_from_checkpoint(db_session_override: Session, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_RECOMPILE_CONCURRENCY", 1)
+    assistant = _create_assistant(db_session_override)
+    briefings = _create_compiled_briefings(db_session_override, assistant, 3)
+    calls = []
+
+    async def fake_ai(**kwargs):
+        calls.append(kwargs)
+        return json.dumps({"novo": True})
+
+    monkeypatch.setattr(compila_briefing_service, "call_external_ai_api", fake_ai)
+    assistant.employee_script = {"context": "Roteiro novo."}
+    db_session_override.commit()
+    new_version = compila_briefing_service.get_script_version(assistant.employee_script)
+
+    job = job_queue_service.submit_bulk_recompile_job(db_session_override)
+    job_cruds.save_job_checkpoint(db_session_override, job, {
+        "script_version": new_version, "last_id": briefings[0].id, "total": 3,
+        "succeeded": 1, "failed": 0, "failed_ids": [], "processed": 1, "elapsed_seconds": 1.0,
+    })
+    final = _run_bulk_job(db_session_override, job.id)
+
+    assert final.status == "succeeded"
+    assert len(calls) == 2
+    assert final.result["succeeded"] == 3
+    db_session_override.refresh(briefings[0])
+    assert briefings[0].content == {"antigo": 0}
+
+
+# Teste: o limitador espaça as chamadas do mesmo provedor e não afeta outros provedores
+def test_provider_rate_limiter_spaces_calls():
+    limiter = ProviderRateLimiter()
+
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire("DeepSeek", 600) for _ in range(3)))
+        deepseek_elapsed = time.monotonic() - started
+        started = time.monotonic()
+        await limiter.acquire("Gemini", 600)
+        await limiter.acquire("Sem limite", None)
+        return deepseek_elapsed, time.monotonic() - started
+
+    deepseek_elapsed, others_elapsed = asyncio.run(scenario())
+    assert deepseek_elapsed >= 0.18
+    assert others_elapsed < 0.05
@@ -0,0 +1,117 @@
+# File: backend/tests/integration/users/test_users_integration_bl05.py
+
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_admin_user, create_test_user
+
+from src.core.config import settings
+from src.core.security import create_access_token, get_password_hash, verify_password
+from src.cruds import briefing_cruds, user_cruds
+from src.models.briefing_models import Briefing
+from src.schemas.briefing_schemas import BriefingCreate
+
+
+def _admin_headers(db: Session):
+    admin = create_test_admin_user(db, "import_admin")
+    token = create_access_token({"id": admin.id, "username": admin.username, "email": None, "user_type": "admin"})
+    return {"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"}
+
+
+def _ndjson(*records) -> str:
+    return "\n".join(record if isinstance(record, str) else json.dumps(record) for record in records) + "\n"
+
+
+# Teste: importação de usuários com relatório por linha (JSON inválido, duplicados, senha ausente)
+def test_bulk_import_users_report(client: TestClient, db_session_override: Session, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 3) # Vários lotes
+    headers = _admin_headers(db_session_override)
+    create_test_user(db_session_override, "Já Existe", "existing_import@example.com", "ExistP@ss1")
+    legacy_hash = get_password_hash("LegacyP@ss1")
+
+    body = _ndjson(
+        {"nickname": "Ana Import", "email": "ana_import@example.com", "password": "AnaImportP@ss1"},
+        {"nickname": "Bia Legado", "email": "bia_import@example.com", "password_hash": legacy_hash, "creation_date": "2020-05-01T12:00:00+00:00"},
+        "{isto não é json",
+        {"nickname": "Duplicado", "email": "existing_import@example.com", "password": "DupP@ssword1"},
+        "",
+        {"nickname": "Sem Senha", "email": "sem_senha@example.com"},
+        {"nickname": "Ana Repetida", "email": "ana_import@example.com", "password": "AnaImportP@ss1"},
+        {"nickname": "Social", "google_id": "google-123"},
+    )
+    response = client.post("/imports/users", content=body, headers=headers)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["imported"], report["failed"]) == (7, 3, 4)
+    assert [error["line"] for error in report["errors"]] == [3, 4, 6, 7]
+    assert "email já registrado" in report["errors"][1]["error"]
+
+    db_session_override.expire_all()
+    ana = user_cruds.get_user_by_email(db_session_override, "ana_import@example.com")
+    assert verify_password("AnaImportP@ss1", ana.password_hash)
+    bia = user_cruds.get_user_by_email(db_session_override, "bia_import@example.com")
+    assert bia.password_hash == legacy_hash
+    assert bia.creation_date.year == 2020
+
+
+# Teste: cada lote vira um único INSERT; briefings resolvem o dono pelo email
+def test_bulk_import_single_insert_per_chunk_and_briefings(client: TestClient, db_session_override: Session):
+    headers = _admin_headers(db_session_override)
+    legacy_hash = get_password_hash("LegacyP@ss1")
+    users = [{"nickname": f"Lote {i}", "email": f"lote_{i}@example.com", "password_hash": legacy_hash} for i in range(20)]
+
+    inserts = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO USERS"):
+            inserts.append(statement)
+    event.listen(db_session_override.bind, "before_cursor_execute", capture)
+    try:
+        response = client.post("/imports/users", content=_ndjson(*users), headers=headers)
+    finally:
+        event.remove(db_session_override.bind, "before_cursor_execute", capture)
+    assert response.json()["imported"] == 20
+    assert len(inserts) == 1
+
+    owner = user_cruds.get_user_by_email(db_session_override, "lote_0@example.com")
+    briefing_cruds.create_briefing(db_session_override, BriefingCreate(title="Existente"), user_id=owner.id)
+    body = _ndjson(
+        {"user_email": "lote_0@example.com", "title": "Migrado", "status": "Finalizado", "content": {"paginas": 3}},
+        {"user_id": owner.id, "title": "Existente"},
+        {"user_email": "ninguem@example.com", "title": "Órfão"},
+        {"title": "Sem dono"},
+    )
+    report = client.post("/imports/briefings", content=body, headers=headers).json()
+    assert (report["imported"], report["failed"]) == (1, 3)
+    assert [error["line"] for error in report["errors"]] == [2, 3, 4]
+
+    migrated = db_session_override.query(Briefing).filter(Briefing.title == "Migrado").one()
+    assert (migrated.user_id, migrated.content, migrated.last_edited_by) == (owner.id, {"paginas": 3}, "admin")
+
+
+# Teste: rota exclusiva de administradores
+def test_bulk_import_requires_admin(client: TestClient, db_session_override: Session):
+    user = create_test_user(db_session_override, "Comum Import", "comum_import@example.com", "ComumP@ss1")
+    token = create_access_token({"id": user.id, "username": user.nickname, "email": user.email, "user_type": "user"})
+    response = client.post("/imports/users", content=_ndjson({"nickname": "x"}), headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+# Teste: conflito que escapa da checagem prévia (escrita concorrente) é refeito linha a linha
+def test_bulk_import_concurrent_conflict_falls_back_per_row(client: TestClient, db_session_override: Session, monkeypatch):
+    headers = _admin_headers(db_session_override)
+    create_test_user(db_session_override, "Concorrente", "concorrente@example.com", "ConcP@ss1")
+    legacy_hash = get_password_hash("LegacyP@ss1")
+    monkeypatch.setattr(user_cruds, "get_taken_user_identifiers", lambda db, values: {field: set() for field in values})
+
+    body = _ndjson(
+        {"nickname": "Livre 1", "email": "livre_1@example.com", "password_hash": legacy_hash},
+        {"nickname": "Concorrente", "email": "concorrente@example.com", "password_hash": legacy_hash},
+        {"nickname": "Livre 2", "email": "livre_2@example.com", "password_hash": legacy_hash},
+    )
+    report = client.post("/imports/users", content=body, headers=headers).json()
+
+    assert (report["imported"], report["failed"]) == (2, 1)
+    assert report["errors"][0]["line"] == 2
+    assert user_cruds.get_user_by_email(db_session_override, "livre_2@example.com") is not None
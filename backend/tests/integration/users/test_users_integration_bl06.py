@@ -0,0 +1,63 @@
+# File: backend/tests/integration/users/test_users_integration_bl06.py
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from tests.conftest import create_test_user
+
+from src.core.config import settings
+from src.core.security import create_access_token
+from src.db import query_budget
+
+
+def _user_headers(db: Session, email: str):
+    user = create_test_user(db, "Budget User", email, "BudgetP@ss1")
+    token = create_access_token({"id": user.id, "username": user.email, "email": user.email, "user_type": "user"})
+    db.expunge_all() # A rota lê o usuário do banco (nada no identity map da sessão compartilhada)
+    return user.id, {"Authorization": f"Bearer {token}"}
+
+
+# Teste: a autenticação busca o usuário uma única vez e a rota reaproveita o objeto
+@pytest.mark.query_budget(1)
+def test_own_profile_single_lookup(client: TestClient, db_session_override: Session):
+    user_id, headers = _user_headers(db_session_override, "budget_me@example.com")
+
+    response = client.get("/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["id"] == user_id
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["Server-Timing"].endswith('desc="1 queries"')
+
+
+# Teste: requisição acima do orçamento vai para o log; a fixture falha o teste com os comandos executados
+def test_over_budget_logged_and_enforced(client: TestClient, db_session_override: Session, query_budget_limit, monkeypatch, caplog):
+    _, headers = _user_headers(db_session_override, "budget_over@example.com")
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MAX_STATEMENTS", 0)
+
+    with caplog.at_level(logging.WARNING, logger=query_budget.__name__):
+        with pytest.raises(pytest.fail.Exception) as failure:
+            with query_budget_limit(0):
+                client.get("/users/me", headers=headers)
+
+    assert "1 comandos SQL (orçamento: 0)" in str(failure.value)
+    assert "1x SELECT users.id" in str(failure.value)
+    assert any("GET /users/me" in record.getMessage() for record in caplog.records)
+
+
+# Teste: comandos iguais a menos dos valores (inclusive listas IN de tamanhos diferentes) contam como repetição
+def test_repeated_statements_flagged_as_n_plus_one():
+    stats = query_budget.QueryStats("GET /exemplo")
+    for user_id in range(5):
+        stats.record(f"SELECT users.id FROM users WHERE users.id = {user_id} AND users.status = 'active'", 0.001)
+    stats.record("SELECT briefings.id FROM briefings WHERE briefings.user_id IN (?, ?, ?)", 0.001)
+    stats.record("SELECT briefings.id FROM briefings WHERE briefings.user_id IN (?, ?)", 0.001)
+
+    assert stats.repeated(threshold=2) == {
+        "SELECT users.id FROM users WHERE users.id = ? AND users.status = ?": 5,
+        "SELECT briefings.id FROM briefings WHERE briefings.user_id IN (?)": 2,
+    }
+    reasons = stats.over_budget(max_statements=10, max_db_ms=100)
+    assert reasons == ["provável N+1: 5x SELECT users.id FROM users WHERE users.id = ? AND users.status = ?"]
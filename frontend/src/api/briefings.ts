@@ -126,8 +126,36 @@ export const chatWithEmployee = async (
   return response.json();
 };
 
+export interface Job {
+  id: number;
+  job_type: string;
+  status: 'pending' | 'running' | 'succeeded' | 'failed';
+  attempts: number;
+  max_attempts: number;
+  result?: Record<string, BriefingContentValue> | null;
+  error?: string | null;
+}
+
+// Consultar tarefa assíncrona (GET /jobs/{id})
+export const getJob = async (jobId: number): Promise<Job> => {
+  const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`, {
+    method: 'GET',
+    headers: getAuthHeaders('admin'),
+  });
+  if (!response.ok) {
+    const errorData = await response.json();
+    throw new Error(errorData.detail || 'Erro ao consultar tarefa.');
+  }
+
+  return response.json();
+};
+
 // Compilar briefing (POST /briefings/{id}/compile)
-export const compileBriefing = async (briefingId: string): Promise<Record<string, BriefingContentValue>> => {
+// O backend responde 202 com uma tarefa; consultamos GET /jobs/{id} até ela terminar.
+export const compileBriefing = async (
+  briefingId: string,
+  pollIntervalMs = 2000
+): Promise<Record<string, BriefingContentValue>> => {
   const response = await fetch(`${API_BASE_URL}/briefings/${briefingId}/compile`, {
     method: 'POST',
     // ✅ CORREÇÃO AQUI: Use o getAuthHeaders global com o papel 'admin'
@@ -138,5 +166,14 @@ export const compileBriefing = async (briefingId: string): Promise<Record<string
     throw new Error(errorData.detail || 'Erro ao compilar briefing.');
   }
 
-  return response.json();
-};
\ No newline at end of file
+  let job: Job = await response.json();
+  while (job.status === 'pending' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+    job = await getJob(job.id);
+  }
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Erro ao compilar briefing.');
+  }
+
+  return job.result ?? {};
+};